@@ -10,86 +10,457 @@
 from __future__ import absolute_import, division, unicode_literals
 
 import json
+import os
 from threading import Lock
 
-from mo_parsing import debug
+from mo_sql_parsing.artifact import load_parser, ARTIFACT_ENV
+from mo_sql_parsing.budget import Budget, CancelToken, ParseBudgetExceeded
+from mo_sql_parsing.columns import ColumnTable
+from mo_sql_parsing.errors import ParseError, Parsed, match, best_cause, locate
+from mo_sql_parsing.classify import classify, StatementKind
+from mo_sql_parsing.cache import ParseCache, copy_tree, to_template, find_paths, splice
+from mo_sql_parsing.lazy import LazyTree, lazy
+from mo_sql_parsing.tree import simple_op, normal_op, ParseContext, scrub, Node, to_json, SQL_NULL as NULL_CALL
+from mo_sql_parsing.visitor import Visitor, Transformer, SKIP, STOP
 
-from mo_sql_parsing.sql_parser import scrub
-from mo_sql_parsing.utils import ansi_string, simple_op, normal_op
-
-parse_locker = Lock()  # ENSURE ONLY ONE PARSING AT A TIME
+build_locker = Lock()  # ENSURE ONLY ONE PARSER IS BUILT AT A TIME (GRAMMAR CONSTRUCTION USES GLOBAL WHITESPACE STATE)
 common_parser = None
 mysql_parser = None
 sqlserver_parser = None
+parse_cache = None  # SET WITH enable_cache()
+artifact_directory = os.environ.get(ARTIFACT_ENV)  # SET WITH enable_artifacts()
+match_memo = None  # SET WITH enable_memo()
+rule_profile = None  # SET WITH enable_profile()
 
 SQL_NULL = {"null": {}}
 
 
-def parse(sql, null=SQL_NULL, calls=simple_op):
+def parse(sql, null=SQL_NULL, calls=simple_op, columnar=False, output="json", budget=None, memo=None):
     """
     :param sql: String of SQL
     :param null: What value to use as NULL (default is the null function `{"null":{}}`)
+    :param columnar: True to return tables of literal VALUES as ColumnTable (typed arrays, one per column)
+    :param output: "json" for dicts and lists, "nodes" for each call as a Node (null and calls are then given to to_json()),
+                   or "lazy" for a LazyTree, that converts each clause when it is first asked for
+    :param budget: Budget to stop the parse (with ParseBudgetExceeded) when it takes too long, or is cancelled
+    :param memo: True to remember matches during this parse (packrat parsing), False to not, or a MatchMemo to
+                 use; None (default) follows enable_memo()
     :return: parse tree
     """
     global common_parser
 
-    with parse_locker:
-        if not common_parser:
-            common_parser = sql_parser.common_parser()
-        result = _parse(common_parser, sql, null, calls)
-        return result
+    if not common_parser:
+        with build_locker:
+            if not common_parser:
+                common_parser = _build_parser("common")
+    return _parse(common_parser, sql, null, calls, columnar, output, budget, memo)
 
 
-def parse_mysql(sql, null=SQL_NULL, calls=simple_op):
+def parse_mysql(sql, null=SQL_NULL, calls=simple_op, columnar=False, output="json", budget=None, memo=None):
     """
     PARSE MySQL ASSUME DOUBLE QUOTED STRINGS ARE LITERALS
     :param sql: String of SQL
     :param null: What value to use as NULL (default is the null function `{"null":{}}`)
+    :param columnar: True to return tables of literal VALUES as ColumnTable (typed arrays, one per column)
+    :param output: "json" for dicts and lists, "nodes" for each call as a Node (null and calls are then given to to_json()),
+                   or "lazy" for a LazyTree, that converts each clause when it is first asked for
+    :param budget: Budget to stop the parse (with ParseBudgetExceeded) when it takes too long, or is cancelled
+    :param memo: True to remember matches during this parse (packrat parsing), False to not, or a MatchMemo to
+                 use; None (default) follows enable_memo()
     :return: parse tree
     """
     global mysql_parser
 
-    with parse_locker:
-        if not mysql_parser:
-            mysql_parser = sql_parser.mysql_parser()
-        return _parse(mysql_parser, sql, null, calls)
+    if not mysql_parser:
+        with build_locker:
+            if not mysql_parser:
+                mysql_parser = _build_parser("mysql")
+    return _parse(mysql_parser, sql, null, calls, columnar, output, budget, memo)
 
 
-def parse_sqlserver(sql, null=SQL_NULL, calls=simple_op):
+def parse_sqlserver(sql, null=SQL_NULL, calls=simple_op, columnar=False, output="json", budget=None, memo=None):
     """
     PARSE MySQL ASSUME DOUBLE QUOTED STRINGS ARE LITERALS
     :param sql: String of SQL
     :param null: What value to use as NULL (default is the null function `{"null":{}}`)
+    :param columnar: True to return tables of literal VALUES as ColumnTable (typed arrays, one per column)
+    :param output: "json" for dicts and lists, "nodes" for each call as a Node (null and calls are then given to to_json()),
+                   or "lazy" for a LazyTree, that converts each clause when it is first asked for
+    :param budget: Budget to stop the parse (with ParseBudgetExceeded) when it takes too long, or is cancelled
+    :param memo: True to remember matches during this parse (packrat parsing), False to not, or a MatchMemo to
+                 use; None (default) follows enable_memo()
     :return: parse tree
     """
     global sqlserver_parser
 
-    with parse_locker:
-        if not sqlserver_parser:
-            sqlserver_parser = sql_parser.sqlserver_parser()
-        return _parse(sqlserver_parser, sql, null, calls)
+    if not sqlserver_parser:
+        with build_locker:
+            if not sqlserver_parser:
+                sqlserver_parser = _build_parser("sqlserver")
+    return _parse(sqlserver_parser, sql, null, calls, columnar, output, budget, memo)
 
 
 parse_bigquery = parse_mysql
 
+# MAP FROM DIALECT TO THE GRAMMAR USED FOR IT
+_grammars = {"common": "common", "mysql": "mysql", "bigquery": "mysql", "sqlserver": "sqlserver"}
+
+
+def try_parse(
+    sql, dialect="common", null=SQL_NULL, calls=simple_op, columnar=False, output="json", budget=None, memo=None
+):
+    """
+    SAME AS parse(), BUT A STATEMENT THAT DOES NOT PARSE IS RETURNED AS A ParseError, NOT RAISED.  THE ERROR'S
+    message, expecting AND context ARE ONLY WORKED OUT WHEN READ, SO UNREAD FAILURES ARE CHEAP
+    A LITERAL THE GRAMMAR MATCHES, BUT CAN NOT CONVERT (LIKE 1e999999), IS A ParseError TOO; IT IS LOCATED BY
+    MATCHING AGAIN.  ParseBudgetExceeded AND BAD ARGUMENTS ARE STILL RAISED
+    :param sql: String of SQL
+    :param dialect: one of "common", "mysql", "bigquery", "sqlserver"
+    :param null: What value to use as NULL (default is the null function `{"null":{}}`)
+    :param columnar: True to return tables of literal VALUES as ColumnTable (typed arrays, one per column)
+    :param output: "json", "nodes" or "lazy", as for parse()
+    :param budget: Budget, as for parse(); ParseBudgetExceeded IS STILL RAISED
+    :param memo: as for parse()
+    :return: Parsed, WITH THE tree, OR THE error
+    """
+    from mo_parsing import ParseException
+
+    parser = _parser(dialect)
+    meter = None if budget is None else budget.meter()
+    try:
+        return Parsed(_parse_raw(parser, sql, null, calls, columnar, output, meter, _match_memo(memo)), None)
+    except ParseException as failure:
+        return Parsed(None, ParseError(failure.string, failure))
+    except ParseBudgetExceeded:
+        raise
+    except Exception as failure:
+        located = locate(parser, sql.rstrip().rstrip(";"), failure, ParseContext(columnar=columnar))
+        if located is None:
+            raise
+        return Parsed(None, ParseError(located.string, located))
+
+
+def _parser(dialect):
+    """
+    :return: THE PARSER FOR dialect, BUILT ON FIRST USE
+    """
+    grammar = _grammars.get(dialect)
+    if grammar is None:
+        raise Exception(f"Expecting dialect to be one of {', '.join(_grammars.keys())}")
+    variable = f"{grammar}_parser"
+    parser = globals()[variable]
+    if not parser:
+        with build_locker:
+            parser = globals()[variable]
+            if not parser:
+                parser = globals()[variable] = _build_parser(grammar)
+    return parser
+
+
+def extract_tables(sql, dialect="common"):
+    """
+    THE TABLES THE STATEMENT READS OR WRITES: IN FROM AND JOIN, SUBQUERIES, CTEs, INSERT INTO, UPDATE, DELETE,
+    MERGE AND COPY.  THE NAMES ARE READ FROM THE MATCHED TOKENS; NO PARSE TREE IS BUILT
+    :param sql: String of SQL
+    :param dialect: one of "common", "mysql", "bigquery", "sqlserver"
+    :return: set of table names (the names of CTEs are not included)
+    """
+    return _references(sql, dialect)[0]
+
+
+def extract_columns(sql, dialect="common"):
+    """
+    THE COLUMNS USED IN THE EXPRESSIONS OF THE STATEMENT (SELECT, WHERE, ON, GROUP BY, VALUES, ...), AS WRITTEN
+    (a, t.a).  THE NAMES ARE READ FROM THE MATCHED TOKENS; NO PARSE TREE IS BUILT
+    :param sql: String of SQL
+    :param dialect: one of "common", "mysql", "bigquery", "sqlserver"
+    :return: set of column names
+    """
+    return _references(sql, dialect)[1]
+
+
+def _references(sql, dialect):
+    from mo_sql_parsing.references import references
 
-def _parse(parser, sql, null, calls):
-    utils.null_locations = []
-    utils.scrub_op = calls
+    parser = _parser(dialect)
     sql = sql.rstrip().rstrip(";")
-    parse_result = parser.parse_string(sql, parse_all=True)
-    output = scrub(parse_result)
-    for o, n in utils.null_locations:
-        o[n] = null
-    return output
+    try:
+        if match_memo is not None:
+            return references(_parse_locked(parser, sql, ParseContext(memo=match_memo)))
+        return references(match(parser, sql))
+    except Exception as failure:
+        raise best_cause(failure) from None
+
+
+def enable_cache(size=1000, max_bytes=None, templates=False):
+    """
+    CACHE PARSE RESULTS.  EVERY CALL RECEIVES ITS OWN COPY, SO CALLERS MAY MUTATE THE RESULT
+    :param size: maximum number of cached statements
+    :param max_bytes: maximum (approximate) memory used by the cache
+    :param templates: True to cache the shape of the query, so queries that differ only by literals share an entry
+    :return: the ParseCache, see its stats() for hits, misses and evictions
+    """
+    global parse_cache
+    parse_cache = ParseCache(size, max_bytes, templates)
+    return parse_cache
+
+
+def disable_cache():
+    global parse_cache
+    parse_cache = None
+
+
+def enable_artifacts(directory):
+    """
+    KEEP THE FINALIZED GRAMMAR OF EACH DIALECT IN directory, SO LATER PROCESSES LOAD IT INSTEAD OF BUILDING IT
+    ONLY AFFECTS PARSERS NOT BUILT YET; SETTING THE MO_SQL_PARSING_ARTIFACTS ENVIRONMENT VARIABLE DOES THE SAME
+    :param directory: a directory you trust (None to always build)
+    """
+    global artifact_directory
+    artifact_directory = directory
+
+
+def _build_parser(dialect):
+    def build():
+        # THE GRAMMAR MODULES ARE IMPORTED WHEN THE FIRST PARSER IS BUILT, NOT WITH THIS PACKAGE
+        from mo_sql_parsing import sql_parser
+
+        return getattr(sql_parser, f"{dialect}_parser")()
+
+    return load_parser(dialect, build, artifact_directory)
+
+
+def enable_memo(size=100_000):
+    """
+    REMEMBER THE MATCHES OF EXPRESSIONS AND QUERIES DURING EACH PARSE (PACKRAT PARSING), SO BACKTRACKING OVER
+    DEEPLY NESTED SQL DOES NOT MATCH THEM AGAIN. THE MEMO IS EMPTIED AT THE END OF EACH PARSE
+    THIS IS A PROCESS-WIDE SWITCH: IT AFFECTS EVERY parse() IN THE PROCESS THAT DOES NOT GIVE ITS OWN memo
+    :param size: maximum number of matches remembered during one parse
+    :return: MatchMemo, USE stats() FOR THE hits, misses AND peak_entries
+    """
+    from mo_sql_parsing.memo import MatchMemo
+
+    global match_memo
+    match_memo = MatchMemo(size)
+    return match_memo
+
+
+def disable_memo():
+    global match_memo
+    match_memo = None
+
+
+def enable_profile():
+    """
+    COUNT THE ATTEMPTS, MATCHES, FAILURES AND TIME OF EACH NAMED GRAMMAR RULE, IN EVERY PARSE UNTIL disable_profile()
+    NOTHING IS COUNTED (OR SLOWED) WHEN NOT ENABLED
+    :return: RuleProfile, USE report() FOR A TABLE, OR write_folded() FOR A FLAMEGRAPH
+    """
+    from mo_sql_parsing.profile import RuleProfile
+
+    global rule_profile
+    disable_profile()
+    rule_profile = RuleProfile()
+    rule_profile.start()
+    return rule_profile
+
+
+def disable_profile():
+    """
+    :return: THE RuleProfile THAT WAS ENABLED, OR None
+    """
+    global rule_profile
+    profile, rule_profile = rule_profile, None
+    if profile is not None:
+        profile.stop()
+    return profile
+
+
+def _parse(parser, sql, null, calls, columnar=False, output="json", budget=None, memo=None):
+    # THE CLOCK STARTS NOW, SO TIME WAITING FOR ANOTHER PARSE TO FINISH IS COUNTED
+    meter = None if budget is None else budget.meter()
+    try:
+        return _parse_raw(parser, sql, null, calls, columnar, output, meter, _match_memo(memo))
+    except Exception as failure:
+        raise best_cause(failure) from None
+
+
+def _match_memo(memo):
+    """
+    :return: THE MatchMemo FOR ONE PARSE (OR None), GIVEN THE memo PASSED TO parse()
+    """
+    if memo is None:
+        return match_memo
+    elif memo is True:
+        from mo_sql_parsing.memo import MatchMemo
+
+        return MatchMemo()
+    elif memo is False:
+        return None
+    return memo
+
+
+def _parse_raw(parser, sql, null, calls, columnar=False, output="json", meter=None, memo=None):
+    # A FAILED MATCH IS RAISED AS FOUND (SEE match()); THE CALLER DECIDES IF THE BEST CAUSE IS WORTH FINDING
+    sql = sql.rstrip().rstrip(";")
+    if output == "nodes":
+        # NODES KEEP THE SQL_NULL PLACEHOLDER; Node.to_json() APPLIES null AND calls
+        return _parse_uncached(parser, sql, NULL_CALL, Node, columnar, meter=meter, memo=memo)
+    elif output == "lazy":
+        return _parse_uncached(parser, sql, null, calls, columnar, lazy_tree=True, meter=meter, memo=memo)
+    elif output != "json":
+        raise Exception("Expecting output to be one of json, nodes, lazy")
+    cache = parse_cache
+    if cache is None or columnar:
+        # COLUMN TABLES ARE FOR STATEMENTS TOO BIG TO BE WORTH CACHING
+        return _parse_uncached(parser, sql, null, calls, columnar, meter=meter, memo=memo)
+
+    if cache.templates:
+        template, literals = to_template(sql)
+        if literals:
+            key = (parser, template, calls)
+            entry = cache.get(key)
+            if entry is None:
+                entry = _parse_template(parser, template, len(literals), calls, meter, memo)
+                cache.add(key, entry)
+            tree, paths = entry
+            if tree is not None:
+                return splice(tree, paths, literals, null)
+            # NOT A USABLE TEMPLATE, FALL BACK TO THE EXACT SQL
+
+    key = (parser, sql, calls)
+    tree = cache.get(key)
+    if tree is None:
+        # CACHE THE TREE WITH THE SQL_NULL PLACEHOLDERS, SO ANY null CAN BE APPLIED LATER
+        tree = _parse_uncached(parser, sql, NULL_CALL, calls, meter=meter, memo=memo)
+        cache.add(key, tree)
+    return copy_tree(tree, null)
+
+
+def _parse_template(parser, template, num_literals, calls, meter=None, memo=None):
+    """
+    :return: (tree, paths) IF EVERY PLACEHOLDER LANDS IN THE TREE EXACTLY ONCE, ELSE (None, None)
+    """
+    try:
+        tree = _parse_uncached(parser, template, NULL_CALL, calls, meter=meter, memo=memo)
+    except ParseBudgetExceeded:
+        raise
+    except Exception:
+        return None, None
+    paths = find_paths(tree, num_literals)
+    if paths is None:
+        return None, None
+    return tree, paths
+
+
+def _parse_uncached(parser, sql, null, calls, columnar=False, lazy_tree=False, meter=None, memo=None):
+    # ALL PER-CALL STATE LIVES IN context; THE GRAMMAR MATCH ITSELF IS GUARDED BY mo_parsing
+    context = ParseContext(calls, null, columnar, meter, memo)
+    if context.memo is not None or columnar:
+        parse_result = _parse_locked(parser, sql, context)
+    else:
+        parse_result = match(parser, sql, context)
+    if lazy_tree:
+        return lazy(parse_result, context)
+    return scrub(parse_result, context)
+
+
+def _parse_locked(parser, sql, context):
+    from mo_parsing import core, whitespaces
+    from mo_sql_parsing.lexer import sparse_skips, release_skips
+    from mo_sql_parsing.memo import memoized_parse
+
+    columnar = context.columnar
+    with core.locker:
+        # THE SKIP MEMO IS KEPT ON THE GRAMMAR'S WHITESPACE, SO HOLD THE GRAMMAR'S LOCK UNTIL THE END OF THE PARSE
+        if columnar:
+            # MOST OF THE SQL IS ROWS, READ WITHOUT THE GRAMMAR; DO NOT MEMOIZE WHITESPACE FOR EVERY CHARACTER
+            skippers = [parser.whitespace, whitespaces.STANDARD_WHITESPACE]
+            sparse_skips(sql, skippers)
+        try:
+            if context.memo is None:
+                return match(parser, sql, context)
+            return memoized_parse(parser, sql, context)
+        finally:
+            if columnar:
+                release_skips(skippers)
 
 
 def format(json, **kwargs):
+    """
+    :param json: parse tree, from parse() (with any output)
+    :return: SQL
+    """
     from mo_sql_parsing.formatting import Formatter
 
-    return Formatter(**kwargs).dispatch(json)
+    return Formatter(**kwargs).dispatch(to_json(json))
+
+
+# THE GRAMMAR MODULES WERE ONCE IMPORTED WITH THE PACKAGE; THEY ARE NOW IMPORTED ON FIRST USE (PEP 562)
+# MAP FROM NAME TO (MODULE, ATTRIBUTE OF THE MODULE, OR None FOR THE MODULE ITSELF)
+_lazy_attributes = {
+    "utils": ("mo_sql_parsing.utils", None),
+    "sql_parser": ("mo_sql_parsing.sql_parser", None),
+    "debug": ("mo_parsing.debug", None),
+    "ansi_string": ("mo_sql_parsing.utils", "ansi_string"),
+}
+
+
+def __getattr__(name):
+    from importlib import import_module
+
+    found = _lazy_attributes.get(name)
+    if found is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = found
+    value = import_module(module_name)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
 
+from mo_sql_parsing.bulk import parse_many, format_many, ParsePool
+from mo_sql_parsing.script import parse_script, split_statements, ScriptError
 
 _ = json.dumps
 
-__all__ = ["parse", "format", "parse_mysql", "parse_bigquery", "normal_op", "simple_op"]
+__all__ = [
+    "parse",
+    "format",
+    "parse_mysql",
+    "parse_bigquery",
+    "extract_tables",
+    "extract_columns",
+    "try_parse",
+    "Parsed",
+    "ParseError",
+    "Budget",
+    "CancelToken",
+    "ParseBudgetExceeded",
+    "classify",
+    "StatementKind",
+    "normal_op",
+    "simple_op",
+    "parse_many",
+    "format_many",
+    "ParsePool",
+    "parse_script",
+    "split_statements",
+    "ScriptError",
+    "ColumnTable",
+    "Node",
+    "to_json",
+    "LazyTree",
+    "Visitor",
+    "Transformer",
+    "SKIP",
+    "STOP",
+    "enable_cache",
+    "disable_cache",
+    "enable_artifacts",
+    "enable_memo",
+    "disable_memo",
+    "enable_profile",
+    "disable_profile",
+]
@@ -0,0 +1,92 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import os
+import pickle
+import sys
+
+ARTIFACT_ENV = "MO_SQL_PARSING_ARTIFACTS"  # DIRECTORY TO KEEP THE ARTIFACTS, READ AT IMPORT
+_fingerprint = None
+
+
+def _version(package):
+    try:
+        from importlib.metadata import version
+
+        return version(package)
+    except Exception:
+        return "dev"
+
+
+def fingerprint():
+    """
+    :return: KEY FOR THE ARTIFACT; CHANGES WHEN THE PYTHON, mo-parsing OR mo-sql-parsing VERSION (OR GRAMMAR SOURCE) CHANGES
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        import hashlib
+
+        digest = hashlib.sha1()
+        source_dir = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(source_dir)):
+            if name.endswith(".py"):
+                with open(os.path.join(source_dir, name), "rb") as f:
+                    digest.update(f.read())
+        _fingerprint = "-".join([
+            f"py{sys.version_info[0]}{sys.version_info[1]}",
+            _version("mo-sql-parsing"),
+            _version("mo-parsing"),
+            digest.hexdigest()[:12],
+        ])
+    return _fingerprint
+
+
+def artifact_path(directory, dialect):
+    return os.path.join(directory, f"{dialect}-{fingerprint()}.pickle")
+
+
+def load_parser(dialect, builder, directory):
+    """
+    RETURN THE FINALIZED PARSER FOR dialect, LOADED FROM THE ARTIFACT IN directory
+    IF THERE IS NO USABLE ARTIFACT, THE PARSER IS BUILT, AND THE ARTIFACT WRITTEN FOR NEXT TIME
+    ONLY USE A directory YOU TRUST: LOADING AN ARTIFACT RUNS CODE (IT IS A PICKLE)
+    :param dialect: name used in the artifact filename
+    :param builder: function that builds the parser (eg sql_parser.common_parser)
+    :param directory: where artifacts are kept (None to always build)
+    """
+    if not directory:
+        return builder()
+
+    path = artifact_path(directory, dialect)
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        # MISSING, STALE OR DAMAGED: BUILD IT
+        pass
+
+    parser = builder()
+    try:
+        # GRAMMAR HAS LAMBDAS AND CLOSURES, WHICH PLAIN pickle CAN NOT WRITE
+        # (IMPORTED HERE, BECAUSE pickle.load() IMPORTS WHAT IT NEEDS)
+        import cloudpickle
+        import tempfile
+
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as f:
+                cloudpickle.dump(parser, f)
+            os.replace(temp_path, path)  # ATOMIC, SO CONCURRENT PROCESSES NEVER SEE A PARTIAL FILE
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    except Exception:
+        # THE ARTIFACT IS ONLY AN OPTIMIZATION
+        pass
+    return parser
@@ -0,0 +1,96 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# LIMITS ON ONE PARSE: TIME, MATCH ATTEMPTS, OR A CANCEL FROM ANOTHER THREAD
+from time import perf_counter
+
+
+class ParseBudgetExceeded(Exception):
+    """
+    THE PARSE WAS STOPPED BEFORE IT WAS DONE: IT RAN OUT OF TIME, OR OF ATTEMPTS, OR IT WAS CANCELLED
+    """
+
+    def __init__(self, reason, message):
+        """
+        :param reason: one of "seconds", "attempts", "cancelled"
+        """
+        Exception.__init__(self, message)
+        self.reason = reason
+
+    def __reduce__(self):
+        # SO IT CAN BE SENT FROM A WORKER PROCESS
+        return ParseBudgetExceeded, (self.reason, str(self))
+
+
+class CancelToken(object):
+    """
+    GIVE TO A Budget, THEN cancel() FROM ANY THREAD (OR asyncio TASK); THE PARSE STOPS AT ITS NEXT ATTEMPT
+    """
+
+    __slots__ = ["cancelled"]
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Budget(object):
+    """
+    THE MOST A PARSE MAY SPEND.  ONE Budget CAN BE GIVEN TO MANY PARSES; EACH IS MEASURED ON ITS OWN
+    """
+
+    __slots__ = ["seconds", "attempts", "token"]
+
+    def __init__(self, seconds=None, attempts=None, token=None):
+        """
+        :param seconds: most time, from the call to parse() (including any wait for another parse) until done
+        :param attempts: most attempts to match an expression, a query or a statement; every nested
+                         level, and every backtrack over one, is another attempt
+        :param token: CancelToken, to stop the parse from elsewhere
+        """
+        self.seconds = seconds
+        self.attempts = attempts
+        self.token = token
+
+    def meter(self):
+        """
+        :return: Meter FOR ONE PARSE, STARTING NOW
+        """
+        return Meter(self)
+
+
+class Meter(object):
+    """
+    WHAT IS LEFT OF A Budget, FOR THE PARSE IN PROGRESS
+    """
+
+    __slots__ = ["budget", "deadline", "remaining", "token"]
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.deadline = None if budget.seconds is None else perf_counter() + budget.seconds
+        self.remaining = budget.attempts
+        self.token = budget.token
+
+    def spend(self):
+        """
+        CALLED BY THE GRAMMAR BEFORE EACH ATTEMPT
+        ONCE EXCEEDED, EVERY LATER CALL RAISES TOO, SO THE PARSE CAN NOT CONTINUE EVEN IF ONE IS CAUGHT
+        """
+        remaining = self.remaining
+        if remaining is not None:
+            if remaining <= 0:
+                raise ParseBudgetExceeded("attempts", f"Expecting parse to take at most {self.budget.attempts} attempts")
+            self.remaining = remaining - 1
+        if self.deadline is not None and perf_counter() > self.deadline:
+            raise ParseBudgetExceeded("seconds", f"Expecting parse to take at most {self.budget.seconds} seconds")
+        if self.token is not None and self.token.cancelled:
+            raise ParseBudgetExceeded("cancelled", "Parse was cancelled")
@@ -0,0 +1,232 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import pickle
+import traceback
+from collections import deque
+from concurrent import futures
+
+from mo_sql_parsing import SQL_NULL
+from mo_sql_parsing.tree import simple_op, _chunk
+
+DIALECTS = {
+    "common": "parse",
+    "mysql": "parse_mysql",
+    "bigquery": "parse_bigquery",
+    "sqlserver": "parse_sqlserver",
+}
+
+_worker_parse = None  # THE parse FUNCTION OF THE WORKER PROCESS, SET BY _init_worker()
+
+
+def _init_worker(dialect):
+    global _worker_parse
+    import mo_sql_parsing
+
+    if dialect is None:
+        # FORMATTING ONLY
+        return
+    _worker_parse = getattr(mo_sql_parsing, DIALECTS[dialect])
+    _worker_parse("select 1")  # BUILD THE PARSER NOW, NOT ON THE FIRST REAL REQUEST
+
+
+class _Expected(object):
+    """
+    STANDS IN FOR THE GRAMMAR ELEMENT OF A ParseException SENT FROM A WORKER; THE GRAMMAR CAN NOT BE PICKLED
+    """
+
+    __slots__ = ["text"]
+
+    def __init__(self, text):
+        self.text = text
+
+    def __str__(self):
+        return self.text
+
+
+def _sent_parse_exception(expected, start, string, msg):
+    from mo_parsing import ParseException
+
+    return ParseException(_Expected(expected), start, string, msg)
+
+
+class _RemoteTraceback(Exception):
+    """
+    THE TRACEBACK OF A FAILURE IN A WORKER PROCESS, CHAINED TO THE FAILURE WHEN IT IS RAISED IN THE CALLER
+    """
+
+    def __str__(self):
+        return self.args[0]
+
+
+def _failure(cause):
+    """
+    :return: (message, exception, traceback) FOR cause, WHERE exception CAN BE SENT TO THE CALLER'S PROCESS
+    """
+    from mo_parsing import ParseException
+
+    message = str(cause)
+    if isinstance(cause, ParseException):
+        best = cause.best_cause
+        sent = (_sent_parse_exception, (str(best.expr), best.loc, best.string, best._msg))
+    else:
+        try:
+            pickle.loads(pickle.dumps(cause))
+            sent = cause
+        except Exception:
+            # LIKE THE mo_logs Except OF A FAILED PARSE ACTION
+            sent = Exception(message)
+    return message, sent, traceback.format_exc()
+
+
+def _raise(i, failure):
+    """
+    RAISE THE WORKER'S EXCEPTION FOR INPUT i, WITH ITS index, CHAINED TO THE WORKER'S TRACEBACK
+    (A ParseException IGNORES THE CHAIN: mo_parsing MAKES ITS __cause__ READ-ONLY)
+    """
+    _, sent, remote = failure
+    if isinstance(sent, tuple):
+        make, args = sent
+        sent = make(*args)
+    sent.index = i
+    raise sent from _RemoteTraceback(f"input {i} failed in a worker process:\n{remote}")
+
+
+def _parse_batch(batch, null, calls):
+    output = []
+    for i, sql in batch:
+        try:
+            output.append((i, True, _worker_parse(sql, null=null, calls=calls)))
+        except Exception as cause:
+            output.append((i, False, _failure(cause)))
+    return output
+
+
+def _format_batch(batch, kwargs):
+    from mo_sql_parsing import format
+
+    output = []
+    for i, json in batch:
+        try:
+            output.append((i, True, format(json, **kwargs)))
+        except Exception as cause:
+            output.append((i, False, _failure(cause)))
+    return output
+
+
+class ParsePool(object):
+    """
+    A POOL OF PROCESSES, EACH WITH THE dialect PARSER ALREADY BUILT
+    USE AS A CONTEXT MANAGER SO THE PROCESSES ARE RELEASED
+    """
+
+    def __init__(self, dialect="common", workers=None, batch_size=100):
+        """
+        :param dialect: one of "common", "mysql", "bigquery", "sqlserver" (None if only formatting)
+        :param workers: number of processes (default is the number of CPUs)
+        :param batch_size: number of statements sent to a worker at once
+        """
+        if dialect is not None and dialect not in DIALECTS:
+            raise Exception(f"Expecting dialect to be one of {', '.join(DIALECTS.keys())}")
+        self.batch_size = batch_size
+        self.executor = futures.ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(dialect,))
+        self.workers = self.executor._max_workers
+
+    def parse_many(self, sqls, ordered=True, errors=None, null=SQL_NULL, calls=simple_op):
+        """
+        :param sqls: iterable of SQL strings
+        :param ordered: True to emit results in input order, False to emit as they complete
+        :param errors: list (or anything with `append()`) to receive `(index, sql, message)` for each failure;
+                       None to raise the first failure: the worker's exception, with its `index`
+        :param null: What value to use as NULL (default is the null function `{"null":{}}`)
+        :return: generator of `(index, parse_tree)` for each successful parse
+        """
+        return self._run(sqls, ordered, errors, _parse_batch, (null, calls))
+
+    def format_many(self, jsons, ordered=True, errors=None, **kwargs):
+        """
+        :param jsons: iterable of parse trees
+        :param errors: as for parse_many()
+        :param kwargs: passed to the `Formatter`
+        :return: generator of `(index, sql)` for each successful format
+        """
+        return self._run(jsons, ordered, errors, _format_batch, (kwargs,))
+
+    def _run(self, values, ordered, errors, func, args):
+        # KEEP A LIMITED NUMBER OF BATCHES IN FLIGHT SO MEMORY STAYS CONSTANT
+        max_pending = self.workers * 2
+        pending = deque()
+        batches = _chunk(enumerate(values), self.batch_size)
+        inputs = {}
+
+        def submit():
+            batch = next(batches, None)
+            if batch is None:
+                return False
+            future = self.executor.submit(func, batch, *args)
+            inputs[future] = batch
+            pending.append(future)
+            return True
+
+        while len(pending) < max_pending and submit():
+            pass
+
+        try:
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+                    for d in done:
+                        pending.remove(d)
+                for future in done:
+                    batch = dict(inputs.pop(future))
+                    for i, ok, value in future.result():
+                        if ok:
+                            yield i, value
+                        elif errors is None:
+                            # NOTHING TO TELL THE CALLER WHICH RESULT IS MISSING, SO STOP HERE
+                            _raise(i, value)
+                        else:
+                            errors.append((i, batch[i], value[0]))
+                    submit()
+        finally:
+            # A FAILURE, OR A CALLER THAT STOPPED READING, LEAVES BATCHES NOT STARTED
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def parse_many(
+    sqls, dialect="common", workers=None, batch_size=100, ordered=True, errors=None, null=SQL_NULL, calls=simple_op,
+):
+    """
+    PARSE MANY SQL STRINGS WITH A TEMPORARY ParsePool
+    FAILURES ARE SENT TO errors; IF errors IS None THE FIRST FAILURE IS RAISED, WITH ITS index
+    :return: generator of `(index, parse_tree)`
+    """
+    with ParsePool(dialect, workers, batch_size) as pool:
+        yield from pool.parse_many(sqls, ordered=ordered, errors=errors, null=null, calls=calls)
+
+
+def format_many(jsons, workers=None, batch_size=100, ordered=True, errors=None, **kwargs):
+    """
+    FORMAT MANY PARSE TREES WITH A TEMPORARY ParsePool
+    FAILURES ARE SENT TO errors; IF errors IS None THE FIRST FAILURE IS RAISED, WITH ITS index
+    :return: generator of `(index, sql)`
+    """
+    with ParsePool(None, workers, batch_size) as pool:
+        yield from pool.format_many(jsons, ordered=ordered, errors=errors, **kwargs)
@@ -0,0 +1,245 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import re
+import sys
+from collections import OrderedDict
+from threading import Lock
+
+from mo_sql_parsing.tree import SQL_NULL, single_literal, parse_int
+
+
+class ParseCache(object):
+    """
+    BOUNDED, THREAD-SAFE, LEAST-RECENTLY-USED CACHE OF PARSE TREES
+    TREES ARE STORED WITH SQL_NULL PLACEHOLDERS; CALLERS RECEIVE A COPY (SEE copy_tree() AND splice())
+    """
+
+    def __init__(self, size=1000, max_bytes=None, templates=False):
+        """
+        :param size: maximum number of entries
+        :param max_bytes: maximum (approximate) memory used by the entries
+        :param templates: True to also cache by query shape, with literals removed (see to_template())
+        """
+        self.size = size
+        self.templates = templates
+        self.max_bytes = max_bytes
+        self.locker = Lock()
+        self.entries = OrderedDict()  # MAP FROM key TO (tree, num_bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        :return: THE CACHED VALUE (DO NOT MODIFY), OR None
+        """
+        with self.locker:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return entry[0]
+
+    def add(self, key, value):
+        num_bytes = sizeof(value) + sizeof(key)
+        if self.max_bytes is not None and num_bytes > self.max_bytes:
+            return
+        with self.locker:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self.entries[key] = (value, num_bytes)
+            self.bytes += num_bytes
+            while len(self.entries) > self.size or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                _, (_, evicted_bytes) = self.entries.popitem(last=False)
+                self.bytes -= evicted_bytes
+                self.evictions += 1
+
+    def clear(self):
+        with self.locker:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.locker:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def copy_tree(tree, null):
+    """
+    RETURN A COPY OF THE dict/list STRUCTURE, WITH SQL_NULL REPLACED BY null
+    """
+    if tree is SQL_NULL:
+        return null
+    elif isinstance(tree, dict):
+        return {k: copy_tree(v, null) for k, v in tree.items()}
+    elif isinstance(tree, list):
+        return [copy_tree(v, null) for v in tree]
+    return tree
+
+
+def sizeof(tree):
+    """
+    APPROXIMATE MEMORY USED BY A PARSE TREE
+    """
+    if isinstance(tree, dict):
+        return sys.getsizeof(tree) + sum(sizeof(k) + sizeof(v) for k, v in tree.items())
+    elif isinstance(tree, (list, tuple)):
+        return sys.getsizeof(tree) + sum(sizeof(v) for v in tree)
+    return sys.getsizeof(tree)
+
+
+# LITERALS ARE LIFTED OUT OF THE SQL, AND REPLACED WITH PLACEHOLDERS OF THE SAME KIND
+_literals = re.compile(
+    r"(?P<skip>--[^\n]*|#[^\n]*|/\*.*?\*/|\"(?:\"\"|[^\"])*\"|`(?:``|[^`])*`|\[[^\]]*\])"
+    r"|(?P<word>[@_$A-Za-zÀ-ÖØ-öø-ƿ][@_$0-9A-Za-zÀ-ÖØ-öø-ƿ]*)"
+    r"|(?P<string>'(?:''|[^'])*')"
+    r"|(?P<hex>0x[0-9a-fA-F]+)"
+    r"|(?P<real>(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+    r"|(?P<int>\d+)",
+    re.DOTALL,
+)
+_ident_chars = set("@_$0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz") | {
+    chr(c) for r in [(0xC0, 0xD6), (0xD8, 0xF6), (0xF8, 0x1BF)] for c in range(r[0], r[1] + 1)
+}
+PLACEHOLDER = 3_000_000_000_000  # EXACT AS int AND float, AND UNLIKELY TO BE IN REAL SQL
+STRING_MARK = "\ue000"  # PRIVATE USE CHARACTER
+HEX_MARK = "E000E000"
+
+
+def to_template(sql):
+    """
+    REPLACE NON-ZERO NUMBERS, NON-EMPTY STRINGS AND HEX LITERALS WITH NUMBERED PLACEHOLDERS
+    ZERO AND EMPTY LITERALS STAY, BECAUSE SOME PARSE ACTIONS TREAT FALSY VALUES DIFFERENTLY
+    :return: (template, literals) WHERE literals IS A LIST OF PYTHON VALUES, IN PLACEHOLDER ORDER
+    """
+    acc = []
+    literals = []
+    end = 0
+    previous_word = None
+    for found in _literals.finditer(sql):
+        kind = found.lastgroup
+        start, end_of_match = found.span()
+        text = found.group()
+        if kind == "word":
+            previous_word = text.lower()
+            continue
+        elif kind == "skip":
+            continue
+        before = sql[start - 1] if start else " "
+        after = sql[end_of_match] if end_of_match < len(sql) else " "
+        if before in _ident_chars or before == "." or after in _ident_chars or after == ".":
+            # PART OF SOMETHING BIGGER, LIKE N'abc', 10M OR t.5
+            previous_word = None
+            continue
+
+        if kind == "string" and previous_word == "interval":
+            # THE GRAMMAR LOOKS INSIDE INTERVAL STRINGS
+            previous_word = None
+            continue
+        previous_word = None
+        try:
+            if kind == "string":
+                value = single_literal([text])["literal"]
+                placeholder = f"'{STRING_MARK}{len(literals)}{STRING_MARK}'"
+            elif kind == "hex":
+                value = text[2:]
+                placeholder = f"0x{HEX_MARK}{len(literals)}"
+            elif kind == "real":
+                value = float(text)
+                placeholder = f"{PLACEHOLDER + len(literals)}.0"
+            else:
+                value = parse_int([text])
+                placeholder = str(PLACEHOLDER + len(literals))
+        except Exception:
+            # LIKE 'C:\', WHICH THE GRAMMAR REJECTS; LEAVE IT IN THE SQL, SO THE PARSE FAILS AS IT WOULD UNCACHED
+            continue
+        if not value:
+            continue
+        acc.append(sql[end:start])
+        acc.append(placeholder)
+        literals.append(value)
+        end = end_of_match
+    if not literals:
+        return sql, literals
+    acc.append(sql[end:])
+    return "".join(acc), literals
+
+
+def _placeholder_index(value):
+    """
+    :return: (index, negated) IF value IS A PLACEHOLDER, ELSE None
+    """
+    if isinstance(value, bool):
+        return None
+    elif isinstance(value, (int, float)):
+        if value >= PLACEHOLDER:
+            return int(value - PLACEHOLDER), False
+        elif -value >= PLACEHOLDER:
+            return int(-value - PLACEHOLDER), True
+    elif isinstance(value, str):
+        if value.startswith(STRING_MARK) and value.endswith(STRING_MARK) and len(value) > 2:
+            digits = value[1:-1]
+        elif value.startswith(HEX_MARK):
+            digits = value[len(HEX_MARK):]
+        else:
+            return None
+        if digits.isdigit():
+            return int(digits), False
+    return None
+
+
+def find_paths(tree, num_literals):
+    """
+    :return: LIST OF (path, negated) FOR EACH LITERAL, OR None IF ANY PLACEHOLDER IS NOT FOUND EXACTLY ONCE
+    """
+    paths = [None] * num_literals
+    todo = [((), tree)]
+    while todo:
+        path, node = todo.pop()
+        if isinstance(node, dict):
+            children = node.items()
+        elif isinstance(node, list):
+            children = enumerate(node)
+        else:
+            continue
+        for k, v in children:
+            found = _placeholder_index(v)
+            if found is None:
+                todo.append((path + (k,), v))
+                continue
+            index, negated = found
+            if index >= num_literals or paths[index] is not None:
+                return None
+            paths[index] = (path + (k,), negated)
+    if any(p is None for p in paths):
+        return None
+    return paths
+
+
+def splice(tree, paths, literals, null):
+    """
+    RETURN A COPY OF THE TEMPLATE tree, WITH THE literals PUT BACK
+    """
+    output = copy_tree(tree, null)
+    for (path, negated), value in zip(paths, literals):
+        node = output
+        for k in path[:-1]:
+            node = node[k]
+        node[path[-1]] = -value if negated else value
+    return output
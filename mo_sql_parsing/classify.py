@@ -0,0 +1,166 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# THE KIND OF A STATEMENT (READ, WRITE, DDL, ...), FROM ITS LEADING KEYWORD AFTER ANY CTEs
+from enum import Enum
+import re
+
+from mo_sql_parsing.lexer import DIALECTS as QUOTING, Lexer, WORD, QUOTED, OPERATOR, _ident, _patterns
+
+
+class StatementKind(Enum):
+    READ = "read"  # SELECT, VALUES, (SELECT ...), WITH ... SELECT
+    WRITE = "write"  # INSERT, UPDATE, DELETE, MERGE, COPY, WITH ... INSERT
+    DDL = "ddl"  # CREATE, DROP, ALTER, CACHE TABLE
+    EXPLAIN = "explain"  # EXPLAIN, DESC, DESCRIBE
+    SET = "set"  # SET, UNSET, DECLARE, ALTER SESSION
+    UNKNOWN = "unknown"  # NOT A WORD A STATEMENT CAN START WITH
+
+
+# MAP FROM LEADING KEYWORD TO KIND; THE SAME WORDS THE GRAMMAR'S KeywordDispatch JUMPS ON
+_kinds = {
+    "select": StatementKind.READ,
+    "values": StatementKind.READ,
+    "(": StatementKind.READ,
+    "insert": StatementKind.WRITE,
+    "update": StatementKind.WRITE,
+    "delete": StatementKind.WRITE,
+    "merge": StatementKind.WRITE,
+    "copy": StatementKind.WRITE,
+    "create": StatementKind.DDL,
+    "drop": StatementKind.DDL,
+    "alter": StatementKind.DDL,
+    "cache": StatementKind.DDL,
+    "explain": StatementKind.EXPLAIN,
+    "desc": StatementKind.EXPLAIN,
+    "describe": StatementKind.EXPLAIN,
+    "set": StatementKind.SET,
+    "unset": StatementKind.SET,
+    "declare": StatementKind.SET,
+}
+_after_with = {StatementKind.READ, StatementKind.WRITE}
+_scanners = {}  # MAP FROM DIALECT TO (Lexer, REGEX FINDING THE NEXT PARENTHESIS)
+_END = (None, None, 0)
+
+
+def _scanner(dialect):
+    output = _scanners.get(dialect)
+    if output:
+        return output
+    lexer = Lexer(dialect)
+    # SKIP WHAT MAY HIDE A PARENTHESIS (COMMENT, STRING, QUOTED IDENTIFIER) WITHOUT LOOKING AT EACH TOKEN
+    skips = [
+        rf"(?<![{_ident}0-9])(?:{_patterns['regex']})",
+        r"--[^\n]*",
+        r"#[^\n]*",
+        r"/\*.*?\*/",
+        _patterns["string"],
+        _patterns["double"],
+        _patterns["backtick"],
+    ]
+    plain = r"[^()'\"`/#r\-"  # RUNS OF THESE CAN NOT START A SKIP, SO ARE JUMPED IN ONE GO
+    if QUOTING[dialect]["square"]:
+        skips.append(_patterns["square"])
+        plain += r"\["
+    parentheses = re.compile(
+        rf"{plain}]*(?:(?P<open>\()|(?P<close>\))|{'|'.join(skips)}|(?P<error>{_patterns['error']})|.)", re.DOTALL
+    )
+    output = _scanners[dialect] = lexer, parentheses
+    return output
+
+
+def classify(sql, dialect="common"):
+    """
+    THE KIND OF STATEMENT, FROM THE LEADING KEYWORD ONLY; THE CTEs OF A WITH CLAUSE ARE SKIPPED TO FIND THE
+    STATEMENT THEY BELONG TO.  THE REST OF THE STATEMENT IS NOT READ, SO A STATEMENT parse() REJECTS MAY STILL
+    GET A KIND
+    :param sql: String of SQL
+    :param dialect: one of "common", "mysql", "bigquery", "sqlserver"
+    :return: StatementKind
+    """
+    scanner = _scanner(dialect)
+    _, word, end = _next(scanner, sql, 0)
+    if word == "with":
+        kind = _kinds.get(_skip_ctes(scanner, sql, end))
+        return kind if kind in _after_with else StatementKind.UNKNOWN
+    elif word == "alter":
+        _, word, _ = _next(scanner, sql, end)
+        return StatementKind.SET if word == "session" else StatementKind.DDL
+    return _kinds.get(word, StatementKind.UNKNOWN)
+
+
+def _next(scanner, sql, start):
+    """
+    :return: (kind, text, end) OF THE TOKEN AT, OR AFTER THE WHITESPACE AT, start; WORDS IN LOWER CASE
+    """
+    lexer = scanner[0]
+    found = lexer.regex.match(sql, start)
+    if found and found.lastgroup == "gap":
+        found = lexer.regex.match(sql, found.end())
+    if not found:
+        return _END
+    kind = lexer.kinds[found.lastgroup]
+    if kind == WORD:
+        return kind, found.group(0).lower(), found.end()
+    return kind, found.group(0), found.end()
+
+
+def _skip_ctes(scanner, sql, start):
+    """
+    READ PAST [RECURSIVE] name [(columns)] AS (...) [, ...]
+    :return: THE FIRST WORD AFTER THE CTEs, OR None IF THEY DO NOT LOOK LIKE CTEs
+    """
+    kind, text, end = _next(scanner, sql, start)
+    if text == "recursive":
+        kind, text, end = _next(scanner, sql, end)
+    while True:
+        if kind != WORD and kind != QUOTED:
+            return None
+        kind, text, end = _next(scanner, sql, end)
+        while text == ".":
+            kind, text, end = _next(scanner, sql, end)
+            if kind != WORD and kind != QUOTED:
+                return None
+            kind, text, end = _next(scanner, sql, end)
+        if text == "(":
+            end = _skip_parentheses(scanner, sql, end)
+            if end is None:
+                return None
+            kind, text, end = _next(scanner, sql, end)
+        if text != "as":
+            return None
+        kind, text, end = _next(scanner, sql, end)
+        if text != "(":
+            return None
+        end = _skip_parentheses(scanner, sql, end)
+        if end is None:
+            return None
+        kind, text, end = _next(scanner, sql, end)
+        if text != ",":
+            return text if kind == WORD or kind == OPERATOR else None
+        kind, text, end = _next(scanner, sql, end)
+
+
+def _skip_parentheses(scanner, sql, start):
+    """
+    :param start: JUST AFTER AN OPEN (
+    :return: THE POSITION JUST AFTER THE ) THAT CLOSES IT, OR None IF THERE IS NONE
+    """
+    depth = 1
+    for found in scanner[1].finditer(sql, start):
+        name = found.lastgroup
+        if name == "open":
+            depth += 1
+        elif name == "close":
+            depth -= 1
+            if not depth:
+                return found.end()
+        elif name == "error":
+            return None
+    return None
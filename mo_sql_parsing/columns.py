@@ -0,0 +1,221 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# TABLES OF LITERALS (VALUES (...), (...)) STORED BY COLUMN, IN TYPED ARRAYS INSTEAD OF PYTHON OBJECTS
+from array import array
+
+_kinds = {int: "int64", float: "float64", bool: "bool", str: "utf8"}
+_typecodes = {"int64": "q", "float64": "d", "bool": "b"}
+_MIN_INT64 = -(1 << 63)
+_MAX_INT64 = (1 << 63) - 1
+_NUMBERS = {"int64", "float64"}
+_MAX_EXACT = 1 << 53  # BIGGER ints ARE NOT ALL EXACT AS A float
+
+
+class Column(object):
+    """
+    ONE COLUMN OF A ColumnTable
+    kind IS ONE OF
+        "int64" - data IS array("q")
+        "float64" - data IS array("d"), ALSO FOR ints MIXED WITH floats (ints COME BACK AS floats, 3 -> 3.0)
+        "bool" - data IS array("b")
+        "utf8" - data IS A bytearray OF ALL THE STRINGS, CELL i IS data[offsets[i]:offsets[i + 1]]
+        "object" - data IS A list, WHEN THE CELLS ARE OF MIXED KINDS (OR TOO BIG FOR int64, OR AN int
+                   BEYOND 2**53 MIXED WITH floats)
+        None - EVERY CELL IS NULL
+    nulls IS A BITMAP: CELL i IS NULL IF nulls[i >> 3] & (1 << (i & 7)); NULL CELLS HAVE 0 (OR "") IN data
+    """
+
+    __slots__ = ["kind", "data", "offsets", "nulls", "length"]
+
+    def __init__(self):
+        self.kind = None
+        self.data = None
+        self.offsets = None
+        self.nulls = bytearray()
+        self.length = 0
+
+    def append(self, value):
+        """
+        :param value: int, float, bool, str, OR None FOR NULL
+        """
+        i = self.length
+        self.length = i + 1
+        if not i & 7:
+            self.nulls.append(0)
+        kind = self.kind
+        if value is None:
+            self.nulls[i >> 3] |= 1 << (i & 7)
+            if kind == "utf8":
+                self.offsets.append(len(self.data))
+            elif kind == "object":
+                self.data.append(None)
+            elif kind is not None:
+                self.data.append(0)
+            return
+
+        new_kind = _kinds.get(value.__class__, "object")
+        if kind == new_kind:
+            if kind == "utf8":
+                self.data += value.encode("utf8")
+                self.offsets.append(len(self.data))
+                return
+            try:
+                self.data.append(value)
+                return
+            except OverflowError:
+                new_kind = "object"
+        elif kind == "object":
+            self.data.append(value)
+            return
+        elif {kind, new_kind} == _NUMBERS and self._widen(value):
+            return
+        self._retype(new_kind, i, value)
+
+    def _widen(self, value):
+        """
+        ints AND floats IN ONE COLUMN: KEEP THEM ALL AS float64
+        :param value: THE int OR float TO APPEND
+        :return: False IF AN int IS NOT EXACT AS A float (NOTHING IS CHANGED)
+        """
+        if self.kind == "int64":
+            if not all(-_MAX_EXACT <= v <= _MAX_EXACT for v in self.data):
+                return False
+        elif not -_MAX_EXACT <= value <= _MAX_EXACT:
+            return False
+        if self.kind == "int64":
+            self.kind = "float64"
+            self.data = array("d", self.data)
+        self.data.append(float(value))
+        return True
+
+    def _retype(self, kind, i, value):
+        """
+        THE FIRST VALUE (AFTER ONLY NULLS), OR ONE OF ANOTHER KIND: CHANGE THE kind, AND PUT value AT i
+        """
+        if kind == "int64" and not _MIN_INT64 <= value <= _MAX_INT64:
+            kind = "object"
+        if self.kind is None and kind != "object":
+            self.kind = kind
+            if kind == "utf8":
+                self.data = bytearray(value.encode("utf8"))
+                self.offsets = array("q", [0] * (i + 1) + [len(self.data)])
+            else:
+                self.data = array(_typecodes[kind], [0] * i + [value])
+            return
+        existing = [self[j] for j in range(i)]
+        existing.append(value)
+        self.kind = "object"
+        self.data = existing
+        self.offsets = None
+
+    def is_null(self, i):
+        return bool(self.nulls[i >> 3] & (1 << (i & 7)))
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError("column index out of range")
+        if self.nulls[i >> 3] & (1 << (i & 7)):
+            return None
+        kind = self.kind
+        if kind == "utf8":
+            return self.data[self.offsets[i] : self.offsets[i + 1]].decode("utf8")
+        elif kind == "bool":
+            return bool(self.data[i])
+        return self.data[i]
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def to_list(self):
+        """
+        :return: THE CELLS AS PYTHON VALUES, None FOR NULL
+        """
+        kind = self.kind
+        if kind is None:
+            return [None] * self.length
+        elif kind == "utf8":
+            data = self.data
+            offsets = self.offsets
+            output = [data[offsets[i] : offsets[i + 1]].decode("utf8") for i in range(self.length)]
+        elif kind == "bool":
+            output = [bool(v) for v in self.data]
+        else:
+            output = list(self.data)
+        for b, bits in enumerate(self.nulls):
+            if bits:
+                for j in range(8):
+                    if bits & (1 << j):
+                        output[(b << 3) + j] = None
+        return output
+
+
+class ColumnTable(object):
+    """
+    THE ROWS OF A LITERAL VALUES TABLE, STORED AS ONE Column PER COLUMN
+    ITERATE (OR to_list()) FOR THE ROWS AS THE REST OF THE PARSE TREE WOULD HAVE THEM: LISTS, OR DICTS
+    WHEN THE INSERT NAMES ITS COLUMNS.  NULL CELLS ARE None
+    A ROW WITH NULL OR A bool, WHICH THE PLAIN PARSE TURNS INTO {"columns", "query": {"union_all"}}, IS STILL
+    IN THE ColumnTable UNDER "values"; THE COLUMN NAMES ARE IN names
+    """
+
+    __slots__ = ["columns", "names"]
+
+    def __init__(self, columns=None, names=None):
+        """
+        :param columns: list of Column, all the same length
+        :param names: the column names (from INSERT INTO t (a, b) ...), or None
+        """
+        self.columns = columns or []
+        self.names = names
+
+    def extend(self, rows):
+        """
+        APPEND rows (LISTS OF int, float, bool, str OR None)
+        :return: False IF A ROW IS NOT AS WIDE AS THE OTHERS (NOTHING MORE IS ADDED)
+        """
+        columns = self.columns
+        if not columns and rows:
+            columns.extend(Column() for _ in rows[0])
+        width = len(columns)
+        for row in rows:
+            if len(row) != width:
+                return False
+            for column, value in zip(columns, row):
+                column.append(value)
+        return True
+
+    def rows(self):
+        """
+        :return: GENERATOR OF ROWS, AS LISTS
+        """
+        return (list(row) for row in zip(*(c.to_list() for c in self.columns)))
+
+    def to_list(self):
+        if self.names:
+            return [dict(zip(self.names, row)) for row in self.rows()]
+        return list(self.rows())
+
+    def __iter__(self):
+        if self.names:
+            return (dict(zip(self.names, row)) for row in self.rows())
+        return self.rows()
+
+    def __len__(self):
+        if not self.columns:
+            return 0
+        return len(self.columns[0])
+
+    def __repr__(self):
+        return f"ColumnTable({len(self.columns)} columns, {len(self)} rows)"
@@ -0,0 +1,98 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# CHOOSE A STATEMENT'S SUB-GRAMMAR BY ITS FIRST KEYWORD
+import re
+
+from mo_parsing import MatchFirst, ParseException
+from mo_parsing.results import ParseResults
+
+from mo_sql_parsing.tree import matching
+
+_head = re.compile(r"[@_$0-9A-Za-zÀ-ÖØ-öø-ƿ]+|.", re.DOTALL)
+MAX_MEMO = 1000  # DISTINCT LEADING WORDS TO REMEMBER
+
+
+def head(text, start=0):
+    """
+    :return: THE WORD (OR SINGLE NON-WORD CHARACTER) AT start, LOWER CASE
+    """
+    found = _head.match(text, start)
+    return found.group(0).lower() if found else ""
+
+
+class KeywordDispatch(MatchFirst):
+    """
+    SAME AS MatchFirst, BUT ONLY TRIES THE exprs THAT CAN START WITH THE WORD AT THE PARSE LOCATION
+    THE TABLE IS BUILT FROM EACH EXPRESSION'S expecting(), SO IT FOLLOWS THE GRAMMAR.  exprs THAT DO NOT
+    KNOW WHAT THEY EXPECT ARE TRIED FOR EVERY WORD; WORDS NOT IN THE TABLE ARE TRIED AGAINST ALL exprs
+    """
+
+    __slots__ = ["heads", "memo"]
+
+    def __init__(self, exprs):
+        MatchFirst.__init__(self, exprs)
+        self.heads = None
+        self.memo = {}
+
+    def copy(self):
+        output = MatchFirst.copy(self)
+        output.heads = self.heads
+        output.memo = {}
+        return output
+
+    def streamline(self):
+        if self.streamlined:
+            return self
+        output = MatchFirst.streamline(self)
+        if isinstance(output, KeywordDispatch):
+            # FOR EACH EXPRESSION, THE WORDS IT CAN START WITH; None FOR "ANYTHING"
+            output.heads = [{head(k) for k in e.expecting().keys()} or None for e in output.exprs]
+            output.memo = {}
+        return output
+
+    def candidates(self, word):
+        """
+        :return: THE exprs THAT CAN MATCH STARTING WITH word, IN ORIGINAL ORDER, OR None IF ALL MUST BE TRIED
+        """
+        found = self.memo.get(word)
+        if found is not None:
+            return found
+        found = []
+        known = False
+        for e, heads in zip(self.exprs, self.heads):
+            if heads is None:
+                found.append(e)
+            elif any(word.startswith(h) for h in heads):
+                # A KEY CAN BE A PREFIX OF THE WORD (Literal("sel") MATCHES "select")
+                found.append(e)
+                known = True
+        if not known:
+            found = self.alternate  # NOTHING KNOWN ABOUT THIS WORD, TRY EVERYTHING
+        if len(self.memo) < MAX_MEMO:
+            self.memo[word] = found
+        return found
+
+    def parse_impl(self, string, start, do_actions=True):
+        meter = matching.context.meter
+        if meter is not None:
+            meter.spend()
+        if self.heads is None:
+            return MatchFirst.parse_impl(self, string, start, do_actions)
+
+        failures = []
+        for e in self.candidates(head(string, start)):
+            try:
+                result = e._parse(string, start, do_actions)
+                failures.extend(result.failures)
+                return ParseResults(self, result.start, result.end, [result], failures)
+            except ParseException as cause:
+                failures.append(cause)
+
+        raise ParseException(self, start, string, cause=failures)
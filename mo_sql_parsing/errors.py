@@ -0,0 +1,194 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# PARSE FAILURES THAT ARE CHEAP UNTIL READ: THE BEST CAUSE, THE MESSAGE, WHAT WAS EXPECTED, AND WHERE, ARE ONLY
+# FOUND WHEN ASKED FOR
+CONTEXT = 30  # CHARACTERS SHOWN ON EACH SIDE OF THE ERROR LOCATION
+
+
+def match(parser, sql, context=None):
+    """
+    SAME AS parser.parse_string(sql, parse_all=True), BUT A FAILURE IS RAISED AS FOUND, WITHOUT SEARCHING THE
+    TREE OF FAILED ALTERNATIVES FOR THE BEST CAUSE (MOST OF THE COST OF A FAILURE).  USE best_cause() TO GET
+    WHAT parse_string() WOULD HAVE RAISED.  THE MATCH HOLDS mo_parsing's core.locker, SO MATCHES ON DIFFERENT
+    THREADS RUN ONE AT A TIME; THE CALLER BUILDS THE TREE OUTSIDE THE LOCK
+    :param context: tree.ParseContext WITH THE columnar, meter AND memo OF THIS PARSE, OR None
+    """
+    from mo_parsing import core, ParseException, StringEnd
+    from mo_sql_parsing.tree import matching
+
+    with core.locker:
+        for reset in core._reset_actions:
+            reset()
+        previous = matching.context
+        if context is not None:
+            matching.context = context
+        try:
+            whitespace = parser.whitespace
+            tokens = parser.element._parse(sql, whitespace.skip(sql, 0))
+            try:
+                StringEnd()._parse(sql, whitespace.skip(sql, tokens.end))
+            except ParseException as cause:
+                raise ParseException(parser.element, 0, sql, cause=tokens.failures + [cause]) from None
+        finally:
+            matching.context = previous
+        if parser.named:
+            return tokens
+        return tokens.tokens[0]
+
+
+def locate(parser, sql, failure, context=None):
+    """
+    A PARSE ACTION THAT FAILS (LIKE A LITERAL THAT CAN NOT BE CONVERTED) RAISES A mo_logs Except, WITH NO LOCATION.
+    MATCH sql AGAIN, NOTING THE INNERMOST ELEMENT THAT RAISES, SO ONLY USE THIS ONCE THE MATCH HAS FAILED
+    :param failure: THE EXCEPTION (NOT A ParseException) RAISED BY match()
+    :return: ParseException AT THE ELEMENT THAT RAISED failure, OR None IF THE MATCH DOES NOT RAISE IT AGAIN
+    """
+    from mo_parsing import core, ParseException
+    from mo_parsing.core import ParserElement
+
+    found = []
+    with core.locker:
+        previous = ParserElement._parse
+
+        def located(self, string, start, do_actions=True):
+            try:
+                return previous(self, string, start, do_actions)
+            except ParseException:
+                raise
+            except Exception:
+                if not found:
+                    found.append((self, start))
+                raise
+
+        ParserElement._parse = located
+        try:
+            match(parser, sql, context)
+            return None
+        except ParseException:
+            return None
+        except Exception as again:
+            if not found or type(again) is not type(failure):
+                return None
+        finally:
+            ParserElement._parse = previous
+
+    expr, start = found[0]
+    reason = str(getattr(failure, "cause", None) or failure).split("\n")[0]
+    if reason.startswith("ERROR: "):
+        reason = reason[len("ERROR: ") :]
+    return ParseException(expr, start, sql, reason)
+
+
+def best_cause(failure):
+    """
+    :param failure: AN EXCEPTION RAISED BY match()
+    :return: THE EXCEPTION parse_string() WOULD HAVE RAISED
+    """
+    from mo_parsing import ParseException
+
+    if isinstance(failure, ParseException):
+        return failure.best_cause
+    return failure
+
+
+class ParseError(object):
+    """
+    SQL THAT DID NOT PARSE; ONLY THE RAW FAILURE IS KEPT UNTIL SOMETHING IS READ
+    """
+
+    __slots__ = ["sql", "failure", "_cause"]
+
+    def __init__(self, sql, failure):
+        """
+        :param sql: the SQL that was parsed
+        :param failure: the exception raised by match()
+        """
+        self.sql = sql
+        self.failure = failure
+        self._cause = None
+
+    @property
+    def cause(self):
+        """
+        :return: THE ParseException parse() WOULD HAVE RAISED
+        """
+        if self._cause is None:
+            self._cause = best_cause(self.failure)
+        return self._cause
+
+    @property
+    def message(self):
+        return str(self.cause)
+
+    @property
+    def location(self):
+        """
+        :return: CHARACTER OFFSET OF THE ERROR
+        """
+        return self.cause.loc
+
+    @property
+    def line(self):
+        return self.cause.lineno
+
+    @property
+    def column(self):
+        return self.cause.column
+
+    @property
+    def expecting(self):
+        """
+        :return: set OF THE KEYWORDS (OR, IF NOT KNOWN, THE GRAMMAR NAMES) THAT COULD HAVE MATCHED AT location
+        """
+        expr = self.cause.expr
+        output = set(expr.expecting().keys())
+        if output:
+            return output
+        # SEVERAL EQUALLY GOOD CAUSES ARE COMBINED INTO ONE UNNAMED MatchFirst
+        exprs = [expr] if expr.parser_name else getattr(expr, "exprs", None) or [expr]
+        return {e.parser_name for e in exprs if e.parser_name}
+
+    @property
+    def context(self):
+        """
+        :return: THE LINE OF THE SQL AROUND THE ERROR, WITH >!< MARKING THE LOCATION
+        """
+        sql = self.sql
+        location = min(self.location, len(sql))
+        start = max(sql.rfind("\n", 0, location) + 1, location - CONTEXT)
+        end = sql.find("\n", location)
+        end = min(len(sql) if end == -1 else end, location + CONTEXT)
+        return f"{sql[start:location]}>!<{sql[location:end]}"
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return f"ParseError({self.message!r})"
+
+
+class Parsed(object):
+    """
+    WHAT try_parse() RETURNS: THE tree, OR THE error; TRUE IF THE SQL PARSED
+    """
+
+    __slots__ = ["tree", "error"]
+
+    def __init__(self, tree, error):
+        self.tree = tree
+        self.error = error
+
+    def __bool__(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.error is None:
+            return f"Parsed({self.tree!r})"
+        return f"Parsed(error={self.error!r})"
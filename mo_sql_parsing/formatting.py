@@ -13,21 +13,17 @@ import re
 
 from mo_dots import split_field
 from mo_future import first, is_text, string_types, text
-from mo_parsing import listwrap
 
-from mo_sql_parsing.keywords import RESERVED, join_keywords, precedence
-from mo_sql_parsing.utils import binary_ops, is_set_op
+from mo_sql_parsing.columns import ColumnTable
+from mo_sql_parsing.operators import binary_ops, is_set_op, join_keywords, precedence, reserved_keywords
+from mo_sql_parsing.tree import listwrap
 
 MAX_PRECEDENCE = 100
 VALID = re.compile(r"^[a-zA-Z_]\w*$")
 
 
 def is_keyword(identifier):
-    try:
-        RESERVED.parse_string(identifier)
-        return True
-    except Exception:
-        return False
+    return identifier.lower() in reserved_keywords
 
 
 def should_quote(identifier):
@@ -407,10 +403,18 @@ class Formatter:
         return f"INTERVAL {amount} {type.upper()}"
 
     def _literal(self, json, prec=0):
-        if isinstance(json, list):
+        if json is None:
+            # A NULL CELL OF A ColumnTable
+            return "NULL"
+        elif isinstance(json, ColumnTable):
+            return self._literal(list(json.rows()), prec)
+        elif isinstance(json, list):
             return "({0})".format(", ".join(self._literal(v, precedence["literal"]) for v in json))
         elif isinstance(json, string_types):
             return "'{0}'".format(json.replace("'", "''"))
+        elif isinstance(json, bool):
+            # A bool CELL OF A ColumnTable
+            return "TRUE" if json else "FALSE"
         else:
             return str(json)
 
@@ -630,7 +634,14 @@ class Formatter:
             acc.append(self.sql_list(json))
         if "values" in json:
             values = json["values"]
-            if all(isinstance(row, dict) for row in values):
+            if isinstance(values, ColumnTable):
+                if values.names:
+                    acc.append(self.sql_list(values.names))
+                if "if exists" in json:
+                    acc.append("IF EXISTS")
+                acc.append("VALUES")
+                acc.append(",\n".join(self._literal(row) for row in values.rows()))
+            elif all(isinstance(row, dict) for row in values):
                 columns = list(sorted(set(k for row in values for k in row.keys())))
                 acc.append(self.sql_list(columns))
                 if "if exists" in json:
@@ -641,8 +652,7 @@ class Formatter:
                 if "if exists" in json:
                     acc.append("IF EXISTS")
                 acc.append("VALUES")
-                for row in values:
-                    acc.append("(" + ", ".join(self._literal(row)) + ")")
+                acc.append(",\n".join(self._literal(row) for row in values))
 
         else:
             if json["if exists"]:
@@ -0,0 +1,187 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# OPERATOR EXPRESSIONS BY PRECEDENCE CLIMBING
+#
+# mo_parsing.infix_notation MATCHES A FLAT LIST OF OPERANDS AND OPERATORS, AND THEN BUILDS THE TREE BY
+# REPEATEDLY SCANNING THE WHOLE LIST FOR THE TIGHTEST OPERATOR LEFT: QUADRATIC IN THE NUMBER OF TOKENS,
+# TIMES THE NUMBER OF PRECEDENCE TIERS.  THIS MATCHES THE SAME FLAT LIST, AND BUILDS THE SAME TREE IN ONE PASS.
+from mo_dots import listwrap
+from mo_parsing import whitespaces
+from mo_parsing.enhancement import Forward, Group, Suppress, ZeroOrMore
+from mo_parsing.exceptions import ParseException
+from mo_parsing.expressions import MatchFirst, Or
+from mo_parsing.infix import RIGHT_ASSOC, infix_notation as legacy_infix_notation
+from mo_parsing.results import ParseResults, NO_PARSER
+from mo_parsing.tokens import Empty, Literal
+from mo_parsing.utils import wrap_parse_action
+
+from mo_sql_parsing.tree import matching
+
+PRECEDENCE = "precedence"  # BUILD THE TREE BY PRECEDENCE CLIMBING
+LEGACY = "legacy"  # BUILD THE TREE WITH mo_parsing.infix_notation
+ENGINES = (PRECEDENCE, LEGACY)
+
+_no_op = Empty().suppress()
+
+
+class Metered(Forward):
+    """
+    A Forward THAT SPENDS FROM THE BUDGET OF THE PARSE IN PROGRESS ON EVERY ATTEMPT; NESTED PARENTHESES
+    BACKTRACK HERE WITHOUT GOING THROUGH THE expression
+    """
+
+    __slots__ = []
+
+    def _parse(self, string, start, do_actions=True):
+        meter = matching.context.meter
+        if meter is not None:
+            meter.spend()
+        return Forward._parse(self, string, start, do_actions)
+
+
+def infix_notation(base_expr, spec, lpar=Suppress(Literal("(")), rpar=Suppress(Literal(")")), engine=PRECEDENCE):
+    """
+    SAME AS mo_parsing.infix_notation, AND SAME RESULTS
+    :param base_expr: THE OPERAND
+    :param spec: LIST OF (op_expr, arity, assoc, parse_action), ONE PER PRECEDENCE TIER, TIGHTEST FIRST
+    :param engine: PRECEDENCE OR LEGACY
+    """
+    if engine == LEGACY:
+        return legacy_infix_notation(base_expr, spec, lpar, rpar)
+    if engine != PRECEDENCE:
+        raise Exception(f"Expecting engine to be one of {', '.join(ENGINES)}")
+
+    all_op = {}
+
+    def norm(op):
+        if op is None:
+            op = _no_op
+        output = all_op.get(id(op))
+        if output:
+            return output
+        output = whitespaces.CURRENT.normalize(op)
+        is_suppressed = isinstance(output, Suppress)
+        if is_suppressed:
+            output = output.expr
+        all_op[id(op)] = is_suppressed, output
+        return is_suppressed, output
+
+    # FOR EACH OPERATOR THAT CAN START AN OPERAND (PREFIX), OR FOLLOW ONE (SUFFIX, BINARY, TERNARY),
+    # THE (tier, arity, assoc, expr, op, is_suppressed, parse_actions) OF ITS TIGHTEST TIER
+    leading = {}
+    trailing = {}
+    op_parts = []  # EVERY OPERATOR THAT GOES BETWEEN TWO OPERANDS
+    for tier, (op, arity, assoc, *rest) in enumerate(spec):
+        parse_actions = [wrap_parse_action(a) for a in listwrap(rest[0])] if rest else []
+        if arity == 1:
+            is_suppressed, op = norm(op)
+            if assoc == RIGHT_ASSOC:
+                expr, first, lookup = Group(base_expr + op), op, leading
+            else:
+                expr, first, lookup = Group(op + base_expr), op, trailing
+        elif arity == 2:
+            is_suppressed, op = norm(op)
+            expr, first, lookup = Group(base_expr + op + base_expr), op, trailing
+            op_parts.append(op)
+        elif arity == 3:
+            is_suppressed, op = zip(norm(op[0]), norm(op[1]))
+            expr, first, lookup = Group(base_expr + op[0] + base_expr + op[1] + base_expr), op[0], trailing
+            op_parts.extend(op)
+        else:
+            raise Exception("Expecting arity of 1, 2 or 3")
+        lookup.setdefault(first, (tier, arity, assoc, expr, op, is_suppressed, parse_actions))
+
+    def record_op(op):
+        def output(tokens):
+            return ParseResults(NO_PARSER, tokens.start, tokens.end, [(tokens, op)], [])
+
+        return output
+
+    prefix_ops = MatchFirst([op / record_op(op) for op, _ in leading.items()])
+    suffix_ops = MatchFirst([op / record_op(op) for op, entry in trailing.items() if entry[1] == 1])
+    ops = Or([op_part / record_op(op_part) for op_part in set(op_parts)])
+
+    def act(result, parse_actions, string):
+        for p in parse_actions:
+            result = p(result, -1, string)
+        return result
+
+    def climb(flat, index, limit, string):
+        """
+        :return: (tree, next_index) FOR THE OPERAND AT index, EXTENDED WITH OPERATORS FROM TIERS TIGHTER THAN limit
+        """
+        token, op = flat[index]
+        index += 1
+        entry = leading.get(op)
+        if entry is None:
+            left = token
+        else:
+            # PREFIX OPERATOR
+            tier, _, _, expr, _, is_suppressed, parse_actions = entry
+            operand, index = climb(flat, index, tier, string)
+            if is_suppressed:
+                result = ParseResults(expr, operand.start, operand.end, (operand,), [])
+            else:
+                result = ParseResults(expr, token.start, operand.end, (token, operand), [])
+            left = act(result, parse_actions, string)
+
+        num = len(flat)
+        while index < num:
+            token, op = flat[index]
+            entry = trailing.get(op)
+            if entry is None or entry[0] >= limit:
+                break
+            tier, arity, assoc, expr, op, is_suppressed, parse_actions = entry
+            right_limit = tier + 1 if assoc == RIGHT_ASSOC else tier
+            if arity == 1:
+                # SUFFIX OPERATOR
+                index += 1
+                if is_suppressed:
+                    result = ParseResults(expr, left.start, left.end, (left,), [])
+                else:
+                    result = ParseResults(expr, left.start, token.end, (left, token), [])
+            elif arity == 2:
+                right, index = climb(flat, index + 1, right_limit, string)
+                if is_suppressed:
+                    result = ParseResults(expr, left.start, right.end, (left, right), [])
+                else:
+                    result = ParseResults(expr, left.start, right.end, (left, token, right), [])
+            else:
+                middle, index = climb(flat, index + 1, tier, string)
+                if index >= num or flat[index][1] is not op[1]:
+                    raise ParseException(expr, token.start, string, "Expecting second part of operator")
+                second = flat[index][0]
+                right, index = climb(flat, index + 1, right_limit, string)
+                seq = [left, middle, right]
+                s0, s1 = is_suppressed
+                if not s1:
+                    seq.insert(2, second)
+                if not s0:
+                    seq.insert(1, token)
+                result = ParseResults(expr, left.start, right.end, seq, [])
+            left = act(result, parse_actions, string)
+        return left, index
+
+    def make_tree(tokens, loc, string):
+        flat = list(tokens)
+        result, index = climb(flat, 0, len(spec), string)
+        if index < len(flat):
+            raise ParseException(flat[index][1], flat[index][0].start, string, "Expecting operator")
+        result.end = tokens.end
+        result.failures = tokens.failures
+        return result
+
+    flat = Metered()
+    iso = lpar.suppress() + flat + rpar.suppress()
+    atom = (base_expr | iso) / record_op(base_expr)
+    decorated = ZeroOrMore(prefix_ops) + atom + ZeroOrMore(suffix_ops)
+    flat << ((decorated + ZeroOrMore(ops + decorated)) / make_tree).streamline()
+
+    return flat.streamline()
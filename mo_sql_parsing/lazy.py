@@ -0,0 +1,133 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# PARSE TREES THAT CONVERT EACH CLAUSE ONLY WHEN IT IS ASKED FOR
+from collections.abc import Mapping
+
+from mo_dots import is_null
+
+from mo_sql_parsing.tree import scrub, simple_op, Call, SQL_NULL
+
+_DROPPED = object()  # scrub() LEAVES THIS KEY OUT OF THE dict
+
+
+class LazyTree(Mapping):
+    """
+    THE TOP dict OF A PARSE TREE, FROM parse(sql, output="lazy")
+    EACH VALUE (select, from, where, ...) IS scrub()BED THE FIRST TIME IT IS ASKED FOR, AND KEPT
+    ASKING FOR THE KEYS (OR len(), OR ==) CONVERTS EVERY VALUE, SINCE scrub() DROPS THE EMPTY ONES
+    NOT SAFE TO SHARE BETWEEN THREADS UNTIL to_json() IS CALLED
+    """
+
+    __slots__ = ["_todo", "_done", "_op", "_context"]
+
+    def __init__(self, todo, context, op=None, done=None):
+        """
+        :param todo: dict FROM KEY TO THE ParseResults (OR Call, OR list) OF THE VALUE, IN ORDER
+        :param context: ParseContext OF THE PARSE
+        :param op: THE KEY HOLDING THE ARGUMENTS, WHEN THE TREE IS A Call (LIKE INSERT)
+        :param done: dict OF VALUES ALREADY CONVERTED
+        """
+        self._todo = todo
+        self._done = {} if done is None else done
+        self._op = op
+        self._context = context
+
+    def __getitem__(self, key):
+        value = self._done.get(key, _DROPPED)
+        if value is _DROPPED:
+            if key not in self._todo or key in self._done:
+                raise KeyError(key)
+            value = self._scrub(key)
+        return value
+
+    def _scrub(self, key):
+        context = self._context
+        value = scrub(self._todo[key], context)
+        if key == self._op:
+            # AS simple_op() DOES
+            if value is None:
+                value = {}
+            elif value is SQL_NULL:
+                value = context.null
+        elif is_null(value):
+            self._done[key] = _DROPPED
+            raise KeyError(key)
+        elif value is SQL_NULL:
+            value = context.null
+        self._done[key] = value
+        return value
+
+    def _scrub_all(self):
+        done = self._done
+        for key in self._todo:
+            if key not in done:
+                try:
+                    self._scrub(key)
+                except KeyError:
+                    pass
+        return done
+
+    def __iter__(self):
+        done = self._scrub_all()
+        return (k for k in self._todo if done[k] is not _DROPPED)
+
+    def __len__(self):
+        done = self._scrub_all()
+        return sum(1 for v in done.values() if v is not _DROPPED)
+
+    def to_json(self):
+        """
+        :return: THE SAME dict parse() WOULD HAVE RETURNED
+        """
+        done = self._scrub_all()
+        return {k: done[k] for k in self._todo if done[k] is not _DROPPED}
+
+    def __repr__(self):
+        # ONLY THE KEYS scrub() KEEPS, SO EVERY VALUE IS CONVERTED
+        return f"LazyTree({', '.join(self)})"
+
+
+def lazy(result, context):
+    """
+    :param result: ParseResults OF A WHOLE STATEMENT
+    :param context: ParseContext OF THE PARSE
+    :return: LazyTree, WITHOUT scrub()BING ANY CLAUSE
+    """
+    from mo_parsing import ParseResults
+
+    # FOLLOW THE SINGLE-ELEMENT WRAPPERS DOWN TO THE STATEMENT, AS scrub() WOULD
+    node = result
+    while True:
+        if node == None:
+            break
+        elif isinstance(node, ParseResults):
+            if any(True for _ in node.items()):
+                break
+            elements = list(node)
+            if len(elements) != 1:
+                break
+            node = elements[0]
+        elif isinstance(node, list):
+            if len(node) != 1:
+                break
+            node = node[0]
+        elif node.__class__ is dict and node:
+            return LazyTree(node, context)
+        elif isinstance(node, Call) and node is not SQL_NULL and context.calls is simple_op:
+            todo = dict(node.kwargs)
+            todo[node.op] = node.args
+            return LazyTree(todo, context, node.op)
+        else:
+            break
+    # NOT A SHAPE THAT CAN BE CONVERTED ONE CLAUSE AT A TIME
+    output = scrub(result, context)
+    if not isinstance(output, dict):
+        return output
+    return LazyTree(output, context, done=dict(output))
@@ -0,0 +1,112 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# ONE COMBINED REGEX FOR THE TOKENS OF SQL, AND THE WHITESPACE AND COMMENTS BETWEEN THEM; classify READS THE
+# LEADING KEYWORDS OF A STATEMENT WITH IT, WITHOUT THE GRAMMAR.  ALSO A SPARSE SKIP MEMO, FOR parse(columnar=True)
+import re
+
+# TOKEN KINDS
+WORD = 1  # KEYWORD OR SIMPLE IDENTIFIER
+QUOTED = 2  # DELIMITED IDENTIFIER
+STRING = 3
+NUMBER = 4
+OPERATOR = 5
+OTHER = 6
+ERROR = 7  # UNTERMINATED STRING, IDENTIFIER OR COMMENT
+
+KIND_NAMES = {
+    WORD: "word",
+    QUOTED: "quoted",
+    STRING: "string",
+    NUMBER: "number",
+    OPERATOR: "operator",
+    OTHER: "other",
+    ERROR: "error",
+}
+
+_ident = "@_$A-Za-zÀ-ÖØ-öø-ƿ"
+_patterns = {
+    # ORDER MATTERS: EARLIER ALTERNATIVES WIN
+    "gap": r"(?:[ \t\r\n]+|--[^\n]*|#[^\n]*|/\*.*?\*/)+",  # SAME AS THE GRAMMAR'S WHITESPACE AND COMMENTS
+    "regex": r"""r'(?:\\'|[^'])*'|r"(?:\\"|[^"])*\"""",
+    "string": r"'(?:''|[^'])*'",
+    "double": r'"(?:""|[^"])*"',
+    "backtick": r"`(?:``|[^`])*`",
+    "square": r"\[(?:\]\]|[^\]])*\]",
+    "number": r"0x[0-9a-fA-F]+|(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?|\d+(?:[eE]\+?\d+)?",
+    "word": rf"[{_ident}][{_ident}0-9]*",
+    "error": r"""/\*|['"`]""",
+    "operator": r"<=>|::|->|\|\||<=|>=|<>|!=|==|[-+*/%&|^~<>=!:.,;()\[\]{}?]",
+    "other": r".",
+}
+
+DIALECTS = {
+    # FOR EACH DIALECT, THE KIND OF EACH QUOTING STYLE
+    "common": {"double": QUOTED, "square": None},
+    "mysql": {"double": STRING, "square": QUOTED},
+    "sqlserver": {"double": QUOTED, "square": QUOTED},
+}
+DIALECTS["bigquery"] = DIALECTS["mysql"]
+
+
+class Lexer(object):
+    """
+    THE TOKEN REGEX FOR ONE DIALECT: regex.match() ONE TOKEN (OR GAP), THEN kinds[found.lastgroup] IS ITS KIND
+    """
+
+    def __init__(self, dialect="common"):
+        """
+        :param dialect: one of "common", "mysql", "bigquery", "sqlserver"
+        """
+        if dialect not in DIALECTS:
+            raise Exception(f"Expecting dialect to be one of {', '.join(DIALECTS.keys())}")
+        kinds = {
+            "regex": STRING,
+            "string": STRING,
+            "backtick": QUOTED,
+            "number": NUMBER,
+            "word": WORD,
+            "operator": OPERATOR,
+            "error": ERROR,
+            "other": OTHER,
+            **DIALECTS[dialect],
+        }
+        self.dialect = dialect
+        self.regex = re.compile(
+            "|".join(f"(?P<{name}>{pattern})" for name, pattern in _patterns.items() if name == "gap" or kinds[name]),
+            re.DOTALL,
+        )
+        self.kinds = kinds
+
+
+class SparseSkips(dict):
+    """
+    A SKIP MEMO FOR THE GRAMMAR'S (mo_parsing) Whitespace THAT ONLY HOLDS THE POSITIONS THE GRAMMAR VISITS,
+    INSTEAD OF ONE ENTRY PER CHARACTER OF THE SQL; FOR LARGE SQL THAT IS MOSTLY READ WITHOUT THE GRAMMAR
+    """
+
+    __slots__ = []
+
+    def __missing__(self, start):
+        return -1  # "NOT KNOWN", THE GRAMMAR WILL COMPUTE IT
+
+
+def sparse_skips(sql, whitespaces):
+    """
+    THE CALLER MUST HOLD THE mo_parsing LOCK UNTIL THE PARSE IS DONE, THEN release_skips()
+    """
+    for whitespace in whitespaces:
+        whitespace.content = sql
+        whitespace.skips = SparseSkips()
+
+
+def release_skips(whitespaces):
+    for whitespace in whitespaces:
+        whitespace.content = None
+        whitespace.skips = {}
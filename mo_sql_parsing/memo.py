@@ -0,0 +1,129 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# PACKRAT PARSING: REMEMBER THE MATCHES OF SOME Forward ELEMENTS, SO BACKTRACKING DOES NOT REPEAT THEM
+from collections import OrderedDict
+
+from mo_parsing import Forward, ParseException
+from mo_parsing.core import ParserElement
+
+from mo_sql_parsing.errors import match
+from mo_sql_parsing.tree import matching
+
+
+class MatchMemo(object):
+    """
+    BOUNDED MEMO OF GRAMMAR MATCHES (AND FAILURES), KEYED BY (element, location), FOR ONE PARSE AT A TIME
+    THE ENTRIES ARE RELEASED AT THE END OF EACH PARSE; THE COUNTERS ACCUMULATE OVER ALL PARSES
+    """
+
+    def __init__(self, size=100_000):
+        """
+        :param size: maximum number of entries kept during one parse; the oldest are dropped first
+        """
+        self.size = size
+        self.string = None  # THE SQL BEING PARSED
+        self.entries = None  # MAP FROM key TO ParseResults OR ParseException, ONLY DURING A PARSE
+        self.parses = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.peak = 0
+
+    def begin(self, string):
+        self.string = string
+        self.entries = OrderedDict()
+
+    def end(self):
+        self.string = None
+        self.entries = None
+        self.parses += 1
+
+    def get(self, key):
+        found = self.entries.get(key)
+        if found is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return found
+
+    def add(self, key, value):
+        entries = self.entries
+        if len(entries) >= self.size:
+            entries.popitem(last=False)
+            self.evictions += 1
+        entries[key] = value
+        if len(entries) > self.peak:
+            self.peak = len(entries)
+
+    def stats(self):
+        return {
+            "parses": self.parses,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "peak_entries": self.peak,
+        }
+
+
+class Memoized(Forward):
+    """
+    A Forward THAT LOOKS IN THE MatchMemo OF THE PARSE IN PROGRESS BEFORE MATCHING
+    """
+
+    __slots__ = []
+
+    def _parse(self, string, start, do_actions=True):
+        context = matching.context
+        meter = context.meter
+        if meter is not None:
+            meter.spend()
+        memo = context.memo
+        if isinstance(self.expr, Forward):
+            # A NAMED COPY, THE ORIGINAL WILL MEMOIZE
+            return ParserElement._parse(self, string, start, do_actions)
+        if memo is None or string is not memo.string:
+            return distinct_failures(ParserElement._parse(self, string, start, do_actions))
+
+        key = (self, start, do_actions)
+        found = memo.get(key)
+        if found is not None:
+            if isinstance(found, ParseException):
+                raise found.with_traceback(None)
+            return found
+        try:
+            result = distinct_failures(ParserElement._parse(self, string, start, do_actions))
+        except ParseException as cause:
+            memo.add(key, cause)
+            raise
+        memo.add(key, result)
+        return result
+
+
+def distinct_failures(result):
+    """
+    PARSE ACTIONS THAT RETURN A CHILD'S RESULT EXTEND ITS failures WITH THEMSELVES, DOUBLING THEM AT EVERY
+    NESTING LEVEL.  KEEP ONE OF EACH, SO DEEP EXPRESSIONS DO NOT CARRY EXPONENTIALLY LONG LISTS
+    """
+    failures = result.failures
+    if len(failures) > 1:
+        result.failures = list({id(f): f for f in failures}.values())
+    return result
+
+
+def memoized_parse(parser, string, context):
+    """
+    PARSE string, REMEMBERING MATCHES IN context.memo; THE CALLER MUST HOLD THE mo_parsing LOCK
+    """
+    memo = context.memo
+    memo.begin(string)
+    try:
+        return match(parser, string, context)
+    finally:
+        memo.end()
@@ -0,0 +1,204 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# OPERATOR NAMES, PRECEDENCE AND JOIN KEYWORDS, SHARED BY THE PARSER AND THE FORMATTER
+
+binary_ops = {
+    "::": "cast",
+    "COLLATE": "collate",
+    ":": "get",
+    "||": "concat",
+    "*": "mul",
+    "/": "div",
+    "%": "mod",
+    "+": "add",
+    "-": "sub",
+    "&": "binary_and",
+    "|": "binary_or",
+    "<": "lt",
+    "<=": "lte",
+    ">": "gt",
+    ">=": "gte",
+    "=": "eq",
+    "==": "eq",
+    "is distinct from": "eq!",  # https://sparkbyexamples.com/apache-hive/hive-relational-arithmetic-logical-operators/
+    "is_distinct_from": "eq!",
+    "is not distinct from": "ne!",
+    "is_not_distinct_from": "ne!",
+    "<=>": "eq!",  # https://sparkbyexamples.com/apache-hive/hive-relational-arithmetic-logical-operators/
+    "!=": "neq",
+    "<>": "neq",
+    "not in": "nin",
+    "in": "in",
+    "is_not": "neq",
+    "is": "eq",
+    "similar_to": "similar_to",
+    "like": "like",
+    "rlike": "rlike",
+    "ilike": "ilike",
+    "not like": "not_like",
+    "not_like": "not_like",
+    "not rlike": "not_rlike",
+    "not_rlike": "not_rlike",
+    "not ilike": "not_ilike",
+    "not_ilike": "not_ilike",
+    "not_simlilar_to": "not_similar_to",
+    "or": "or",
+    "and": "and",
+    "->": "lambda",
+    "union": "union",
+    "union_all": "union_all",
+    "union all": "union_all",
+    "except": "except",
+    "minus": "minus",
+    "intersect": "intersect",
+}
+
+is_set_op = ("union", "union_all", "except", "minus", "intersect")
+
+join_keywords = {
+    "join",
+    "full join",
+    "cross join",
+    "inner join",
+    "left join",
+    "right join",
+    "full outer join",
+    "right outer join",
+    "left outer join",
+    "cross apply",
+    "outer apply",
+}
+
+precedence = {
+    # https://www.sqlite.org/lang_expr.html
+    "literal": -1,
+    "get": 0,
+    "interval": 0,
+    "cast": 0,
+    "try_cast": 0,
+    "collate": 0,
+    "concat": 1,
+    "mul": 2,
+    "div": 1.5,
+    "mod": 2,
+    "neg": 3,
+    "add": 3,
+    "sub": 2.5,
+    "binary_not": 4,
+    "binary_and": 4,
+    "binary_or": 4,
+    "gte": 5,
+    "lte": 5,
+    "lt": 5,
+    "gt": 6,
+    "eq": 7,
+    "neq": 7,
+    "missing": 7,
+    "exists": 7,
+    "at_time_zone": 8,
+    "between": 8,
+    "not_between": 8,
+    "not": 8,
+    "in": 8,
+    "nin": 8,
+    "is": 8,
+    "like": 8,
+    "not_like": 8,
+    "rlike": 8,
+    "not_rlike": 8,
+    "ilike": 8,
+    "not_ilike": 8,
+    "similar_to": 8,
+    "not_similar_to": 8,
+    "and": 10,
+    "or": 11,
+    "lambda": 12,
+    "join": 18,
+    "list": 18,
+    "case": 19,
+    "select": 30,
+    "from": 30,
+    "window": 35,
+    "union": 40,
+    "union_all": 40,
+    "except": 40,
+    "minus": 40,
+    "intersect": 40,
+    "order": 50,
+}
+
+# SINGLE WORDS THE GRAMMAR WILL NOT ACCEPT AS AN IDENTIFIER (SAME AS keywords.RESERVED)
+reserved_keywords = {
+    "and",
+    "as",
+    "asc",
+    "between",
+    "by",
+    "case",
+    "collate",
+    "constraint",
+    "create",
+    "cross",
+    "desc",
+    "distinct",
+    "else",
+    "end",
+    "except",
+    "false",
+    "fetch",
+    "for",
+    "foreign",
+    "from",
+    "full",
+    "group",
+    "having",
+    "in",
+    "inner",
+    "intersect",
+    "is",
+    "join",
+    "lateral",
+    "left",
+    "like",
+    "limit",
+    "minus",
+    "natural",
+    "nocase",
+    "not",
+    "null",
+    "offset",
+    "on",
+    "or",
+    "order",
+    "outer",
+    "over",
+    "partition",
+    "pivot",
+    "primary",
+    "qualify",
+    "references",
+    "right",
+    "rlike",
+    "select",
+    "set",
+    "tablesample",
+    "then",
+    "true",
+    "union",
+    "unique",
+    "unnest",
+    "unpivot",
+    "using",
+    "when",
+    "where",
+    "window",
+    "with",
+    "within",
+}
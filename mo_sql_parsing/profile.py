@@ -0,0 +1,143 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# TIME SPENT IN EACH NAMED GRAMMAR RULE.  LIKE mo_parsing.debug.Debugger, THE PROFILE REPLACES
+# ParserElement._parse WHILE ENABLED, AND PUTS IT BACK WHEN DISABLED, SO IT COSTS NOTHING OTHERWISE
+from time import perf_counter
+
+COLUMNS = ("rule", "attempts", "matches", "failures", "total_ms", "self_ms")
+
+
+class RuleProfile(object):
+    """
+    ATTEMPTS, MATCHES, FAILURES AND TIME OF EACH NAMED RULE (SEE set_parser_names() IN sql_parser), OVER EVERY
+    PARSE WHILE ENABLED.  UNNAMED ELEMENTS ARE COUNTED AS PART OF THE NAMED RULE THAT CALLED THEM
+    """
+
+    def __init__(self):
+        self.rules = {}  # MAP FROM RULE NAME TO [attempts, matches, failures, total, self]
+        self.stacks = {}  # MAP FROM TUPLE OF RULE NAMES (OUTERMOST FIRST) TO SELF TIME
+        self.active = {}  # MAP FROM RULE NAME TO NUMBER OF ITS ATTEMPTS IN PROGRESS
+        self.frames = [((), [0.0])]  # (PATH, [TIME IN CHILD RULES]) OF EACH ATTEMPT IN PROGRESS
+        self.previous = None
+
+    def start(self):
+        from mo_parsing import core
+        from mo_parsing.core import ParserElement
+
+        with core.locker:
+            # NO MATCH IS IN PROGRESS, SO EVERY ATTEMPT RECORDED ALSO ENDS HERE
+            self.previous = ParserElement._parse
+            ParserElement._parse = _profiled(self, self.previous)
+
+    def stop(self):
+        from mo_parsing import core
+        from mo_parsing.core import ParserElement
+
+        with core.locker:
+            ParserElement._parse = self.previous
+            self.previous = None
+
+    def stats(self):
+        """
+        :return: list OF dict, ONE PER RULE, WITH THE COLUMNS, MOST total_ms FIRST.  total_ms IS THE TIME FROM
+                 THE START TO THE END OF THE OUTERMOST ATTEMPTS (A RULE INSIDE ITSELF IS NOT COUNTED TWICE);
+                 self_ms EXCLUDES THE TIME IN OTHER NAMED RULES
+        """
+        output = [
+            {
+                "rule": name,
+                "attempts": attempts,
+                "matches": matches,
+                "failures": failures,
+                "total_ms": total * 1000,
+                "self_ms": own * 1000,
+            }
+            for name, (attempts, matches, failures, total, own) in self.rules.items()
+        ]
+        output.sort(key=lambda r: (-r["total_ms"], r["rule"]))
+        return output
+
+    def report(self, sort="total_ms", limit=None):
+        """
+        :param sort: column to sort by, largest first
+        :param limit: most rules to show
+        :return: TEXT TABLE, ONE LINE PER RULE
+        """
+        if sort not in COLUMNS:
+            raise Exception(f"Expecting sort to be one of {', '.join(COLUMNS)}")
+        rows = self.stats()
+        if sort == "rule":
+            rows.sort(key=lambda r: r["rule"])
+        else:
+            rows.sort(key=lambda r: -r[sort])
+        rows = rows[:limit]
+        width = max([len("rule")] + [len(r["rule"]) for r in rows])
+        lines = [f"{'rule':{width}s} {'attempts':>10s} {'matches':>10s} {'failures':>10s} {'total_ms':>12s} {'self_ms':>12s}"]
+        for r in rows:
+            lines.append(
+                f"{r['rule']:{width}s} {r['attempts']:10d} {r['matches']:10d} {r['failures']:10d}"
+                f" {r['total_ms']:12.3f} {r['self_ms']:12.3f}"
+            )
+        return "\n".join(lines)
+
+    def folded(self):
+        """
+        :return: FOLDED STACKS ("outer;inner;rule microseconds" PER LINE), FOR flamegraph.pl AND SIMILAR TOOLS
+        """
+        return "\n".join(
+            f"{';'.join(path)} {round(seconds * 1_000_000)}"
+            for path, seconds in sorted(self.stacks.items())
+            if round(seconds * 1_000_000)
+        )
+
+    def write_folded(self, filename):
+        with open(filename, "w", encoding="utf8") as file:
+            file.write(self.folded())
+            file.write("\n")
+
+
+def _profiled(profile, previous):
+    rules = profile.rules
+    stacks = profile.stacks
+    active = profile.active
+    frames = profile.frames
+
+    def profiled_parse(self, string, start, do_actions=True):
+        name = self.parser_name
+        if not name:
+            return previous(self, string, start, do_actions)
+
+        path = frames[-1][0] + (name,)
+        children = [0.0]
+        frames.append((path, children))
+        active[name] = active.get(name, 0) + 1
+        outcome = 2  # ANY EXCEPTION IS A FAILURE
+        begin = perf_counter()
+        try:
+            result = previous(self, string, start, do_actions)
+            outcome = 1
+            return result
+        finally:
+            elapsed = perf_counter() - begin
+            frames.pop()
+            frames[-1][1][0] += elapsed
+            own = elapsed - children[0]
+            stacks[path] = stacks.get(path, 0.0) + own
+            entry = rules.get(name)
+            if entry is None:
+                entry = rules[name] = [0, 0, 0, 0.0, 0.0]
+            entry[0] += 1
+            entry[outcome] += 1
+            if active[name] == 1:
+                entry[3] += elapsed
+            active[name] -= 1
+            entry[4] += own
+
+    return profiled_parse
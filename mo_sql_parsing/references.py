@@ -0,0 +1,178 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# THE TABLES AND COLUMNS A STATEMENT REFERS TO, READ FROM THE MATCHED TOKENS, WITHOUT scrub()ING THEM INTO A TREE
+from mo_parsing import ParseResults
+
+from mo_sql_parsing.tree import Call
+
+# WHAT A TOKEN IS, GIVEN WHERE IT WAS FOUND
+_OTHER = 0  # KEYWORDS, OPTIONS, ALIASES: NOT A REFERENCE
+_EXPR = 1  # IN AN EXPRESSION: A str IS A COLUMN
+_TABLE = 2  # A TABLE SOURCE: A str IS A TABLE
+_TARGET = 3  # A STATEMENT THAT WRITES TO A TABLE: INSERT, UPDATE, DELETE, MERGE, COPY
+
+_targets = {"insert", "update", "delete", "merge", "copy"}
+_target_actions = {"to_insert_call", "to_update_call"}
+# PARTS OF AN EXPRESSION WITH WORDS THAT ARE NOT COLUMNS (DATE PARTS, SORT ORDER)
+_not_columns = {"time_interval_type", "timestamp", "asc", "desc", "ignore", "respect", "first", "last"}
+_expressions = {"expression", "select_column"}
+_casts = {"cast", "safe_cast", "try_cast"}
+
+# WHAT A GRAMMAR ELEMENT MATCHES
+_PLAIN, _ALIAS, _TABLE_SOURCE, _STATEMENT, _FILE, _EXPRESSION, _INTO, _NOT_COLUMN = range(8)
+_kinds = {}  # MAP FROM ParserElement TO WHAT IT MATCHES
+
+
+def _kind(element):
+    # PARSE ACTIONS ARE WRAPPED BY mo_parsing, BUT KEEP THE __name__ OF THE FUNCTION (to_table, to_alias, ...)
+    actions = {a.__name__ for a in element.parse_action}
+    name = element.parser_name
+    if "to_alias" in actions:
+        kind = _ALIAS
+    elif "to_table" in actions:
+        kind = _TABLE_SOURCE
+    elif name in _targets or _target_actions & actions:
+        kind = _STATEMENT
+    elif name == "file_source":
+        kind = _FILE
+    elif name in _expressions:
+        kind = _EXPRESSION
+    elif element.token_name in ("into", "from"):
+        kind = _INTO
+    elif name in _not_columns:
+        kind = _NOT_COLUMN
+    else:
+        kind = _PLAIN
+    _kinds[element] = kind
+    return kind
+
+
+def _ctes(clause):
+    """
+    :param clause: THE MATCH OF A WITH CLAUSE
+    :return: list OF (name, tokens OF THE DEFINITION), ONE PER CTE, IN ORDER
+    """
+    output = []
+    todo = [clause]
+    while todo:
+        node = todo.pop()
+        if isinstance(node, ParseResults):
+            tokens = node.tokens
+            for t in tokens:
+                if isinstance(t, ParseResults) and (_kinds.get(t.type) or _kind(t.type)) == _ALIAS:
+                    name = t.tokens[0]
+                    output.append((name if isinstance(name, str) else next(iter(name)), [v for v in tokens if v is not t]))
+                    break
+            else:
+                todo.extend(reversed(tokens))
+        elif isinstance(node, (list, tuple)):
+            todo.extend(reversed(node))
+    return output
+
+
+def references(result):
+    """
+    :param result: ParseResults FROM THE GRAMMAR MATCH
+    :return: (tables, columns) BOTH set OF str; tables DOES NOT INCLUDE THE NAMES OF CTEs WHERE THEY ARE VISIBLE
+    """
+    tables, columns = set(), set()
+    kinds = _kinds
+    # scope IS THE frozenset OF CTE NAMES VISIBLE AT node
+    todo = [(result, _OTHER, frozenset())]
+    while todo:
+        node, mode, scope = todo.pop()
+        if isinstance(node, ParseResults):
+            element = node.type
+            kind = kinds.get(element)
+            if kind is None:
+                kind = _kind(element)
+            if kind == _PLAIN:
+                pass
+            elif kind == _EXPRESSION:
+                if mode == _TARGET:
+                    # COPY OPTIONS
+                    continue
+                if mode != _TABLE:
+                    mode = _EXPR
+            elif kind == _TABLE_SOURCE:
+                mode = _TABLE
+            elif kind == _ALIAS:
+                continue
+            elif kind == _STATEMENT:
+                mode = _TARGET
+            elif kind == _INTO:
+                if mode == _TARGET:
+                    mode = _TABLE
+            elif kind == _NOT_COLUMN:
+                mode = _OTHER
+            else:
+                # A STAGE OR A URL, NOT A TABLE
+                continue
+            todo.extend((t, mode, scope) for t in node.tokens)
+        elif isinstance(node, Call):
+            if mode == _TARGET:
+                if node.op == "merge":
+                    kwargs = node.kwargs
+                    todo.extend((v, _TABLE if k in ("target", "source") else _OTHER, scope) for k, v in kwargs.items())
+                    todo.append((node.args, _OTHER, scope))
+                    continue
+                # INSERT, DELETE: THE TABLE IS THE FIRST PARAMETER
+                todo.append((node.args, _TABLE, scope))
+                todo.append((node.kwargs, _OTHER, scope))
+                continue
+            if mode == _TABLE:
+                # TABLE-VALUED FUNCTIONS, UNNEST, LATERAL
+                mode = _EXPR
+            op = node.op
+            if op in _casts or op == "interval":
+                # THE VALUE, NOT THE TYPE OR UNIT
+                todo.append((node.args[:1], mode, scope))
+                continue
+            elif op == "extract":
+                todo.append((node.args[1:], mode, scope))
+                continue
+            todo.append((node.args, mode, scope))
+            todo.append((node.kwargs, mode, scope))
+        elif isinstance(node, dict):
+            for key in ("with", "with_recursive"):
+                clause = node.get(key)
+                if clause is None:
+                    continue
+                ctes = _ctes(clause)
+                names = [name for name, _ in ctes]
+                # EACH CTE SEES THE ONES BEFORE IT (ALL OF THEM, AND ITSELF, IF RECURSIVE); THE STATEMENT SEES ALL
+                visible = scope.union(names)
+                for i, (name, definition) in enumerate(ctes):
+                    todo.append((definition, _OTHER, visible if key == "with_recursive" else scope.union(names[:i])))
+                scope = visible
+            for key, value in node.items():
+                if key == "literal" or key == "name" or key == "hex" or key == "with" or key == "with_recursive":
+                    continue
+                elif key == "interval" and isinstance(value, list):
+                    # WINDOW FRAME BOUNDS
+                    todo.append((value[:1], _EXPR, scope))
+                elif mode == _OTHER and key in ("select", "top", "for"):
+                    # ROWS OF VALUES, TOP n, PIVOT ... FOR column
+                    todo.append((value, _EXPR, scope))
+                elif mode == _TARGET:
+                    todo.append((value, _TABLE if key == "update" else _OTHER, scope))
+                elif mode == _TABLE:
+                    todo.append((value, _TABLE if key == "value" else _OTHER, scope))
+                else:
+                    todo.append((value, mode, scope))
+        elif isinstance(node, (list, tuple)):
+            todo.extend((v, mode, scope) for v in node)
+        elif isinstance(node, str):
+            if mode == _EXPR:
+                if not node.endswith("*"):
+                    columns.add(node)
+            elif mode == _TABLE and node not in scope:
+                tables.add(node)
+    return tables, columns
@@ -0,0 +1,216 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# THE ROWS OF VALUES (...), (...) WHERE EVERY CELL IS A LITERAL, WITHOUT THE expression GRAMMAR
+import re
+
+from mo_parsing.enhancement import ParseEnhancement
+from mo_parsing.exceptions import ParseException
+from mo_parsing.results import ParseResults
+from mo_parsing.utils import listwrap
+
+from mo_sql_parsing.columns import ColumnTable
+from mo_sql_parsing.tree import SQL_NULL, single_literal, parse_int, matching
+from mo_sql_parsing.utils import double_literal, get_literal
+
+# WHITESPACE AND COMMENTS, WRITTEN SO THERE IS ONLY ONE WAY TO MATCH THEM (NO BACKTRACKING WHEN A ROW FAILS)
+_gap = r"[ \t\r\n]*(?:(?:--[^\n]*(?![^\n])|#[^\n]*(?![^\n])|/\*(?:[^*]|\*(?!/))*\*/)[ \t\r\n]*)*"
+# SAME NUMBERS AS real_num AND int_num; A SIGN IS THE neg OR pos OPERATOR IN THE GRAMMAR
+_number = r"(?:([+-])G)?(?:((?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?)|(\d+(?:[eE]\+?\d+)?))"
+_string_pattern = r"('[^']*(?:''[^']*)*')"
+_word = r"((?i:null|true|false))"
+_double = r'("[^"]*(?:""[^"]*)*")'
+
+
+BLOCK_SIZE = 1000  # ROWS SCANNED AT ONCE, SO THE CELLS OF ONLY ONE BLOCK ARE IN MEMORY
+
+
+def _scanner(double_quoted_strings):
+    """
+    :return: (block, separator, cells) REGEXES
+        block - MATCHES UP TO BLOCK_SIZE LITERAL ROWS
+        separator - MATCHES THE COMMA BETWEEN TWO ROWS
+        cells - FINDS EACH CELL OF THE block: (open, sign, real, int, string, word, double, close)
+    """
+    # A GROUP THAT NEVER MATCHES, SO THE cells TUPLES ARE THE SAME
+    double = _double if double_quoted_strings else "(?!)()"
+    cell = "|".join([_number.replace("G", _gap), _string_pattern, _word, double])
+    plain = re.sub(r"\((?![?])", "(?:", cell)  # NO CAPTURE, FOR block
+    row = rf"\({_gap}(?:{plain}){_gap}(?:,{_gap}(?:{plain}){_gap})*\)"
+    return (
+        re.compile(rf"{row}(?:{_gap},{_gap}{row}){{0,{BLOCK_SIZE - 1}}}"),
+        re.compile(rf"{_gap},{_gap}"),
+        re.compile(rf"([(,]){_gap}(?:{cell}){_gap}(?:(\))(?:{_gap},{_gap})?)?"),
+    )
+
+
+ANSI_SCANNER = _scanner(False)
+MYSQL_SCANNER = _scanner(True)  # DOUBLE QUOTES ARE STRINGS
+
+_words = {"null": SQL_NULL, "true": True, "false": False}
+
+
+class LiteralRows(ParseEnhancement):
+    """
+    MATCH THE ROWS AFTER VALUES DIRECTLY WHERE EVERY CELL IS A NUMBER, STRING, NULL, TRUE OR FALSE, AND THE OTHER
+    ROWS WITH row, AND RETURN WHAT expr (delimited_list(row) / to_values) WOULD.  IF A ROW FAILS, expr IS USED, SO
+    FAILURES ARE THE SAME
+    """
+
+    __slots__ = ["scanner", "row"]
+
+    def __init__(self, expr, scanner=ANSI_SCANNER, row=None):
+        """
+        :param expr: THE FULL GRAMMAR FOR THE ROWS
+        :param scanner: ANSI_SCANNER, OR MYSQL_SCANNER WHEN DOUBLE QUOTES ARE STRINGS
+        :param row: THE GRAMMAR FOR ONE ROW, FOR THE ROWS THAT ARE NOT ALL LITERALS (None TO USE expr FOR ALL ROWS)
+        """
+        ParseEnhancement.__init__(self, expr)
+        self.scanner = scanner
+        self.row = row
+
+    def copy(self):
+        output = ParseEnhancement.copy(self)
+        output.scanner = self.scanner
+        output.row = self.row
+        return output
+
+    def parse_impl(self, string, start, do_actions=True):
+        try:
+            found = scan_rows(self.scanner, string, start, self.row, do_actions)
+        except ParseException:
+            found = None
+        if found is None:
+            result = self.expr._parse(string, start, do_actions)
+            return ParseResults(self, result.start, result.end, [result], result.failures)
+        end, tokens = found
+        return ParseResults(self, start, end, tokens, [])
+
+
+def scan_rows(scanner, string, start, row=None, do_actions=True):
+    """
+    :param row: GRAMMAR FOR ONE ROW, TO MATCH A ROW THAT IS NOT ALL LITERALS; None TO GIVE UP ON SUCH A ROW
+    :return: (end, tokens) FOR THE ROWS AT start, OR None IF A ROW IS NOT ALL LITERALS AND row IS None
+    """
+    block, separator, cells = scanner
+    table = ColumnTable() if matching.context.columnar else None
+    rows = []  # LIST OF (values, literals) FOR EACH ROW, OR (None, token) FOR A ROW MATCHED BY row
+    all_literal = True
+    end = start
+    while True:
+        found = block.match(string, end)
+        if found is None:
+            if row is None or table is not None:
+                # NOT A ROW, OR NOT ALL LITERALS
+                return None
+            # ONLY THIS ROW NEEDS THE GRAMMAR; A FAILURE IS RAISED
+            result = row._parse(string, end, do_actions)
+            if do_actions:
+                rows.extend((None, token) for token in result.tokens)
+            end = result.end
+            more = separator.match(string, end)
+            if more is None:
+                return end, to_literal_values(rows, all_literal) if do_actions else []
+            end = more.end()
+            continue
+        for first, sign, real, integer, text, word, double, close in cells.findall(string, end, found.end()):
+            if first == "(":
+                values = []
+                literals = []
+            if text:
+                value = _string(text)
+                literal = value["literal"]
+            elif real:
+                literal = value = float(real)
+            elif integer:
+                literal = value = parse_int([integer])
+            elif word:
+                literal = value = _words[word.lower()]
+                if value is SQL_NULL:
+                    all_literal = False
+            else:
+                value = double_literal([double])
+                literal = value["literal"]
+            if sign:
+                # THE GRAMMAR APPLIES THE SIGN AS AN OPERATOR, SO THE CELL IS NOT A LITERAL
+                all_literal = False
+                if sign == "-":
+                    value = -value
+            values.append(value)
+            literals.append(literal)
+            if close:
+                rows.append((values, literals))
+        end = found.end()
+        more = separator.match(string, end)
+        if more is None:
+            if table is None or (not table and len(rows) == 1):
+                return end, to_literal_values(rows, all_literal)
+            if not table.extend(_plain(rows)):
+                return None
+            return end, [{"from": {"literal": table}}]
+        if table is not None:
+            # ONLY ONE BLOCK OF ROWS IS KEPT AS PYTHON OBJECTS
+            if not table.extend(_plain(rows)):
+                # RAGGED ROWS, LEFT TO THE GRAMMAR
+                return None
+            rows = []
+        end = more.end()
+
+
+def _string(text):
+    """
+    SAME AS single_literal(), WITHOUT THE PYTHON COMPILER WHEN THERE IS NOTHING FOR IT TO DO
+    """
+    inner = text[1:-1]
+    if "\\" in inner or "\r" in inner or "\x00" in inner:
+        return single_literal([text])
+    return {"literal": inner.replace("''", "'")}
+
+
+def to_literal_values(rows, all_literal):
+    """
+    SAME AS to_row() AND to_values()
+    :param rows: LIST OF (values, literals) FOR EACH ROW, OR (None, token) FOR A ROW MATCHED BY THE GRAMMAR
+    :param all_literal: False IF SOME CELL IS NOT A LITERAL TO to_values() (NULL, OR A SIGNED NUMBER)
+    :return: THE TOKENS
+    """
+    if len(rows) > 1:
+        if all_literal:
+            table = []
+            for values, literals in rows:
+                if values is None:
+                    # AS to_values() SEES IT
+                    literals = [get_literal(s["value"]) for s in listwrap(literals["select"])]
+                    if not all(literals):
+                        break
+                elif len(literals) < 2 or not all(literals):
+                    # to_values() DOES NOT SEE A ONE-COLUMN ROW AS LITERAL
+                    break
+                table.append(literals)
+            else:
+                return [{"from": {"literal": table}}]
+        return [{"union_all": [token if values is None else _row(values) for values, token in rows]}]
+    values, token = rows[0]
+    return [token if values is None else _row(values)]
+
+
+def _plain(rows):
+    """
+    :return: THE CELLS OF rows AS PYTHON VALUES (None FOR NULL), FOR A ColumnTable
+    """
+    return [
+        [None if v is SQL_NULL else l if v.__class__ is dict else v for v, l in zip(values, literals)]
+        for values, literals in rows
+    ]
+
+
+def _row(values):
+    if len(values) > 1:
+        return {"select": [{"value": v} for v in values]}
+    return {"select": {"value": values[0]}}
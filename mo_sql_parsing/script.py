@@ -0,0 +1,208 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# SPLIT A SCRIPT INTO STATEMENTS WHILE READING IT, SO ONLY THE CURRENT STATEMENT IS IN MEMORY
+import mmap
+import os
+import re
+
+from mo_sql_parsing import SQL_NULL
+from mo_sql_parsing.bulk import DIALECTS
+from mo_sql_parsing.lexer import DIALECTS as QUOTING, _patterns
+from mo_sql_parsing.tree import simple_op
+
+CHUNK_SIZE = 1 << 16  # CHARACTERS READ FROM A FILE AT ONCE
+
+_gap = re.compile(_patterns["gap"], re.DOTALL)
+_byte_gap = re.compile(_patterns["gap"].encode("ascii"), re.DOTALL)
+_splitters = {}
+
+
+class ScriptError(Exception):
+    """
+    A STATEMENT OF THE SCRIPT THAT DID NOT PARSE
+    """
+
+    def __init__(self, offset, sql, cause):
+        """
+        :param offset: where the error is in the script (bytes when the script is a path, otherwise characters)
+        :param sql: the statement
+        :param cause: the exception raised by the parser
+        """
+        Exception.__init__(self, str(cause))
+        self.offset = offset
+        self.sql = sql
+        self.cause = cause
+
+
+def _splitter(dialect, kind=str):
+    """
+    :param kind: str, OR bytes TO SEARCH ENCODED (OR MEMORY-MAPPED) SQL
+    :return: REGEX FINDING THE NEXT ; OR THE NEXT THING THAT MAY HIDE ONE (COMMENT, STRING, QUOTED IDENTIFIER)
+    """
+    output = _splitters.get((dialect, kind))
+    if output:
+        return output
+    skips = [r"--[^\n]*\n", r"#[^\n]*\n", r"/\*.*?\*/", _patterns["string"], _patterns["double"], _patterns["backtick"]]
+    opens = ["--", "#", r"/\*", "['\"`]"]
+    if QUOTING[dialect]["square"]:
+        skips.append(_patterns["square"])
+        opens.append(r"\[")
+    pattern = f"(?P<end>;)|(?P<skip>{'|'.join(skips)})|(?P<open>{'|'.join(opens)})"
+    if kind is bytes:
+        # ALL DELIMITERS ARE ASCII, SO THEY NEVER APPEAR INSIDE A MULTI-BYTE UTF-8 CHARACTER
+        pattern = pattern.encode("ascii")
+    output = _splitters[(dialect, kind)] = re.compile(pattern, re.DOTALL)
+    return output
+
+
+def _chunks(source):
+    if isinstance(source, str):
+        yield source
+    elif hasattr(source, "read"):
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source
+
+
+def split_statements(source, dialect="common", start=0, encoding="utf8"):
+    """
+    SPLIT SQL ON THE SEMICOLONS BETWEEN STATEMENTS; NOT THE ONES IN STRINGS, QUOTED IDENTIFIERS OR COMMENTS
+    EMPTY STATEMENTS (ONLY WHITESPACE AND COMMENTS) ARE SKIPPED
+    :param source: a string, a text file, an iterable of strings (like the lines of a file), or a path
+    :param dialect: one of "common", "mysql", "bigquery", "sqlserver"
+    :param start: for a path, the byte offset to start from (a statement offset from an earlier run)
+    :param encoding: for a path, the encoding of the file
+    :return: generator of `(offset, sql)`, WHERE offset IS THE POSITION OF THE STATEMENT IN THE SCRIPT,
+             IN BYTES FOR A PATH, OTHERWISE IN CHARACTERS
+    """
+    if dialect not in DIALECTS:
+        raise Exception(f"Expecting dialect to be one of {', '.join(DIALECTS.keys())}")
+    if isinstance(source, os.PathLike):
+        yield from _split_file(source, dialect, start, encoding)
+        return
+    if start:
+        raise Exception("Expecting start only for a path")
+    search = _splitter(dialect).search
+    chunks = _chunks(source)
+    buffer = ""
+    offset = 0  # POSITION OF buffer[0] IN THE SCRIPT
+    start = 0  # START OF THE CURRENT STATEMENT IN buffer
+    scan = 0  # EVERYTHING BEFORE THIS, IN THE CURRENT STATEMENT, IS KNOWN TO HAVE NO ;
+    more = True
+    while True:
+        found = search(buffer, scan)
+        if more and (found is None or found.lastgroup == "open" or found.end() == len(buffer)):
+            # NEED MORE TO BE SURE (A CLOSING QUOTE MAY BE THE FIRST OF A DOUBLED PAIR)
+            # READ AT LEAST AS MUCH AS IS KEPT, SO A LONG STATEMENT IS NOT COPIED ONCE PER LINE
+            pieces = [buffer[start:]]
+            size = 0
+            while size == 0 or size < len(pieces[0]):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    more = False
+                    break
+                pieces.append(chunk)
+                size += len(chunk)
+            if not size:
+                continue
+            # SEARCH AGAIN FROM WHAT WAS FOUND, OR FROM THE LAST CHARACTER (IT MAY START A -- OR /*)
+            retry = found.start() if found else max(start, len(buffer) - 1)
+            buffer = "".join(pieces)
+            offset += start
+            scan = retry - start
+            start = 0
+            continue
+        if found is None or found.lastgroup == "open":
+            # END OF SCRIPT; AN UNTERMINATED QUOTE OR COMMENT IS LEFT FOR THE PARSER TO REPORT
+            statement = _statement(buffer, start, len(buffer), offset)
+            if statement:
+                yield statement
+            return
+        if found.lastgroup == "skip":
+            scan = found.end()
+            continue
+        statement = _statement(buffer, start, found.start(), offset)
+        if statement:
+            yield statement
+        start = scan = found.end()
+
+
+def _split_file(path, dialect, start, encoding):
+    """
+    MEMORY-MAP THE FILE, SO THE OPERATING SYSTEM PAGES IT IN (AND OUT) AS IT IS SEARCHED;
+    ONLY EACH STATEMENT IS DECODED
+    """
+    with open(path, "rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            search = _splitter(dialect, bytes).search
+            end = len(data)
+            scan = start
+            while True:
+                found = search(data, scan)
+                if found is None or found.lastgroup == "open":
+                    statement = _mapped_statement(data, start, end, encoding)
+                    if statement:
+                        yield statement
+                    return
+                if found.lastgroup == "skip":
+                    scan = found.end()
+                    continue
+                statement = _mapped_statement(data, start, found.start(), encoding)
+                if statement:
+                    yield statement
+                start = scan = found.end()
+
+
+def _mapped_statement(data, start, end, encoding):
+    gap = _byte_gap.match(data, start, end)
+    if gap:
+        start = gap.end()
+    if start == end:
+        return None
+    return start, data[start:end].decode(encoding)
+
+
+def _statement(buffer, start, end, offset):
+    gap = _gap.match(buffer, start, end)
+    if gap:
+        start = gap.end()
+    if start == end:
+        return None
+    return offset + start, buffer[start:end]
+
+
+def parse_script(source, dialect="common", null=SQL_NULL, calls=simple_op, start=0, encoding="utf8"):
+    """
+    PARSE EACH STATEMENT OF A SCRIPT, ONLY WHEN THE CALLER ASKS FOR IT
+    FAILURES ARE YIELDED AS ScriptError, NOT RAISED
+    :param source: a string, a text file, an iterable of strings (like the lines of a file), or a path
+    :param dialect: one of "common", "mysql", "bigquery", "sqlserver"
+    :param start: for a path, the byte offset to start from (a statement offset from an earlier run)
+    :param encoding: for a path, the encoding of the file
+    :return: generator of `(offset, parse_tree)` OR `(offset, ScriptError)`; OFFSETS ARE IN BYTES FOR A PATH
+    """
+    import mo_sql_parsing
+
+    parse = getattr(mo_sql_parsing, DIALECTS[dialect])
+    in_bytes = isinstance(source, os.PathLike)
+    for offset, sql in split_statements(source, dialect, start, encoding):
+        try:
+            yield offset, parse(sql, null=null, calls=calls)
+        except Exception as cause:
+            loc = getattr(cause, "loc", 0)
+            if in_bytes:
+                loc = len(sql[:loc].encode(encoding))
+            yield offset, ScriptError(offset + loc, sql, cause)
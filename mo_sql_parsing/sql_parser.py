@@ -10,10 +10,14 @@ from mo_parsing import whitespaces, debug, Null
 from mo_parsing.whitespaces import NO_WHITESPACE, Whitespace
 
 from mo_sql_parsing import utils
+from mo_sql_parsing.dispatch import KeywordDispatch
 from mo_sql_parsing.keywords import *
+from mo_sql_parsing.memo import Memoized
+from mo_sql_parsing.rows import LiteralRows, ANSI_SCANNER, MYSQL_SCANNER
 from mo_sql_parsing.types import get_column_type, time_functions, _sizes
 from mo_sql_parsing.utils import *
 from mo_sql_parsing.windows import window
+from mo_sql_parsing.infix import PRECEDENCE, infix_notation  # AFTER THE * IMPORTS, TO REPLACE mo_parsing's
 
 
 def no_dashes(tokens, start, string):
@@ -35,25 +39,32 @@ with whitespaces.NO_WHITESPACE:
 simple_ident = Word(FIRST_IDENT_CHAR, IDENT_CHAR).set_parser_name("identifier")
 
 
-def common_parser():
+def common_parser(engine=PRECEDENCE, fast_values=True):
     atomic_ident = ansi_ident | mysql_backtick_ident | simple_ident
-    return parser(regex_string | ansi_string, atomic_ident)
+    scanner = ANSI_SCANNER if fast_values else None
+    return parser(regex_string | ansi_string, atomic_ident, engine=engine, values_scanner=scanner)
 
 
-def mysql_parser():
+def mysql_parser(engine=PRECEDENCE, fast_values=True):
     utils.emit_warning_for_double_quotes = False
 
     mysql_string = regex_string | ansi_string | mysql_doublequote_string
     atomic_ident = mysql_backtick_ident | sqlserver_ident | ident_w_dash
-    return parser(mysql_string, atomic_ident)
+    scanner = MYSQL_SCANNER if fast_values else None
+    return parser(mysql_string, atomic_ident, engine=engine, values_scanner=scanner)
 
 
-def sqlserver_parser():
+def sqlserver_parser(engine=PRECEDENCE, fast_values=True):
     atomic_ident = ansi_ident | mysql_backtick_ident | sqlserver_ident | simple_ident
-    return parser(regex_string | ansi_string, atomic_ident, sqlserver=True)
+    scanner = ANSI_SCANNER if fast_values else None
+    return parser(regex_string | ansi_string, atomic_ident, sqlserver=True, engine=engine, values_scanner=scanner)
 
 
-def parser(literal_string, simple_ident, sqlserver=False):
+def parser(literal_string, simple_ident, sqlserver=False, engine=PRECEDENCE, values_scanner=None):
+    """
+    :param engine: HOW OPERATOR EXPRESSIONS ARE BUILT, SEE mo_sql_parsing.infix
+    :param values_scanner: SCANNER FOR VALUES ROWS OF ONLY LITERALS (SEE mo_sql_parsing.rows), None FOR THE FULL GRAMMAR
+    """
     debugger = debug.DEBUGGER or Null
     debugger.__exit__(None, None, None)
 
@@ -71,7 +82,7 @@ def parser(literal_string, simple_ident, sqlserver=False):
         function_name = ~(UNION | FROM | WHERE) + ident
 
         # EXPRESSIONS
-        expression = Forward()
+        expression = Memoized()
         (column_type, column_definition, column_def_references, column_option,) = get_column_type(
             expression, identifier, literal_string
         )
@@ -239,7 +250,7 @@ def parser(literal_string, simple_ident, sqlserver=False):
             keyword("stack")("op") + LB + int_num("width") + "," + delimited_list(expression)("args") + RB
         ) / to_stack
 
-        query = Forward()
+        query = Memoized()
 
         # ARRAY[foo],
         # ARRAY < STRING > [foo, bar], INVALID
@@ -365,6 +376,7 @@ def parser(literal_string, simple_ident, sqlserver=False):
                         )
                         for o in KNOWN_OPS
                     ],
+                    engine=engine,
                 )
             )("value").set_parser_name("expression")
         )
@@ -427,7 +439,10 @@ def parser(literal_string, simple_ident, sqlserver=False):
         ) + comma
 
         row = (LB + delimited_list(Group(expression)) + RB) / to_row
-        values = VALUES + delimited_list(row) / to_values
+        if values_scanner is None:
+            values = VALUES + delimited_list(row) / to_values
+        else:
+            values = VALUES + LiteralRows(delimited_list(row) / to_values, values_scanner, row)
 
         window_clause = identifier("name") + AS + (identifier | over_clause)("value")
 
@@ -603,7 +618,7 @@ def parser(literal_string, simple_ident, sqlserver=False):
                 | assign("default character set", EQ + identifier)
                 | assign("default charset", EQ + identifier)
             )
-            + Optional(AS.suppress() + infix_notation(query, [])("query"))
+            + Optional(AS.suppress() + infix_notation(query, [], engine=engine)("query"))
         )("create table")
 
         create_view = (
@@ -880,13 +895,23 @@ def parser(literal_string, simple_ident, sqlserver=False):
 
         debugger.__enter__()
 
-        statement << (
-            query
-            | (insert | update | delete | merge)
-            | (create_table | create_view | create_cache | create_index)
-            | (drop_table | drop_view | drop_index)
-            | (copy | alter)
-            | (Optional(keyword("alter session")).suppress() + (set_variable | unset_variable | declare_variable))
-        )
+        # JUMP TO THE SUB-GRAMMAR BY THE LEADING KEYWORD; THE ORDER ONLY MATTERS FOR AMBIGUOUS KEYWORDS
+        statement << KeywordDispatch([
+            query,
+            insert,
+            update,
+            delete,
+            merge,
+            create_table,
+            create_view,
+            create_cache,
+            create_index,
+            drop_table,
+            drop_view,
+            drop_index,
+            copy,
+            alter,
+            Optional(keyword("alter session")).suppress() + (set_variable | unset_variable | declare_variable),
+        ])
 
-        return (explain | statement).finalize()
+        return KeywordDispatch([explain, statement]).finalize()
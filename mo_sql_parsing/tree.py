@@ -0,0 +1,301 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# THE CALLS BUILT BY THE GRAMMAR'S PARSE ACTIONS, AND scrub(), WHICH TURNS THE MATCH INTO THE JSON PARSE TREE
+import ast
+from collections.abc import Mapping
+from threading import local
+
+from mo_dots import is_null, is_many
+from mo_future import text, number_types, binary_type
+
+from mo_sql_parsing.columns import ColumnTable
+
+
+class Call(object):
+    __slots__ = ["op", "args", "kwargs"]
+
+    def __init__(self, op, args, kwargs):
+        self.op = op
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return f"{self.op}({self.args}, {self.kwargs})"
+
+    def __repr__(self):
+        if self is SQL_NULL:
+            return "SQL_NULL"
+        elif self.kwargs:
+            return f"{self.__class__.__name__}({self.op!r}, {self.args!r}, {self.kwargs!r})"
+        return f"{self.__class__.__name__}({self.op!r}, {self.args!r})"
+
+    def __reduce__(self):
+        if self is SQL_NULL:
+            # PARSE ACTIONS TEST FOR SQL_NULL BY IDENTITY, SO A PICKLED GRAMMAR MUST REFER TO THE SAME OBJECT
+            return "SQL_NULL"
+        return self.__class__, (self.op, self.args, self.kwargs)
+
+
+SQL_NULL = Call("null", [], {})
+JSON_NULL = {"null": {}}  # WHAT parse() PUTS FOR NULL, BY DEFAULT
+
+
+def listwrap(value):
+    """
+    None -> []
+    value -> [value]
+    [...] -> [...]  (unchanged list)
+    """
+    if is_null(value):
+        return []
+    elif is_many(value):
+        return value
+    else:
+        return [value]
+
+
+def simple_op(op, args, kwargs):
+    if args is None:
+        kwargs[op] = {}
+    else:
+        kwargs[op] = args
+    return kwargs
+
+
+_single_types = {str, int, float, dict}  # listwrap() WOULD WRAP THESE IN A LIST
+
+
+def normal_op(op, args, kwargs):
+    output = {"op": op}
+    if args.__class__ is not list:
+        args = [args] if args.__class__ in _single_types else listwrap(args)
+    if args and (not isinstance(args[0], dict) or args[0]):
+        output["args"] = args
+    if kwargs:
+        output["kwargs"] = kwargs
+    return output
+
+
+class Node(Call):
+    """
+    ONE CALL (FUNCTION OR OPERATOR) OF A TREE FROM parse(..., output="nodes")
+    args AND kwargs ARE AS calls WOULD RECEIVE THEM, ALREADY SCRUBBED; kwargs IS None WHEN THERE ARE NONE
+    NULL IS THE SQL_NULL PLACEHOLDER (A Call WITH op="null"); to_json() PUTS THE null YOU ASK FOR
+    """
+
+    __slots__ = []
+
+    def __init__(self, op, args=None, kwargs=None):
+        self.op = op
+        self.args = args
+        self.kwargs = dict(kwargs) if kwargs else None
+
+    def to_json(self, calls=simple_op, null=JSON_NULL):
+        """
+        :param calls: simple_op OR normal_op, AS GIVEN TO parse()
+        :param null: AS GIVEN TO parse()
+        :return: THE SAME dict parse(sql, null, calls) WOULD RETURN
+        """
+        return to_json(self, calls, null)
+
+    def __eq__(self, other):
+        if not isinstance(other, Call):
+            return NotImplemented
+        return self.op == other.op and self.args == other.args and (self.kwargs or {}) == (other.kwargs or {})
+
+    __hash__ = None
+
+
+class ParseContext(object):
+    """
+    STATE FOR A SINGLE parse() CALL, SO CONCURRENT PARSES SHARE NOTHING.  scrub() IS GIVEN THE context; THE
+    GRAMMAR FINDS IT IN matching, WHERE match() PUTS IT FOR THE LENGTH OF THE MATCH
+    """
+
+    __slots__ = ["calls", "null", "columnar", "meter", "memo"]
+
+    def __init__(self, calls=simple_op, null=SQL_NULL, columnar=False, meter=None, memo=None):
+        """
+        :param calls: FUNCTION TO CONVERT (op, args, kwargs) TO JSON
+        :param null: VALUE scrub() PUTS WHERE THE SQL HAS NULL (DEFAULT LEAVES THE SQL_NULL PLACEHOLDER)
+        :param columnar: True TO READ TABLES OF LITERAL VALUES INTO A ColumnTable
+        :param meter: budget.Meter TO SPEND ON EVERY ATTEMPT, OR None
+        :param memo: MatchMemo TO REMEMBER MATCHES IN, OR None
+        """
+        self.calls = calls
+        self.null = null
+        self.columnar = columnar
+        self.meter = meter
+        self.memo = memo
+
+
+class _Matching(local):
+    context = ParseContext()  # NO MATCH RUNNING ON THIS THREAD: NO columnar, NO meter, NO memo
+
+
+# mo_parsing CALLS THE GRAMMAR WITHOUT OUR ParseContext, SO match() LEAVES IT HERE, ONE PER THREAD
+matching = _Matching()
+
+
+# KINDS OF scrub() FRAMES
+_ROOT, _CALL, _LIST, _ITEMS = 0, 1, 2, 3
+_plain_types = {str, int, float}  # SCRUBBED TO THEMSELVES
+
+
+def scrub(result, context=None):
+    """
+    CONVERT THE ParseResults (AND Call) TREE TO dicts AND lists
+    THE TREE IS WALKED WITH AN EXPLICIT STACK, NOT RECURSION, SO DEEPLY NESTED SQL DOES NOT HIT THE RECURSION LIMIT
+    SQL_NULL IS REPLACED WITH context.null AS EACH CONTAINER IS FINISHED, SO THERE IS NO SECOND PASS
+    """
+    if context is None:
+        context = ParseContext()
+    null = context.null
+
+    # THE CURRENT FRAME: THE NODE, ITS SCRUBBED CHILDREN (output), THE CHILDREN TO DO, AND ITS kv_pairs (FOR _ITEMS)
+    kind, node, output, todo, kv_pairs = _ROOT, None, [], iter((result,)), None
+    stack = []  # THE FRAMES OF THE ANCESTORS
+    while True:
+        for child in todo:
+            if child.__class__ in _plain_types:
+                output.append(child)
+            elif child is SQL_NULL:
+                output.append(SQL_NULL)
+            elif child == None:
+                output.append(None)
+            elif isinstance(child, text):
+                output.append(child)
+            elif isinstance(child, binary_type):
+                output.append(child.decode("utf8"))
+            elif isinstance(child, (number_types, ColumnTable)):
+                output.append(child)
+            elif isinstance(child, Call):
+                stack.append((kind, node, output, todo, kv_pairs))
+                kind, node, output, todo, kv_pairs = _CALL, child, [], iter((child.kwargs, child.args)), None
+                break
+            elif isinstance(child, dict) and not child:
+                output.append(child)
+            elif child.__class__ is dict and all(v.__class__ in _plain_types for v in child.values()):
+                # ONLY LEAVES (LIKE {"literal": "a"}), NO NEED FOR A FRAME
+                output.append(dict(child))
+            elif isinstance(child, list):
+                stack.append((kind, node, output, todo, kv_pairs))
+                kind, node, output, todo, kv_pairs = _LIST, child, [], iter(child), None
+                break
+            else:
+                # ATTEMPT A DICT INTERPRETATION
+                pairs = list(child.items())
+                stack.append((kind, node, output, todo, kv_pairs))
+                kind, node, output, todo, kv_pairs = _ITEMS, child, [], iter([v for _, v in pairs]), pairs
+                break
+        else:
+            # ALL CHILDREN ARE SCRUBBED
+            if kind == _CALL:
+                kwargs, args = output
+                value = context.calls(node.op, args, kwargs)
+                if args is SQL_NULL:
+                    kwargs[node.op] = null
+            elif kind == _LIST:
+                if not output:
+                    value = None
+                elif len(output) == 1:
+                    value = output[0]
+                else:
+                    for i, v in enumerate(output):
+                        if v is SQL_NULL:
+                            output[i] = null
+                    value = output
+            elif kind == _ITEMS:
+                value = {k: vv for (k, _), vv in zip(kv_pairs, output) if not is_null(vv)}
+                if not isinstance(node, dict) and not value:
+                    # SCRUB AS A LIST INSTEAD
+                    node = list(node)
+                    kind, output, todo, kv_pairs = _LIST, [], iter(node), None
+                    continue
+                for k, v in value.items():
+                    if v is SQL_NULL:
+                        value[k] = null
+            else:
+                return output[0]
+            kind, node, output, todo, kv_pairs = stack.pop()
+            output.append(value)
+
+
+def to_json(tree, calls=simple_op, null=JSON_NULL):
+    """
+    CONVERT A TREE FROM parse(..., output="nodes") TO THE dict FORM parse() RETURNS WITH THE SAME calls AND null
+    A TREE FROM parse(..., output="lazy") IS CONVERTED WITH THE calls AND null IT WAS PARSED WITH
+    dicts AND lists ARE COPIED, SO THE TREE IS NOT CHANGED; A TREE WITHOUT Node IS RETURNED AS AN EQUAL COPY
+    """
+    kind, node, output, todo = _ROOT, None, [], iter((tree,))
+    stack = []
+    while True:
+        for child in todo:
+            if child.__class__ in _plain_types or child is SQL_NULL:
+                output.append(child)
+            elif isinstance(child, Call):
+                stack.append((kind, node, output, todo))
+                kind, node, output, todo = _CALL, child, [], iter((child.kwargs or {}, child.args))
+                break
+            elif isinstance(child, dict):
+                stack.append((kind, node, output, todo))
+                kind, node, output, todo = _ITEMS, child, [], iter(child.values())
+                break
+            elif isinstance(child, list):
+                stack.append((kind, node, output, todo))
+                kind, node, output, todo = _LIST, child, [], iter(child)
+                break
+            elif isinstance(child, Mapping):
+                # LIKE A LazyTree, WHICH CONVERTS EVERY CLAUSE WHEN ASKED FOR ITS ITEMS
+                child = dict(child.items())
+                stack.append((kind, node, output, todo))
+                kind, node, output, todo = _ITEMS, child, [], iter(child.values())
+                break
+            else:
+                output.append(child)
+        else:
+            if kind == _CALL:
+                kwargs, args = output
+                value = calls(node.op, args, kwargs)
+                if args is SQL_NULL:
+                    kwargs[node.op] = null
+            elif kind == _LIST:
+                value = [null if v is SQL_NULL else v for v in output]
+            elif kind == _ITEMS:
+                value = {k: null if v is SQL_NULL else v for k, v in zip(node.keys(), output)}
+            else:
+                value = output[0]
+                return null if value is SQL_NULL else value
+            kind, node, output, todo = stack.pop()
+            output.append(value)
+
+
+def _chunk(values, size):
+    acc = []
+    for v in values:
+        acc.append(v)
+        if len(acc) == size:
+            yield acc
+            acc = []
+    if acc:
+        yield acc
+
+
+def single_literal(tokens):
+    val = tokens[0]
+    val = '"""' + val[1:-1].replace("''", "\\'").replace('"', '\\"') + '"""'
+    return {"literal": ast.literal_eval(val)}
+
+
+def parse_int(tokens):
+    if "e" in tokens[0].lower():
+        return int(float(tokens[0]))
+    else:
+        return int(tokens[0])
@@ -10,32 +10,29 @@
 import ast
 import sys
 
-from mo_dots import is_data, is_null, Data, from_data, literal_field, unliteral_field
-from mo_future import text, number_types, binary_type, flatten
+from mo_dots import is_data, literal_field, unliteral_field
+from mo_future import text, number_types, flatten
 from mo_imports import expect
 from mo_parsing import *
 from mo_parsing.utils import is_number, listwrap
 
-unary_ops = expect("unary_ops")
-
-
-class Call(object):
-    __slots__ = ["op", "args", "kwargs"]
-
-    def __init__(self, op, args, kwargs):
-        self.op = op
-        self.args = args
-        self.kwargs = kwargs
-
-    def __str__(self):
-        return f"{self.op}({self.args}, {self.kwargs})"
+from mo_sql_parsing.columns import ColumnTable
+from mo_sql_parsing.operators import binary_ops, is_set_op
+from mo_sql_parsing.tree import (
+    Call,
+    SQL_NULL,
+    simple_op,
+    normal_op,
+    ParseContext,
+    scrub,
+    single_literal,
+    parse_int,
+)
 
+unary_ops = expect("unary_ops")
 
 IDENT_CHAR = Regex("[@_$0-9A-Za-zÀ-ÖØ-öø-ƿ]").expr.parser_config.include
 FIRST_IDENT_CHAR = "".join(set(IDENT_CHAR) - set("0123456789"))
-SQL_NULL = Call("null", [], {})
-
-null_locations = []
 
 
 def keyword(keywords):
@@ -55,84 +52,6 @@ def assign(key: str, value: ParserElement):
     return keyword(key).suppress() + value(key.replace(" ", "_"))
 
 
-def simple_op(op, args, kwargs):
-    if args is None:
-        kwargs[op] = {}
-    else:
-        kwargs[op] = args
-    return kwargs
-
-
-def normal_op(op, args, kwargs):
-    output = Data(op=op)
-    args = listwrap(args)
-    if args and (not isinstance(args[0], dict) or args[0]):
-        output.args = args
-    if kwargs:
-        output.kwargs = kwargs
-    return from_data(output)
-
-
-scrub_op = simple_op
-
-
-def scrub(result):
-    if result is SQL_NULL:
-        return SQL_NULL
-    elif result == None:
-        return None
-    elif isinstance(result, text):
-        return result
-    elif isinstance(result, binary_type):
-        return result.decode("utf8")
-    elif isinstance(result, number_types):
-        return result
-    elif isinstance(result, Call):
-        kwargs = scrub(result.kwargs)
-        args = scrub(result.args)
-        if args is SQL_NULL:
-            null_locations.append((kwargs, result.op))
-        return scrub_op(result.op, args, kwargs)
-    elif isinstance(result, dict) and not result:
-        return result
-    elif isinstance(result, list):
-        output = [rr for r in result for rr in [scrub(r)]]
-
-        if not output:
-            return None
-        elif len(output) == 1:
-            return output[0]
-        else:
-            for i, v in enumerate(output):
-                if v is SQL_NULL:
-                    null_locations.append((output, i))
-            return output
-    else:
-        # ATTEMPT A DICT INTERPRETATION
-        try:
-            kv_pairs = list(result.items())
-        except Exception as c:
-            print(c)
-        output = {k: vv for k, v in kv_pairs for vv in [scrub(v)] if not is_null(vv)}
-        if isinstance(result, dict) or output:
-            for k, v in output.items():
-                if v is SQL_NULL:
-                    null_locations.append((output, k))
-            return output
-        return scrub(list(result))
-
-
-def _chunk(values, size):
-    acc = []
-    for v in values:
-        acc.append(v)
-        if len(acc) == size:
-            yield acc
-            acc = []
-    if acc:
-        yield acc
-
-
 def to_lambda(tokens):
     params, op, expr = list(tokens)
     return Call("lambda", [expr], {"params": list(params)})
@@ -250,60 +169,6 @@ def to_tuple_call(token, index, string):
     return [tokens]
 
 
-binary_ops = {
-    "::": "cast",
-    "COLLATE": "collate",
-    ":": "get",
-    "||": "concat",
-    "*": "mul",
-    "/": "div",
-    "%": "mod",
-    "+": "add",
-    "-": "sub",
-    "&": "binary_and",
-    "|": "binary_or",
-    "<": "lt",
-    "<=": "lte",
-    ">": "gt",
-    ">=": "gte",
-    "=": "eq",
-    "==": "eq",
-    "is distinct from": "eq!",  # https://sparkbyexamples.com/apache-hive/hive-relational-arithmetic-logical-operators/
-    "is_distinct_from": "eq!",
-    "is not distinct from": "ne!",
-    "is_not_distinct_from": "ne!",
-    "<=>": "eq!",  # https://sparkbyexamples.com/apache-hive/hive-relational-arithmetic-logical-operators/
-    "!=": "neq",
-    "<>": "neq",
-    "not in": "nin",
-    "in": "in",
-    "is_not": "neq",
-    "is": "eq",
-    "similar_to": "similar_to",
-    "like": "like",
-    "rlike": "rlike",
-    "ilike": "ilike",
-    "not like": "not_like",
-    "not_like": "not_like",
-    "not rlike": "not_rlike",
-    "not_rlike": "not_rlike",
-    "not ilike": "not_ilike",
-    "not_ilike": "not_ilike",
-    "not_simlilar_to": "not_similar_to",
-    "or": "or",
-    "and": "and",
-    "->": "lambda",
-    "union": "union",
-    "union_all": "union_all",
-    "union all": "union_all",
-    "except": "except",
-    "minus": "minus",
-    "intersect": "intersect",
-}
-
-is_set_op = ("union", "union_all", "except", "minus", "intersect")
-
-
 def to_trim_call(tokens):
     frum = tokens["from"]
     if not frum:
@@ -646,6 +511,11 @@ def to_insert_call(tokens):
     columns = tokens["columns"]
     try:
         values = query["from"]["literal"]
+        if isinstance(values, ColumnTable):
+            # parse(columnar=True)
+            if columns:
+                values.names = list(columns)
+            return Call("insert", [tokens["table"]], {"values": values, **options})
         if values:
             if columns:
                 data = [dict(zip(columns, row)) for row in values]
@@ -688,12 +558,6 @@ def to_table(tokens):
     return [output["value"]]
 
 
-def single_literal(tokens):
-    val = tokens[0]
-    val = '"""' + val[1:-1].replace("''", "\\'").replace('"', '\\"') + '"""'
-    return {"literal": ast.literal_eval(val)}
-
-
 def double_literal(tokens):
     val = tokens[0]
     val = '"""' + val[1:-1].replace('""', '\\"') + '"""'
@@ -756,13 +620,6 @@ real_num = Regex(r"[+-]?(\d+\.\d*|\.\d+)([eE][+-]?\d+)?").set_parser_name("float
 real_pos = Regex(r"(\d+\.\d*|\.\d+)([eE][+-]?\d+)?").set_parser_name("float") / (lambda t: float(t[0]))
 
 
-def parse_int(tokens):
-    if "e" in tokens[0].lower():
-        return int(float(tokens[0]))
-    else:
-        return int(tokens[0])
-
-
 int_num = Regex(r"[+-]?\d+([eE]\+?\d+)?").set_parser_name("int") / parse_int
 int_pos = Regex(r"\d+([eE]\+?\d+)?").set_parser_name("int") / parse_int
 hex_num = Regex(r"0x[0-9a-fA-F]+").set_parser_name("hex") / (lambda t: {"hex": t[0][2:]})
@@ -0,0 +1,301 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+# WALK (Visitor) AND REWRITE (Transformer) PARSE TREES, CALLING A METHOD PER OPERATOR OR CLAUSE
+import re
+from collections.abc import Mapping
+
+from mo_sql_parsing.operators import binary_ops, join_keywords, precedence
+from mo_sql_parsing.tree import simple_op, normal_op, Call
+
+_UNKNOWN = object()
+_containers = (dict, list, Call)
+_leaf_types = {str, int, float, bool, type(None)}  # NOT ASKED IF THEY ARE A Mapping, WHICH IS SLOW
+
+
+def _is_container(value):
+    return isinstance(value, _containers) or isinstance(value, Mapping)
+
+
+def _is_mapping(value):
+    # A Mapping THAT IS NOT A dict, LIKE A LazyTree
+    return value.__class__ not in _leaf_types and not isinstance(value, _containers) and isinstance(value, Mapping)
+
+
+SKIP = object()  # RETURNED BY A visit_ METHOD: DO NOT LOOK INSIDE THIS VALUE
+STOP = object()  # RETURNED BY A visit_ METHOD: END THE WALK
+
+# KEYS THE DISPATCH TABLE IS BUILT FOR; OTHER KEYS ARE LOOKED UP WHEN FIRST SEEN
+KNOWN_KEYS = (
+    set(binary_ops.values())
+    | set(precedence.keys())
+    | join_keywords
+    | {
+        "select",
+        "select_distinct",
+        "from",
+        "where",
+        "groupby",
+        "having",
+        "orderby",
+        "limit",
+        "offset",
+        "with",
+        "value",
+        "name",
+        "literal",
+        "on",
+        "using",
+        "insert",
+        "update",
+        "delete",
+        "set",
+        "values",
+        "query",
+        "columns",
+        "null",
+    }
+)
+
+_not_word = re.compile(r"\W")
+
+
+def method_name(key):
+    """
+    :return: THE NAME OF THE METHOD FOR key: "visit_" AND key, WITH EACH NON-WORD CHARACTER AS "_"
+    ("left join" -> "visit_left_join", "eq!" -> "visit_eq_")
+    """
+    return "visit_" + _not_word.sub("_", key)
+
+
+class _Dispatch(object):
+    """
+    MAP FROM TREE KEY TO THE visit_ FUNCTION OF A CLASS (OR None), FILLED FOR KNOWN_KEYS WHEN THE CLASS IS MADE
+    """
+
+    __slots__ = ["cls", "table"]
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.table = {}
+        for key in KNOWN_KEYS:
+            self.get(key)
+
+    def get(self, key):
+        try:
+            return self.table[key]
+        except KeyError:
+            method = getattr(self.cls, method_name(key), None) if isinstance(key, str) else None
+            self.table[key] = method
+            return method
+
+
+class Visitor(object):
+    """
+    WALK A PARSE TREE, FROM THE TOP, CALLING visit_<key>(self, value, node) FOR EVERY KEY OF EVERY dict
+    (OPERATORS LIKE visit_eq, CLAUSES LIKE visit_from, visit_left_join).  value IS node[key]
+    A visit_ METHOD MAY RETURN SKIP, TO NOT WALK INSIDE value, OR STOP, TO END THE WALK
+    DEFINE visit_leaf(self, value, parent) TO SEE EVERY str, NUMBER AND None
+    SET calls = normal_op FOR TREES FROM parse(sql, calls=normal_op); THEN visit_<op> GETS THE args
+    WORKS ON EVERY output OF parse(): FOR A Node (output="nodes") visit_<op>(self, node.args, node) IS CALLED,
+    AND A LazyTree (output="lazy") IS WALKED LIKE A dict, CONVERTING EVERY CLAUSE
+    """
+
+    calls = simple_op
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = _Dispatch(cls)
+
+    def visit(self, tree):
+        """
+        :return: True IF THE WALK WAS ENDED BY STOP
+        """
+        table, lookup = self._dispatch.table, self._dispatch.get
+        visit_leaf = getattr(self, "visit_leaf", None)
+        normal = self.__class__.calls is normal_op  # A FUNCTION, NOT A METHOD, FROM THE CLASS
+        todo = [(tree, None)]
+        while todo:
+            node, parent = todo.pop()
+            if isinstance(node, dict):
+                if normal and "op" in node and node["op"].__class__ is str:
+                    method = lookup(node["op"])
+                    args = node.get("args")
+                    if method is not None:
+                        response = method(self, args, node)
+                        if response is STOP:
+                            return True
+                        if response is SKIP:
+                            continue
+                    kwargs = node.get("kwargs")
+                    if kwargs:
+                        todo.append((kwargs, node))
+                    if args is not None:
+                        todo.append((args, node))
+                    continue
+                children = []
+                for key, value in node.items():
+                    method = table.get(key, _UNKNOWN)
+                    if method is _UNKNOWN:
+                        method = lookup(key)
+                    if method is not None:
+                        response = method(self, value, node)
+                        if response is STOP:
+                            return True
+                        if response is SKIP:
+                            continue
+                    if visit_leaf is not None or (value.__class__ not in _leaf_types and _is_container(value)):
+                        children.append((value, node))
+                # DEPTH FIRST, IN KEY ORDER
+                children.reverse()
+                todo.extend(children)
+            elif isinstance(node, list):
+                if visit_leaf is None:
+                    todo.extend((v, node) for v in reversed(node) if v.__class__ not in _leaf_types and _is_container(v))
+                else:
+                    todo.extend((v, node) for v in reversed(node))
+            elif isinstance(node, Call):
+                method = lookup(node.op)
+                if method is not None:
+                    response = method(self, node.args, node)
+                    if response is STOP:
+                        return True
+                    if response is SKIP:
+                        continue
+                if node.kwargs:
+                    todo.append((node.kwargs, node))
+                if node.args is not None:
+                    todo.append((node.args, node))
+            elif _is_mapping(node):
+                todo.append((dict(node.items()), parent))
+            elif visit_leaf is not None:
+                if visit_leaf(node, parent) is STOP:
+                    return True
+        return False
+
+
+Visitor._dispatch = _Dispatch(Visitor)
+
+
+# KINDS OF Transformer FRAMES
+_ROOT, _DICT, _LIST, _CALL, _NODE, _MAPPING = 0, 1, 2, 3, 4, 5
+
+
+class Transformer(object):
+    """
+    RETURN A REWRITTEN COPY OF A PARSE TREE (THE GIVEN TREE IS NOT CHANGED), FROM THE TOP
+    FOR EACH dict, EACH visit_<key>(self, value, node) IS CALLED, IN KEY ORDER, AND RETURNS THE dict TO USE INSTEAD
+    OF node.  RETURN node (OR None) TO KEEP IT AND WALK INSIDE IT; ANYTHING ELSE REPLACES node AND IS NOT WALKED
+    (CALL self.transform() ON IT TO HAVE IT WALKED).  RETURN STOP TO KEEP THE REST OF THE TREE AS IT IS
+    DEFINE visit_leaf(self, value, parent) TO RETURN THE REPLACEMENT FOR EVERY str, NUMBER AND None
+    SET calls = normal_op FOR TREES FROM parse(sql, calls=normal_op); THEN visit_<op> GETS THE args
+    A Node (output="nodes") IS GIVEN TO visit_<op>(self, node.args, node), AND REBUILT AS A Node WHEN KEPT;
+    A LazyTree (output="lazy") IS TRANSFORMED INTO A dict
+    """
+
+    calls = simple_op
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = _Dispatch(cls)
+
+    def transform(self, tree):
+        table, dispatch = self._dispatch.table, self._dispatch.get
+        visit_leaf = getattr(self, "visit_leaf", None)
+        normal = self.__class__.calls is normal_op  # A FUNCTION, NOT A METHOD, FROM THE CLASS
+        stopped = False
+
+        # THE CURRENT FRAME: THE CONTAINER, ITS KEYS (FOR _DICT), ITS TRANSFORMED CHILDREN, AND THE CHILDREN TO DO
+        kind, node, keys, output, todo = _ROOT, None, None, [], iter((tree,))
+        stack = []
+        while True:
+            for child in todo:
+                if stopped:
+                    output.append(child)
+                    continue
+                if isinstance(child, dict):
+                    replacement = child
+                    is_call = normal and "op" in child and child["op"].__class__ is str
+                    if is_call:
+                        method = dispatch(child["op"])
+                        if method is not None:
+                            replacement = method(self, child.get("args"), child)
+                    else:
+                        for key, value in child.items():
+                            method = table.get(key, _UNKNOWN)
+                            if method is _UNKNOWN:
+                                method = dispatch(key)
+                            if method is not None:
+                                replacement = method(self, value, child)
+                                if replacement is not None and replacement is not child:
+                                    break
+                    if replacement is STOP:
+                        stopped = True
+                        output.append(child)
+                    elif replacement is None or replacement is child:
+                        stack.append((kind, node, keys, output, todo))
+                        if is_call:
+                            # THE op IS KEPT AS IT IS
+                            keys = [k for k in child.keys() if k != "op"]
+                            kind, node, output, todo = _CALL, child, [], iter([child[k] for k in keys])
+                        else:
+                            kind, node, keys, output, todo = _DICT, child, list(child.keys()), [], iter(child.values())
+                        break
+                    else:
+                        output.append(replacement)
+                elif isinstance(child, list):
+                    stack.append((kind, node, keys, output, todo))
+                    kind, node, keys, output, todo = _LIST, child, None, [], iter(child)
+                    break
+                elif isinstance(child, Call):
+                    method = dispatch(child.op)
+                    replacement = None if method is None else method(self, child.args, child)
+                    if replacement is STOP:
+                        stopped = True
+                        output.append(child)
+                    elif replacement is None or replacement is child:
+                        stack.append((kind, node, keys, output, todo))
+                        keys = [k for k in ("args", "kwargs") if getattr(child, k) is not None]
+                        kind, node, output, todo = _NODE, child, [], iter([getattr(child, k) for k in keys])
+                        break
+                    else:
+                        output.append(replacement)
+                elif _is_mapping(child):
+                    # TRANSFORMED AS THE dict OF ITS ITEMS
+                    stack.append((kind, node, keys, output, todo))
+                    kind, node, keys, output, todo = _MAPPING, child, None, [], iter((dict(child.items()),))
+                    break
+                elif visit_leaf is not None:
+                    replacement = visit_leaf(child, node)
+                    if replacement is STOP:
+                        stopped = True
+                        output.append(child)
+                    else:
+                        output.append(replacement)
+                else:
+                    output.append(child)
+            else:
+                if kind == _DICT:
+                    value = dict(zip(keys, output))
+                elif kind == _CALL:
+                    value = {"op": node["op"], **dict(zip(keys, output))}
+                elif kind == _LIST:
+                    value = output
+                elif kind == _NODE:
+                    parts = dict(zip(keys, output))
+                    value = node.__class__(node.op, parts.get("args"), parts.get("kwargs"))
+                elif kind == _MAPPING:
+                    value = output[0]
+                else:
+                    return output[0]
+                kind, node, keys, output, todo = stack.pop()
+                output.append(value)
+
+
+Transformer._dispatch = _Dispatch(Transformer)
@@ -0,0 +1,59 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+MILLISECONDS PER PARSE, WITHOUT A Budget AND WITH ONE (THE COST OF COUNTING), AND FOR STATEMENTS THAT BACKTRACK
+FOR LONG, HOW SOON A Budget OF 50ms STOPS THEM
+
+    PYTHONPATH=. python tests/benchmarks/bench_budget.py
+"""
+from time import perf_counter
+
+from mo_sql_parsing import parse, Budget, ParseBudgetExceeded
+
+ROUNDS = 10
+LIMIT = Budget(seconds=0.05)
+
+STATEMENTS = {
+    "narrow": "SELECT a FROM t WHERE b = 1",
+    "wide": "SELECT " + ", ".join(f"coalesce(c{i}, 0) + {i} AS d{i}" for i in range(20)) + " FROM t WHERE a > 1",
+    "nested": "SELECT a FROM t WHERE " + " AND ".join(f"b{i} IN (SELECT c FROM s{i})" for i in range(10)),
+}
+
+SLOW = {f"parens {n}": "SELECT " + "(" * n + "a" + ")" * n + " FROM t" for n in (10, 20, 30)}
+
+
+def timing(sql, budget):
+    """
+    :return: (MILLISECONDS PER PARSE, NUMBER STOPPED BY THE BUDGET)
+    """
+    stopped = 0
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        try:
+            parse(sql, budget=budget)
+        except ParseBudgetExceeded:
+            stopped += 1
+    return (perf_counter() - start) / ROUNDS * 1000, stopped
+
+
+def main():
+    parse("SELECT 1")
+    unlimited = Budget(seconds=60, attempts=10 ** 9)
+    for name, sql in STATEMENTS.items():
+        plain, _ = timing(sql, None)
+        metered, _ = timing(sql, unlimited)
+        print(f"{name:10s}  no budget {plain:8.2f}ms  budget {metered:8.2f}ms")
+    for name, sql in SLOW.items():
+        plain, _ = timing(sql, None)
+        limited, stopped = timing(sql, LIMIT)
+        print(f"{name:10s}  no budget {plain:8.2f}ms  50ms budget {limited:8.2f}ms ({stopped}/{ROUNDS} stopped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+PARSE RATE WITHOUT A CACHE, WITH THE EXACT-TEXT CACHE, AND WITH THE TEMPLATE CACHE
+
+    PYTHONPATH=. python tests/benchmarks/bench_cache.py
+"""
+from random import Random
+from time import perf_counter
+
+from mo_sql_parsing import parse, enable_cache, disable_cache
+
+SHAPES = [
+    "SELECT name, email FROM users WHERE id = {0}",
+    "SELECT count(*) FROM orders WHERE customer_id = {0} AND total > {1}.5 AND status = 'open{0}'",
+    "UPDATE accounts SET balance = balance - {1} WHERE id = {0}",
+    "INSERT INTO log (a, b, c) VALUES ({0}, 'x{1}', {1}.25)",
+]
+
+
+def workload(n, distinct):
+    rand = Random(42)
+    return [rand.choice(SHAPES).format(rand.randrange(distinct) + 1, rand.randrange(100) + 1) for _ in range(n)]
+
+
+def rate(sqls):
+    start = perf_counter()
+    for sql in sqls:
+        parse(sql)
+    return len(sqls) / (perf_counter() - start)
+
+
+def main():
+    parse(SHAPES[0].format(1, 1))  # BUILD THE PARSER BEFORE TIMING
+    for distinct in [10, 100_000]:
+        sqls = workload(500, distinct)
+        disable_cache()
+        print(f"distinct={distinct:6d}  no cache       {rate(sqls):9.1f} parses/sec")
+        cache = enable_cache(size=1000)
+        print(f"distinct={distinct:6d}  exact cache    {rate(sqls):9.1f} parses/sec  {cache.stats()}")
+        cache = enable_cache(size=1000, templates=True)
+        print(f"distinct={distinct:6d}  template cache {rate(sqls):9.1f} parses/sec  {cache.stats()}")
+    disable_cache()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+MICROSECONDS TO FIND THE KIND OF A STATEMENT WITH classify(), COMPARED TO parse() FOLLOWED BY A LOOK AT THE TOP
+KEYS OF THE TREE.  THE CTE STATEMENT SHOWS THE COST OF SKIPPING A WITH CLAUSE, WHICH GROWS WITH ITS LENGTH
+
+    PYTHONPATH=. python tests/benchmarks/bench_classify.py
+"""
+from time import perf_counter
+
+from mo_sql_parsing import parse, classify, StatementKind
+
+ROUNDS = 20
+CLASSIFY_ROUNDS = 10_000
+
+STATEMENTS = {
+    "select": "SELECT a, b FROM t JOIN u ON t.id = u.id WHERE c > 1",
+    "insert": "INSERT INTO t (a, b) VALUES (1, 'a'), (2, 'b')",
+    "update": "UPDATE t SET a = 1 WHERE b = 2",
+    "ddl": "CREATE TABLE t (a INTEGER, b VARCHAR(20))",
+    "set": "SET x = 1",
+    "cte": "WITH "
+    + ", ".join(f"c{i} AS (SELECT a, '(' AS b FROM t{i} WHERE c IN (SELECT c FROM u))" for i in range(10))
+    + " INSERT INTO t SELECT * FROM c9",
+}
+
+
+def kind_of_tree(tree):
+    if "explain" in tree:
+        return StatementKind.EXPLAIN
+    if any(k in tree for k in ("insert", "update", "delete", "merge", "copy")):
+        return StatementKind.WRITE
+    if any(k in tree for k in ("create table", "create view", "create index", "cache", "drop", "alter")):
+        return StatementKind.DDL
+    if any(k in tree for k in ("set", "unset", "declare")):
+        return StatementKind.SET
+    return StatementKind.READ
+
+
+def timing(find, sql, rounds):
+    start = perf_counter()
+    for _ in range(rounds):
+        find(sql)
+    return (perf_counter() - start) / rounds
+
+
+def main():
+    for name, sql in STATEMENTS.items():
+        assert classify(sql) == kind_of_tree(parse(sql))
+        fast = timing(classify, sql, CLASSIFY_ROUNDS)
+        slow = timing(lambda s: kind_of_tree(parse(s)), sql, ROUNDS)
+        print(f"{name:8s}  classify {fast * 1e6:8.2f}us  parse {slow * 1e6:10.1f}us  ({slow / fast:7.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+TIME FROM A FRESH INTERPRETER TO THE FIRST parse(), WITH AND WITHOUT THE GRAMMAR ARTIFACT
+
+    PYTHONPATH=. python tests/benchmarks/bench_cold_start.py
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from statistics import median
+
+from mo_sql_parsing.artifact import ARTIFACT_ENV
+
+RUNS = 5
+FIRST_PARSE = """
+from time import perf_counter
+start = perf_counter()
+import mo_sql_parsing
+imported = perf_counter()
+mo_sql_parsing.parse("select a from b")
+print(imported - start, perf_counter() - start)
+"""
+
+
+def cold_start(directory):
+    env = dict(os.environ)
+    env.pop(ARTIFACT_ENV, None)
+    if directory:
+        env[ARTIFACT_ENV] = directory
+    output = subprocess.run([sys.executable, "-c", FIRST_PARSE], env=env, capture_output=True, text=True, check=True)
+    return tuple(float(v) for v in output.stdout.split())
+
+
+def report(name, directory):
+    timings = [cold_start(directory) for _ in range(RUNS)]
+    imported = median(t[0] for t in timings)
+    total = median(t[1] for t in timings)
+    print(f"{name:18s} import {imported:6.3f}s  first parse {total:6.3f}s  (median of {RUNS})")
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    try:
+        report("build grammar", None)
+        cold_start(directory)  # WRITE THE ARTIFACT
+        print(f"artifact size      {sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory)):,} bytes")
+        report("load artifact", directory)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
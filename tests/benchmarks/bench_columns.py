@@ -0,0 +1,65 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+MEMORY HELD AFTER PARSING INSERT ... VALUES, WITH THE ROWS AS PYTHON LISTS (DEFAULT) AND AS A
+ColumnTable (parse(sql, columnar=True)), FROM 10^3 TO 10^6 ROWS.  ALSO THE PEAK MEMORY AND TIME OF THE PARSE
+"held" IS THE TREE, PLUS THE GRAMMAR'S WHITESPACE MEMO (ONE ENTRY PER CHARACTER) THAT A DEFAULT PARSE KEEPS
+
+    PYTHONPATH=. python tests/benchmarks/bench_columns.py
+"""
+import gc
+import tracemalloc
+from time import perf_counter
+
+from mo_sql_parsing import parse
+from tests.benchmarks.bench_rows import insert, ROWS
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+MAX_UNION_ALL = 100_000  # ROWS WITH NULL ARE A union_all OF SELECTS, TOO BIG TO TRACE BEYOND THIS
+
+
+def memory(sql, columnar):
+    """
+    :return: (held, peak) BYTES
+    """
+    gc.collect()
+    tracemalloc.start()
+    tree = parse(sql, columnar=columnar)
+    gc.collect()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+    return held, peak
+
+
+def timing(sql, columnar):
+    start = perf_counter()
+    parse(sql, columnar=columnar)
+    return perf_counter() - start
+
+
+def main():
+    for name, row in ROWS.items():
+        print(f"{name} rows {row}")
+        for num_rows in SIZES:
+            sql = insert(num_rows, row)
+            line = f"{num_rows:9d} rows"
+            for columnar in (False, True):
+                if not columnar and "NULL" in row and num_rows > MAX_UNION_ALL:
+                    continue
+                held, peak = memory(sql, columnar)
+                line += (
+                    f"  {'columns' if columnar else 'rows'}: held {held / 1e6:8.1f}MB"
+                    f" peak {peak / 1e6:8.1f}MB {timing(sql, columnar):7.2f}s"
+                )
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
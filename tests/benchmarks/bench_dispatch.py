@@ -0,0 +1,73 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+MEDIAN PARSE TIME OF EACH KIND OF STATEMENT, WITH AND WITHOUT THE FIRST-KEYWORD DISPATCH
+
+    PYTHONPATH=. python tests/benchmarks/bench_dispatch.py
+"""
+from statistics import median
+from time import perf_counter
+
+import mo_sql_parsing
+from mo_sql_parsing import parse
+
+ROUNDS = 50
+
+STATEMENTS = {
+    "select": "SELECT a, b FROM t WHERE c = 1",
+    "insert": "INSERT INTO t (a, b) VALUES (1, 2)",
+    "with insert": "WITH x AS (SELECT a FROM s) INSERT INTO t SELECT * FROM x",
+    "update": "UPDATE t SET a = 1 WHERE b = 2",
+    "delete": "DELETE FROM t WHERE a = 1",
+    "create table": "CREATE TABLE t (a INTEGER NOT NULL, b VARCHAR(20))",
+    "create view": "CREATE VIEW v AS SELECT a FROM t",
+    "create index": "CREATE INDEX i ON t (a, b)",
+    "drop index": "DROP INDEX IF EXISTS i",
+    "alter": "ALTER TABLE t ADD COLUMN c INTEGER",
+    "alter session": "ALTER SESSION SET timezone = 'UTC'",
+    "copy": "COPY INTO t FROM @stage",
+    "set": "SET a = 1",
+    "explain": "EXPLAIN SELECT a FROM t",
+}
+
+
+def dispatchers():
+    top = mo_sql_parsing.common_parser.element.expr
+    return [top, top.exprs[1].expr]
+
+
+def timing(sql, i):
+    sql = sql + " " * i  # NEW STRING EACH ROUND, SO NOTHING IS REMEMBERED BETWEEN ROUNDS
+    start = perf_counter()
+    parse(sql)
+    return (perf_counter() - start) * 1000
+
+
+def main():
+    parse("select 1")  # BUILD THE PARSER BEFORE TIMING
+    tables = [(d, d.heads) for d in dispatchers()]
+    total_with, total_without = 0, 0
+    for name, sql in STATEMENTS.items():
+        withouts, withs = [], []
+        for i in range(ROUNDS):
+            for d, _ in tables:
+                d.heads = None  # FALL BACK TO ORDERED TRIAL
+            withouts.append(timing(sql, i))
+            for d, heads in tables:
+                d.heads = heads
+            withs.append(timing(sql, i))
+        without, with_dispatch = median(withouts), median(withs)
+        total_with += with_dispatch
+        total_without += without
+        print(f"{name:14s} ordered trial {without:7.2f}ms  dispatch {with_dispatch:7.2f}ms")
+    print(f"{'total':14s} ordered trial {total_without:7.2f}ms  dispatch {total_with:7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
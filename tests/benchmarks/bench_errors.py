@@ -0,0 +1,73 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+STATEMENTS PER SECOND OVER A CORPUS WHERE MANY STATEMENTS FAIL: THE TEST SUITE'S STATEMENTS, EACH ALSO CUT SHORT
+(AT 1/3 AND 2/3 OF ITS LENGTH).  parse() WITH THE MESSAGE READ (AS ParsePool DOES), parse() WITH THE EXCEPTION
+IGNORED, AND try_parse() WITH THE ERROR NOT READ
+
+    PYTHONPATH=. python tests/benchmarks/bench_errors.py
+"""
+from time import perf_counter
+
+from mo_sql_parsing import parse, try_parse
+from tests.test_infix import suite_sql
+
+ROUNDS = 2
+SAMPLE = 3  # USE EVERY SAMPLE-TH STATEMENT OF THE TEST SUITE
+
+
+def corpus():
+    output = []
+    for dialect, sql in suite_sql()[::SAMPLE]:
+        if dialect != "common":
+            continue
+        sql = sql.strip()
+        output.append(sql)
+        output.append(sql[: len(sql) // 3])
+        output.append(sql[: 2 * len(sql) // 3])
+    return output
+
+
+def parse_with_message(sql):
+    try:
+        return parse(sql)
+    except Exception as cause:
+        return str(cause)
+
+
+def parse_ignore_error(sql):
+    try:
+        return parse(sql)
+    except Exception:
+        return None
+
+
+def try_parse_unread(sql):
+    return try_parse(sql)
+
+
+def main():
+    sqls = corpus()
+    failures = sum(not try_parse(sql) for sql in sqls)  # ALSO WARMS UP THE GRAMMAR
+    print(f"{len(sqls)} statements, {failures} ({failures / len(sqls):.0%}) fail")
+    finders = (parse_with_message, parse_ignore_error, try_parse_unread)
+    total = [0] * len(finders)
+    for _ in range(ROUNDS):
+        # TAKE TURNS, SO A SLOW STRETCH OF THE MACHINE DOES NOT FAVOUR ONE
+        for i, find in enumerate(finders):
+            start = perf_counter()
+            for sql in sqls:
+                find(sql)
+            total[i] += perf_counter() - start
+    for find, seconds in zip(finders, total):
+        print(f"{find.__name__:20s} {len(sqls) * ROUNDS / seconds:8.1f}/s")
+
+
+if __name__ == "__main__":
+    main()
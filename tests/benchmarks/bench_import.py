@@ -0,0 +1,62 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+IMPORT TIME OF mo_sql_parsing, MEASURED WITH `python -X importtime`
+
+    PYTHONPATH=. python tests/benchmarks/bench_import.py [max_ms]
+
+EXITS WITH 1 IF THE MEDIAN IMPORT TIME IS OVER max_ms, SO IT CAN GUARD AGAINST REGRESSIONS
+"""
+import subprocess
+import sys
+from statistics import median
+
+RUNS = 7
+TOP = 10
+
+
+def importtime(code):
+    """
+    :return: MAP FROM MODULE NAME TO (self_us, cumulative_us)
+    """
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    timings = {}
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # HEADER
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main():
+    max_ms = float(sys.argv[1]) if len(sys.argv) > 1 else None
+
+    runs = [importtime("import mo_sql_parsing") for _ in range(RUNS)]
+    total_ms = median(r["mo_sql_parsing"][1] for r in runs) / 1000
+    print(f"import mo_sql_parsing: {total_ms:.1f}ms (median of {RUNS})")
+
+    print("largest modules (cumulative):")
+    last = runs[-1]
+    for name, (_, cumulative) in sorted(last.items(), key=lambda p: -p[1][1])[1 : TOP + 1]:
+        print(f"    {cumulative / 1000:7.1f}ms  {name}")
+
+    loaded = importtime("import mo_sql_parsing; mo_sql_parsing.format({'select': 'a'})")
+    grammar = sorted(n for n in loaded if n.startswith("mo_parsing") or n.endswith((".keywords", ".sql_parser")))
+    print(f"grammar modules loaded by format(): {grammar or 'none'}")
+
+    if max_ms is not None and total_ms > max_ms:
+        print(f"FAIL: import takes more than {max_ms}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
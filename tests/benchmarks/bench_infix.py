@@ -0,0 +1,43 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+PARSE TIME OF LONG OPERATOR EXPRESSIONS, FOR EACH WAY OF BUILDING THE OPERATOR TREE
+
+    PYTHONPATH=. python tests/benchmarks/bench_infix.py
+"""
+from time import perf_counter
+
+from mo_sql_parsing import sql_parser
+from mo_sql_parsing.infix import ENGINES
+
+SIZES = [10, 30, 100, 300]
+
+SHAPES = {
+    "arithmetic": lambda n: "SELECT " + " + ".join(f"a{i} * {i}" for i in range(n)),
+    "predicate": lambda n: "SELECT a FROM t WHERE " + " OR ".join(f"b = {i} AND NOT c{i} < 2" for i in range(n)),
+}
+
+
+def timing(parser, sql):
+    start = perf_counter()
+    parser.parse_string(sql, parse_all=True)
+    return (perf_counter() - start) * 1000
+
+
+def main():
+    parsers = {engine: sql_parser.common_parser(engine=engine) for engine in ENGINES}
+    for shape, make in SHAPES.items():
+        for size in SIZES:
+            sql = make(size)
+            line = "  ".join(f"{engine} {timing(parser, sql):9.1f}ms" for engine, parser in parsers.items())
+            print(f"{shape:10s} {size:5d} terms  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+COST OF LOOKING ONLY AT tree["from"] (TABLE ROUTING), WITH THE WHOLE TREE CONVERTED (parse(sql)) AND WITH ONLY
+THE from CLAUSE CONVERTED (parse(sql, output="lazy")).  THE TIME AFTER THE GRAMMAR MATCH IS SHOWN ON ITS OWN,
+SINCE THAT IS ALL THE LAZY TREE CAN SAVE
+
+    PYTHONPATH=. python tests/benchmarks/bench_lazy.py
+"""
+from time import perf_counter
+
+from mo_sql_parsing.lazy import lazy
+from mo_sql_parsing.sql_parser import common_parser
+from mo_sql_parsing.tree import scrub, ParseContext
+
+ROUNDS = 20
+
+STATEMENTS = {
+    "narrow": "SELECT a FROM t WHERE b = 1",
+    "wide": "SELECT " + ", ".join(f"coalesce(c{i}, 0) + {i} AS d{i}" for i in range(20)) + " FROM t WHERE a > 1",
+    "case": "SELECT CASE "
+    + " ".join(f"WHEN a = {i} THEN 'v{i}'" for i in range(50))
+    + " END FROM t JOIN u ON t.id = u.id",
+    "insert": "INSERT INTO t (a, b) VALUES " + ", ".join(f"({i}, 'x{i}')" for i in range(200)),
+}
+
+
+def timing(parser, sql, convert):
+    """
+    :return: (SECONDS TO PARSE AND LOOK AT from, SECONDS AFTER THE GRAMMAR MATCH)
+    """
+    total, after = 0, 0
+    for _ in range(ROUNDS):
+        start = perf_counter()
+        raw = parser.parse_string(sql, parse_all=True)
+        matched = perf_counter()
+        tree = convert(raw, ParseContext())
+        tree.get("from")
+        end = perf_counter()
+        total += end - start
+        after += end - matched
+    return total / ROUNDS, after / ROUNDS
+
+
+def main():
+    parser = common_parser()
+    for name, sql in STATEMENTS.items():
+        line = f"{name:8s} {len(sql):6d} chars"
+        for convert in (scrub, lazy):
+            total, after = timing(parser, sql, convert)
+            line += f"  {convert.__name__} {total * 1000:8.2f}ms (after match {after * 1000:7.3f}ms)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+PARSE TIME OF DEEPLY NESTED SQL, WITH AND WITHOUT THE MATCH MEMO, AND THE MEMO COUNTERS
+
+    PYTHONPATH=. python tests/benchmarks/bench_memo.py
+"""
+from time import perf_counter
+
+from mo_sql_parsing import parse, enable_memo, disable_memo
+
+ROUNDS = 3
+DEPTHS = [1, 2, 4, 8, 16]
+
+
+def case_in_window(depth):
+    expr = "x"
+    for i in range(depth):
+        expr = f"sum(CASE WHEN a{i} > {i} THEN {expr} ELSE 0 END) OVER (PARTITION BY p{i} ORDER BY q)"
+    return f"SELECT {expr} FROM t"
+
+
+def sub_query(depth):
+    sql = "SELECT a FROM t"
+    for i in range(depth):
+        sql = f"SELECT a{i} FROM ({sql}) AS s{i} WHERE b IN (SELECT b FROM u{i})"
+    return sql
+
+
+def tuples(depth):
+    expr = "(1, 2)"
+    for i in range(depth):
+        expr = f"({expr}, ({i}, {expr}))"
+    return f"SELECT * FROM t WHERE (a, b) IN ({expr})"
+
+
+def timing(sql):
+    start = perf_counter()
+    for i in range(ROUNDS):
+        parse(sql + " " * i)  # NEW STRING EACH ROUND, SO NOTHING IS REMEMBERED BETWEEN ROUNDS
+    return (perf_counter() - start) / ROUNDS * 1000
+
+
+def main():
+    parse("select 1")  # BUILD THE PARSER BEFORE TIMING
+    for shape in (case_in_window, sub_query, tuples):
+        for depth in DEPTHS:
+            if shape is tuples and depth > 8:
+                continue  # TUPLES DOUBLE IN SIZE AT EACH LEVEL
+            sql = shape(depth)
+            disable_memo()
+            without = timing(sql)
+            memo = enable_memo()
+            with_memo = timing(sql)
+            stats = memo.stats()
+            disable_memo()
+            print(
+                f"{shape.__name__:15s} depth {depth:3d} {len(sql):7d} chars  without memo {without:9.2f}ms  with memo"
+                f" {with_memo:9.2f}ms  hits {stats['hits'] // ROUNDS:6d}  misses {stats['misses'] // ROUNDS:6d}  peak"
+                f" {stats['peak_entries']:6d}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+MEMORY HELD BY MANY PARSE TREES, AS dicts (parse(sql)) AND AS Node (parse(sql, output="nodes")), AND THE TIME TO
+BUILD EACH FROM THE SAME ParseResults.  ALSO THE TIME FOR to_json() TO TURN THE NODES BACK INTO dicts
+
+    PYTHONPATH=. python tests/benchmarks/bench_nodes.py
+"""
+import tracemalloc
+from time import perf_counter
+
+from mo_sql_parsing.sql_parser import common_parser
+from mo_sql_parsing.tree import scrub, ParseContext, Node, SQL_NULL, to_json
+from tests.benchmarks.bench_ops import STATEMENTS
+
+COPIES = 200  # TREES HELD OF EACH STATEMENT
+
+
+def held(parser, sql, context):
+    """
+    :return: (BYTES PER TREE, SECONDS PER TREE, THE TREES)
+    """
+    raws = [parser.parse_string(sql, parse_all=True) for _ in range(COPIES)]  # scrub() CONSUMES ITS INPUT
+    tracemalloc.start()
+    start = perf_counter()
+    trees = [scrub(raw, context()) for raw in raws]
+    duration = perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / COPIES, duration / COPIES, trees
+
+
+def main():
+    parser = common_parser()
+    for name, sql in STATEMENTS.items():
+        json_size, json_time, _ = held(parser, sql, ParseContext)
+        node_size, node_time, trees = held(parser, sql, lambda: ParseContext(Node, SQL_NULL))
+        start = perf_counter()
+        for tree in trees:
+            to_json(tree)
+        to_json_time = (perf_counter() - start) / COPIES
+        print(
+            f"{name:10s} json {json_size:7.0f} bytes {json_time * 1e6:7.1f}us  nodes {node_size:7.0f} bytes"
+            f" {node_time * 1e6:7.1f}us  to_json {to_json_time * 1e6:6.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
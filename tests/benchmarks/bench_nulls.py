@@ -0,0 +1,67 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+TIME AND PEAK MEMORY OF scrub() ON NULL-HEAVY INSERT DUMPS, PUTTING THE CALLER'S null IN AS IT GOES (ONE PASS),
+COMPARED TO LEAVING THE SQL_NULL PLACEHOLDERS AND REPLACING THEM AFTERWARDS (TWO PASSES)
+
+    PYTHONPATH=. python tests/benchmarks/bench_nulls.py
+"""
+import tracemalloc
+from time import perf_counter
+
+from mo_sql_parsing.cache import copy_tree
+from mo_sql_parsing.sql_parser import common_parser
+from mo_sql_parsing.tree import scrub, ParseContext
+from tests.benchmarks.bench_rows import insert
+
+SIZES = [1_000, 10_000, 50_000]
+ROW = "({i}, NULL, 'name {i}', NULL, NULL, {i}.5, NULL)"
+NULLS = {"none": None, "null function": {"null": {}}}
+
+
+def one_pass(raw, null):
+    return scrub(raw, ParseContext(null=null))
+
+
+def two_pass(raw, null):
+    return copy_tree(scrub(raw), null)
+
+
+def measure(parser, sql, method, null):
+    """
+    :return: (SECONDS, PEAK BYTES); EACH FROM ITS OWN PARSE, SINCE scrub() CONSUMES IT, AND TRACING IS SLOW
+    """
+    raw = parser.parse_string(sql, parse_all=True)
+    start = perf_counter()
+    method(raw, null)
+    duration = perf_counter() - start
+
+    raw = parser.parse_string(sql, parse_all=True)
+    tracemalloc.start()
+    method(raw, null)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak
+
+
+def main():
+    parser = common_parser()
+    print(f"rows {ROW}")
+    for name, null in NULLS.items():
+        for num_rows in SIZES:
+            sql = insert(num_rows, ROW)
+            line = f"null={name:14s} {num_rows:7d} rows"
+            for method in (one_pass, two_pass):
+                duration, peak = measure(parser, sql, method, null)
+                line += f"  {method.__name__} {duration * 1000:9.2f}ms peak {peak / 1e6:7.1f}MB"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
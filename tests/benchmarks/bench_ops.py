@@ -0,0 +1,84 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+THE COST OF ONE calls=simple_op ({op: args}) AND ONE calls=normal_op ({"op", "args", "kwargs"}), AND scrub()
+THROUGHPUT WITH EACH, ON STATEMENTS THAT ARE MOSTLY FUNCTION CALLS AND OPERATORS
+
+    PYTHONPATH=. python tests/benchmarks/bench_ops.py
+"""
+from time import perf_counter
+
+from mo_sql_parsing import simple_op, normal_op
+from mo_sql_parsing.sql_parser import common_parser
+from mo_sql_parsing.tree import scrub, ParseContext, Call
+
+ROUNDS = 50
+
+STATEMENTS = {
+    "functions": "SELECT coalesce(a, b, 0), substr(trim(c), 1, 2), max(d) FROM t GROUP BY a, b",
+    "operators": "SELECT a + b * c - d / 2 FROM t WHERE a > 1 AND b < 2 OR NOT c = 3 AND d BETWEEN 4 AND 5",
+    "case": "SELECT CASE WHEN a = 1 THEN 'x' WHEN a = 2 THEN 'y' ELSE lower(b) END AS c FROM t",
+    "window": "SELECT sum(a) OVER (PARTITION BY b ORDER BY c ROWS BETWEEN 1 PRECEDING AND CURRENT ROW) FROM t",
+}
+
+
+def count_calls(raw):
+    # ONLY THE TOP OF THE PARSE RESULTS; CALLS ARE IN THE TOKENS
+    todo, found = [raw], 0
+    while todo:
+        node = todo.pop()
+        if isinstance(node, Call):
+            found += 1
+            todo.extend((node.args, node.kwargs))
+        elif isinstance(node, dict):
+            todo.extend(node.values())
+        elif isinstance(node, list):
+            todo.extend(node)
+        elif hasattr(node, "tokens"):
+            todo.extend(node.tokens)
+    return found
+
+
+def timing(parser, sql, calls):
+    """
+    :return: SECONDS TO scrub() ONE PARSE, ON AVERAGE
+    """
+    raws = [parser.parse_string(sql, parse_all=True) for _ in range(ROUNDS)]  # scrub() CONSUMES ITS INPUT
+    start = perf_counter()
+    for raw in raws:
+        scrub(raw, ParseContext(calls))
+    return (perf_counter() - start) / ROUNDS
+
+
+def op_timing(calls, args):
+    start = perf_counter()
+    for _ in range(ROUNDS * 1000):
+        calls("add", args, {})
+    return (perf_counter() - start) / (ROUNDS * 1000)
+
+
+def main():
+    for calls in (simple_op, normal_op):
+        print(
+            f"{calls.__name__:10s} one call {op_timing(calls, ['a', 1]) * 1e6:6.2f}us "
+            f" one argument {op_timing(calls, 'a') * 1e6:6.2f}us"
+        )
+
+    parser = common_parser()
+    for name, sql in STATEMENTS.items():
+        num_calls = count_calls(parser.parse_string(sql, parse_all=True))
+        line = f"{name:10s} {num_calls:3d} calls"
+        for calls in (simple_op, normal_op):
+            seconds = timing(parser, sql, calls)
+            line += f"  {calls.__name__} {seconds * 1e6:8.1f}us {num_calls / seconds / 1e3:8.1f}k calls/s"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
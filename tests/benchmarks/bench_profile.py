@@ -0,0 +1,57 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+MILLISECONDS PER PARSE: NEVER PROFILED, AFTER A PROFILE WAS ENABLED AND DISABLED (SHOULD BE THE SAME), AND WHILE
+PROFILED; THEN THE SLOWEST RULES OF THE WIDE STATEMENT
+
+    PYTHONPATH=. python tests/benchmarks/bench_profile.py
+"""
+from time import perf_counter
+
+from mo_sql_parsing import parse, enable_profile, disable_profile
+
+ROUNDS = 10
+
+STATEMENTS = {
+    "narrow": "SELECT a FROM t WHERE b = 1",
+    "wide": "SELECT " + ", ".join(f"coalesce(c{i}, 0) + {i} AS d{i}" for i in range(20)) + " FROM t WHERE a > 1",
+    "nested": "SELECT a FROM t WHERE " + " AND ".join(f"b{i} IN (SELECT c FROM s{i})" for i in range(10)),
+}
+
+
+def timing(sql):
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        parse(sql)
+    return (perf_counter() - start) / ROUNDS * 1000
+
+
+def main():
+    # ONE PASS FIRST: THE LATER PASSES ARE SLOWER THAN THE FIRST (FOR narrow, TWICE AS SLOW), PROFILED OR NOT
+    for sql in STATEMENTS.values():
+        timing(sql)
+    never = {name: timing(sql) for name, sql in STATEMENTS.items()}
+    enable_profile()
+    disable_profile()
+    after = {name: timing(sql) for name, sql in STATEMENTS.items()}
+    enable_profile()
+    profiled = {name: timing(sql) for name, sql in STATEMENTS.items()}
+    disable_profile()
+    for name in STATEMENTS:
+        print(f"{name:10s}  never {never[name]:8.2f}ms  disabled {after[name]:8.2f}ms  profiled {profiled[name]:8.2f}ms")
+
+    profile = enable_profile()
+    parse(STATEMENTS["wide"])
+    disable_profile()
+    print()
+    print(profile.report(limit=10))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+STATEMENTS PER SECOND TO FIND THE TABLES AND COLUMNS OF A STATEMENT: FROM THE MATCHED TOKENS (AS extract_tables()
+AND extract_columns() DO), AND WITH parse() FOLLOWED BY A WALK OF THE TREE.  THE GRAMMAR MATCH IS THE SAME FOR BOTH,
+SO THE TIME AFTER THE MATCH IS SHOWN ON ITS OWN
+
+    PYTHONPATH=. python tests/benchmarks/bench_references.py
+"""
+from time import perf_counter
+
+from mo_sql_parsing.references import references
+from mo_sql_parsing.sql_parser import common_parser
+from mo_sql_parsing.tree import scrub, ParseContext
+
+ROUNDS = 50
+
+STATEMENTS = {
+    "narrow": "SELECT a FROM t WHERE b = 1",
+    "joins": "SELECT t.a, u.b, v.c FROM t JOIN u ON t.id = u.id LEFT JOIN v ON u.id = v.id WHERE t.x > 1",
+    "wide": "SELECT " + ", ".join(f"coalesce(c{i}, 0) + {i} AS d{i}" for i in range(20)) + " FROM t WHERE a > 1",
+    "nested": "WITH x AS (SELECT a FROM s) SELECT a FROM t WHERE "
+    + " AND ".join(f"b{i} IN (SELECT c FROM x JOIN s{i} ON x.a = s{i}.a)" for i in range(10)),
+    "insert": "INSERT INTO t (a, b) SELECT a, b FROM s WHERE c IN (SELECT c FROM u)",
+}
+
+_skip_keys = {"literal", "name", "hex", "sort", "nulls", "columns", "locking"}
+_ddl_keys = {"create table", "create view", "create index", "drop", "alter"}
+
+
+def walk_references(tree):
+    """
+    THE TABLES AND COLUMNS IN A parse() TREE: THE SAME ANSWER AS references(), FROM THE TREE
+    """
+    tables, columns, ctes = set(), set(), set()
+
+    def walk(node, is_table):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in _skip_keys:
+                    continue
+                elif key in _ddl_keys:
+                    # ONLY CREATE ... AS SELECT REFERS TO OTHER TABLES
+                    if isinstance(value, dict):
+                        walk(value.get("query"), False)
+                elif key in ("with", "with_recursive"):
+                    for cte in value if isinstance(value, list) else [value]:
+                        name = cte["name"]
+                        ctes.add(name if isinstance(name, str) else next(iter(name)))
+                        walk(cte["value"], False)
+                elif key == "copy":
+                    for k in ("into", "from"):
+                        v = value.get(k)
+                        if isinstance(v, str) and (v.startswith("@") or "://" in v):
+                            continue
+                        walk(v, True)
+                elif key == "interval":
+                    walk(value[0], False)
+                elif key == "extract":
+                    walk(value[1], False)
+                elif key == "value":
+                    walk(value, is_table)
+                elif key in ("from", "insert", "update", "delete", "target", "source") or key.endswith("join"):
+                    walk(value, True)
+                else:
+                    walk(value, False)
+        elif isinstance(node, list):
+            for v in node:
+                walk(v, is_table)
+        elif isinstance(node, str):
+            if is_table:
+                tables.add(node)
+            elif not node.endswith("*"):
+                columns.add(node)
+
+    walk(tree, False)
+    return tables - ctes, columns
+
+
+def timing(parser, sql, finders):
+    """
+    :return: FOR EACH OF finders, (SECONDS TO FIND THE REFERENCES, SECONDS AFTER THE GRAMMAR MATCH)
+    """
+    total, after = [0] * len(finders), [0] * len(finders)
+    for _ in range(ROUNDS):
+        # TAKE TURNS, SO A SLOW STRETCH OF THE MACHINE DOES NOT FAVOUR ONE
+        for i, find in enumerate(finders):
+            start = perf_counter()
+            raw = parser.parse_string(sql, parse_all=True)
+            matched = perf_counter()
+            find(raw)
+            end = perf_counter()
+            total[i] += end - start
+            after[i] += end - matched
+    return [(t / ROUNDS, a / ROUNDS) for t, a in zip(total, after)]
+
+
+def parse_then_walk(raw):
+    return walk_references(scrub(raw, ParseContext()))
+
+
+def main():
+    parser = common_parser()
+    for name, sql in STATEMENTS.items():
+        # THE SAME ANSWERS, SO THE TIMES ARE COMPARABLE (THIS ALSO WARMS UP THE GRAMMAR)
+        assert references(parser.parse_string(sql, parse_all=True)) == parse_then_walk(
+            parser.parse_string(sql, parse_all=True)
+        )
+        line = f"{name:8s}"
+        finders = (parse_then_walk, references)
+        for find, (total, after) in zip(finders, timing(parser, sql, finders)):
+            line += f"  {find.__name__} {1 / total:8.1f}/s (after match {after * 1000:7.3f}ms)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
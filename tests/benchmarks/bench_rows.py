@@ -0,0 +1,74 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+PARSE TIME OF INSERT ... VALUES WITH LITERAL ROWS, FROM 10 TO 10^6 ROWS, WITH THE LITERAL ROW SCANNER
+AND WITH THE FULL GRAMMAR (ONLY FOR THE SMALLER SIZES; IT IS TOO SLOW FOR THE LARGER ONES)
+ROWS WITHOUT NULL BECOME {"values": [[...], ...]}; A NULL MAKES THEM A union_all OF SELECTS, WHICH IS MORE TO BUILD
+"mixed" ROWS ARE LITERAL, EXCEPT ONE IN THE MIDDLE WITH now(); ONLY THAT ROW NEEDS THE GRAMMAR
+
+    PYTHONPATH=. python tests/benchmarks/bench_rows.py
+"""
+import tracemalloc
+from time import perf_counter
+
+from mo_sql_parsing import scrub
+from mo_sql_parsing.sql_parser import common_parser
+
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+MAX_FULL_GRAMMAR = 10_000
+
+
+ROWS = {
+    "literal": "({i}, 'name {i}', {i}.5, TRUE)",
+    "with null": "({i}, 'name {i}', {i}.5, NULL)",
+    "mixed": "({i}, 'name {i}', {i}.5, TRUE)",
+}
+EXPRESSION_ROW = "(0, 'now', 0.5, now())"
+
+
+def insert(num_rows, row=ROWS["with null"], mixed=False):
+    rows = [row.format(i=i + 1) for i in range(num_rows)]
+    if mixed:
+        rows[num_rows // 2] = EXPRESSION_ROW
+    return f"INSERT INTO t (a, b, c, d) VALUES {', '.join(rows)}"
+
+
+def timing(parser, sql):
+    start = perf_counter()
+    scrub(parser.parse_string(sql, parse_all=True))
+    return perf_counter() - start
+
+
+def peak_memory(parser, sql):
+    tracemalloc.start()
+    scrub(parser.parse_string(sql, parse_all=True))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    fast = common_parser()
+    full = common_parser(fast_values=False)
+    for name, row in ROWS.items():
+        print(f"{name} rows {row}")
+        for num_rows in SIZES:
+            sql = insert(num_rows, row, name == "mixed")
+            fast_time = timing(fast, sql)
+            line = f"{num_rows:9d} rows {len(sql) / 1e6:8.2f}MB  scanner {fast_time:8.3f}s"
+            if num_rows <= MAX_FULL_GRAMMAR:
+                full_time = timing(full, sql)
+                line += f"  full grammar {full_time:8.3f}s  ({full_time / fast_time:5.1f}x)"
+            if num_rows <= 100_000:
+                line += f"  scanner peak memory {peak_memory(fast, sql) / 1e6:8.1f}MB"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
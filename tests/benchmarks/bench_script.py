@@ -0,0 +1,68 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+SPLIT A GENERATED DUMP INTO STATEMENTS: READ WHOLE, READ AS A TEXT FILE, AND MEMORY-MAPPED BY PATH
+REPORTS TIME AND PEAK PYTHON MEMORY (MEMORY-MAPPED PAGES BELONG TO THE OPERATING SYSTEM, NOT TO PYTHON)
+
+    PYTHONPATH=. python tests/benchmarks/bench_script.py
+"""
+import os
+import tempfile
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+from mo_sql_parsing import split_statements
+
+STATEMENTS = 200_000
+
+
+def write_dump(path):
+    with open(path, "w", encoding="utf8") as file:
+        for i in range(STATEMENTS):
+            file.write(f"INSERT INTO t VALUES ({i}, 'a;b', \"c\"), ({i}, 'it''s', NULL); -- row {i}\n")
+            if i % 1000 == 0:
+                file.write(f"/* checkpoint {i}; */ CREATE TABLE t{i} (a INTEGER, b VARCHAR(20));\n")
+
+
+def measure(name, run):
+    start = perf_counter()
+    count = sum(1 for _ in run())
+    seconds = perf_counter() - start
+    # AGAIN, FOR MEMORY; TRACING IS TOO SLOW TO TIME AT THE SAME TIME
+    tracemalloc.start()
+    sum(1 for _ in run())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:10s} {count:8d} statements  {seconds:6.2f}s  peak python memory {peak / 1e6:8.2f}MB")
+
+
+def main():
+    path = Path(tempfile.mkstemp(suffix=".sql")[1])
+    try:
+        write_dump(path)
+        print(f"dump is {os.path.getsize(path) / 1e6:.1f}MB")
+
+        def whole():
+            with open(path, encoding="utf8") as file:
+                yield from split_statements(file.read())
+
+        def text_file():
+            with open(path, encoding="utf8") as file:
+                yield from split_statements(file)
+
+        measure("whole", whole)
+        measure("text file", text_file)
+        measure("mapped", lambda: split_statements(path))
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+TIME AND PEAK MEMORY OF scrub() ON NESTED PARENTHESES AND NESTED CASE, 10^3 TO 10^5 DEEP, WELL PAST THE
+RECURSION LIMIT.  THE GRAMMAR ITSELF RECURSES, SO SQL THAT DEEP CAN NOT BE PARSED; THOSE TREES ARE BUILT
+DIRECTLY, IN THE SHAPE THE PARSE ACTIONS MAKE.  FULL PARSES (WITH THE MATCH MEMO) ARE TIMED AT SMALLER DEPTHS
+
+    PYTHONPATH=. python tests/benchmarks/bench_scrub.py
+"""
+import tracemalloc
+from time import perf_counter
+
+from mo_sql_parsing import parse, enable_memo, disable_memo
+from mo_sql_parsing.tree import scrub, Call
+
+SCRUB_DEPTHS = [1_000, 10_000, 100_000]
+PARSE_DEPTHS = [4, 8, 16, 32]
+
+
+def parens_tree(depth):
+    # ((a * b + 1) * b + 1) ...
+    tree = "a"
+    for i in range(depth):
+        tree = Call("add", [Call("mul", [tree, "b"], {}), 1], {})
+    return tree
+
+
+def case_tree(depth):
+    # CASE WHEN a > 0 THEN 0 ELSE CASE ... END END
+    tree = "a"
+    for i in range(depth):
+        tree = Call("case", [{"when": Call("gt", ["a", i], {}), "then": i}, tree], {})
+    return tree
+
+
+def parens_sql(depth):
+    return "SELECT " + "(" * depth + "a" + " * b + 1)" * depth + " FROM t"
+
+
+def case_sql(depth):
+    expr = "a"
+    for i in range(depth):
+        expr = f"CASE WHEN a > {i} THEN {i} ELSE {expr} END"
+    return f"SELECT {expr} FROM t"
+
+
+def scrub_stats(shape, depth):
+    """
+    :return: (SECONDS, PEAK BYTES); EACH FROM ITS OWN TREE, SINCE scrub() CONSUMES IT, AND TRACING IS SLOW
+    """
+    tree = shape(depth)
+    start = perf_counter()
+    scrub(tree)
+    duration = perf_counter() - start
+
+    tree = shape(depth)
+    tracemalloc.start()
+    scrub(tree)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak
+
+
+def main():
+    for shape in (parens_tree, case_tree):
+        for depth in SCRUB_DEPTHS:
+            duration, peak = scrub_stats(shape, depth)
+            print(f"scrub {shape.__name__:12s} depth {depth:7d}  {duration * 1000:9.2f}ms  peak {peak / 1e6:7.1f}MB")
+
+    parse("select 1")  # BUILD THE PARSER BEFORE TIMING
+    enable_memo()
+    try:
+        for shape in (parens_sql, case_sql):
+            for depth in PARSE_DEPTHS:
+                sql = shape(depth)
+                start = perf_counter()
+                try:
+                    parse(sql)
+                    result = f"{(perf_counter() - start) * 1000:9.2f}ms"
+                except RecursionError:
+                    result = "RecursionError (IN THE GRAMMAR)"
+                print(f"parse {shape.__name__:12s} depth {depth:7d}  {result}")
+    finally:
+        disable_memo()
+
+
+if __name__ == "__main__":
+    main()
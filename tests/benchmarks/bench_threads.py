@@ -0,0 +1,87 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+PARSE THROUGHPUT AS THE NUMBER OF THREADS GROWS
+
+    PYTHONPATH=. python tests/benchmarks/bench_threads.py [max_threads]
+
+ON FREE-THREADED BUILDS (python3.13t) RUN WITH -X gil=0
+
+THE GRAMMAR MATCH HOLDS mo_parsing's core.locker, SO ONLY ONE THREAD MATCHES AT A TIME; ONLY THE WORK AROUND
+THE MATCH (BUILDING THE JSON TREE) CAN RUN IN PARALLEL.  THE BENCHMARK REPORTS THE SHARE OF A PARSE SPENT
+MATCHING, AND THE MOST SPEEDUP THAT LEAVES FOR ANY NUMBER OF THREADS
+"""
+import sys
+import sysconfig
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import mo_sql_parsing
+from mo_sql_parsing import parse
+from mo_sql_parsing.errors import match
+
+QUERIES = [
+    "SELECT a, b FROM t WHERE c = 1",
+    "SELECT count(*) AS n, d FROM t1 JOIN t2 ON t1.id = t2.id GROUP BY d HAVING count(*) > 2 ORDER BY n DESC LIMIT 10",
+    "SELECT CASE WHEN x IS NULL THEN 'none' ELSE x END FROM (SELECT x FROM y) AS z",
+    "INSERT INTO t (a, b) VALUES (1, 'a'), (2, 'b'), (3, NULL)",
+    "WITH q AS (SELECT a FROM b) SELECT sum(a) OVER (PARTITION BY a ORDER BY a) FROM q",
+]
+PER_THREAD = 40
+
+
+def run(threads):
+    def work(_):
+        for i in range(PER_THREAD):
+            parse(QUERIES[i % len(QUERIES)])
+
+    start = perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(work, range(threads)))
+    return threads * PER_THREAD / (perf_counter() - start)
+
+
+def matching_share():
+    """
+    :return: FRACTION OF ONE THREAD'S PARSE TIME SPENT IN THE (SERIALIZED) GRAMMAR MATCH
+    """
+    parser = mo_sql_parsing.common_parser
+    start = perf_counter()
+    for i in range(PER_THREAD):
+        parse(QUERIES[i % len(QUERIES)])
+    total = perf_counter() - start
+    start = perf_counter()
+    for i in range(PER_THREAD):
+        match(parser, QUERIES[i % len(QUERIES)])
+    return min(1.0, (perf_counter() - start) / total)
+
+
+def main():
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    print(f"python {sys.version.split()[0]} free-threaded build={free_threaded} gil enabled={gil}")
+
+    parse(QUERIES[0])  # BUILD THE PARSER BEFORE TIMING
+    share = matching_share()
+    print(
+        f"grammar matching is serialized on mo_parsing's lock: {share:.0%} of a parse,"
+        f" so at most x{1 / share:.2f} with any number of threads"
+    )
+    baseline = None
+    threads = 1
+    while threads <= max_threads:
+        rate = run(threads)
+        baseline = baseline or rate
+        print(f"threads={threads:3d}  {rate:8.1f} parses/sec  x{rate / baseline:.2f}")
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+COST OF WALKING A PARSE TREE WITH Visitor/Transformer (DISPATCH TABLE, EXPLICIT STACK), COMPARED TO THE
+RECURSIVE WALK EACH TOOL WRITES FOR ITSELF (getattr(self, "visit_" + key) AT EVERY KEY).  ALSO SHOWS THE TIME
+TO FIND THE FIRST eq WHEN THE WALK CAN BE ENDED EARLY (STOP), AND WHEN IT CAN NOT
+
+    PYTHONPATH=. python tests/benchmarks/bench_visitor.py
+"""
+from time import perf_counter
+
+from mo_sql_parsing import parse, Visitor, Transformer, STOP
+from mo_sql_parsing.visitor import method_name
+
+ROUNDS = 200
+
+STATEMENTS = {
+    "narrow": "SELECT a FROM t WHERE b = 1",
+    "wide": "SELECT " + ", ".join(f"coalesce(c{i}, 0) + {i} AS d{i}" for i in range(20)) + " FROM t WHERE a = 1",
+    "case": "SELECT CASE "
+    + " ".join(f"WHEN a = {i} THEN 'v{i}'" for i in range(50))
+    + " END FROM t JOIN u ON t.id = u.id",
+    "nested": "SELECT a FROM t WHERE "
+    + " AND ".join(f"b{i} IN (SELECT c FROM s{i} WHERE d = {i})" for i in range(10)),
+}
+
+
+class NaiveVisitor(object):
+    def visit(self, node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                method = getattr(self, method_name(key), None)
+                if method is not None:
+                    method(value, node)
+                self.visit(value)
+        elif isinstance(node, list):
+            for value in node:
+                self.visit(value)
+        else:
+            self.visit_leaf(node)
+
+
+class NaiveTransformer(object):
+    def transform(self, node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                method = getattr(self, method_name(key), None)
+                if method is not None:
+                    replacement = method(value, node)
+                    if replacement is not None:
+                        return replacement
+            return {k: self.transform(v) for k, v in node.items()}
+        elif isinstance(node, list):
+            return [self.transform(v) for v in node]
+        else:
+            return self.visit_leaf(node)
+
+
+class NaiveCount(NaiveVisitor):
+    def __init__(self):
+        self.count = 0
+
+    def visit_eq(self, value, node):
+        self.count += 1
+
+    def visit_leaf(self, value):
+        pass
+
+
+class Count(Visitor):
+    def __init__(self):
+        self.count = 0
+
+    def visit_eq(self, value, node):
+        self.count += 1
+
+
+class First(Visitor):
+    def visit_eq(self, value, node):
+        return STOP
+
+
+class NaiveMask(NaiveTransformer):
+    def visit_literal(self, value, node):
+        return {"literal": "?"}
+
+    def visit_leaf(self, value):
+        return 0 if isinstance(value, (int, float)) else value
+
+
+class Mask(Transformer):
+    def visit_literal(self, value, node):
+        return {"literal": "?"}
+
+    def visit_leaf(self, value, parent):
+        return 0 if isinstance(value, (int, float)) else value
+
+
+def timing(walk, tree):
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        walk(tree)
+    return (perf_counter() - start) / ROUNDS
+
+
+def main():
+    for name, sql in STATEMENTS.items():
+        tree = parse(sql)
+        # THE SAME ANSWERS, SO THE TIMES ARE COMPARABLE
+        naive, compiled = NaiveCount(), Count()
+        naive.visit(tree)
+        compiled.visit(tree)
+        assert naive.count == compiled.count
+        assert NaiveMask().transform(tree) == Mask().transform(tree)
+
+        times = {
+            "naive visit": timing(lambda t: NaiveCount().visit(t), tree),
+            "visit": timing(lambda t: Count().visit(t), tree),
+            "first eq": timing(lambda t: First().visit(t), tree),
+            "naive transform": timing(lambda t: NaiveMask().transform(t), tree),
+            "transform": timing(lambda t: Mask().transform(t), tree),
+        }
+        print(f"{name:8s} " + "  ".join(f"{k} {v * 1_000_000:8.1f}us" for k, v in times.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase, skipIf
+
+from mo_sql_parsing import sql_parser, scrub
+from mo_sql_parsing.artifact import load_parser, artifact_path
+from mo_sql_parsing.utils import ParseContext
+
+try:
+    import cloudpickle
+except ImportError:
+    cloudpickle = None
+
+
+class TestArtifact(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.builds = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def builder(self):
+        self.builds += 1
+        return sql_parser.common_parser()
+
+    @skipIf(cloudpickle is None, "cloudpickle is needed to write artifacts")
+    def test_second_load_does_not_build(self):
+        sql = "select a, b from t where c is null and d<>null"
+        built = load_parser("common", self.builder, self.directory)
+        self.assertTrue(os.path.exists(artifact_path(self.directory, "common")))
+        loaded = load_parser("common", self.builder, self.directory)
+        self.assertEqual(self.builds, 1)
+        self.assertIsNot(loaded, built)
+
+        expected = scrub(built.parse_string(sql, parse_all=True), ParseContext())
+        result = scrub(loaded.parse_string(sql, parse_all=True), ParseContext())
+        self.assertEqual(result, expected)
+
+    def test_damaged_artifact_is_rebuilt(self):
+        with open(artifact_path(self.directory, "common"), "wb") as f:
+            f.write(b"not a pickle")
+        load_parser("common", self.builder, self.directory)
+        self.assertEqual(self.builds, 1)
+
+    def test_no_directory_always_builds(self):
+        load_parser("common", self.builder, None)
+        load_parser("common", self.builder, None)
+        self.assertEqual(self.builds, 2)
+        self.assertEqual(os.listdir(self.directory), [])
@@ -0,0 +1,103 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import asyncio
+from threading import Timer
+from time import perf_counter
+from unittest import TestCase
+
+from mo_parsing import ParseException
+
+from mo_sql_parsing import (
+    parse,
+    parse_mysql,
+    try_parse,
+    Budget,
+    CancelToken,
+    ParseBudgetExceeded,
+    enable_memo,
+    disable_memo,
+)
+
+# NESTED PARENTHESES ARE MATCHED MANY TIMES OVER, SO THIS TAKES ABOUT HALF A SECOND
+SLOW = "SELECT " + "(" * 20 + "a" + ")" * 20 + " FROM t"
+
+
+class TestBudget(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # BUILD THE PARSERS, SO THE TIMES BELOW ARE ONLY THE PARSE
+        parse("SELECT 1")
+        parse_mysql("SELECT 1")
+
+    def assertStops(self, reason, budget, sql=SLOW):
+        start = perf_counter()
+        with self.assertRaises(ParseBudgetExceeded) as raised:
+            parse(sql, budget=budget)
+        self.assertEqual(raised.exception.reason, reason)
+        self.assertNotIsInstance(raised.exception, ParseException)
+        self.assertLess(perf_counter() - start, 0.3)
+
+    def test_within_budget(self):
+        budget = Budget(seconds=10, attempts=1000, token=CancelToken())
+        sql = "SELECT a, b + 1 FROM t WHERE c IN (SELECT c FROM u)"
+        # THE SAME Budget FOR EVERY PARSE; EACH IS MEASURED ON ITS OWN
+        for _ in range(3):
+            self.assertEqual(parse(sql, budget=budget), parse(sql))
+        self.assertEqual(parse_mysql("SELECT `a` FROM t", budget=budget), {"select": {"value": "a"}, "from": "t"})
+
+    def test_seconds(self):
+        self.assertStops("seconds", Budget(seconds=0.02))
+
+    def test_attempts(self):
+        self.assertStops("attempts", Budget(attempts=5))
+        # A SIMPLE STATEMENT NEEDS FEW
+        self.assertEqual(parse("SELECT a FROM t", budget=Budget(attempts=20)), {"select": {"value": "a"}, "from": "t"})
+
+    def test_cancelled_before(self):
+        token = CancelToken()
+        token.cancel()
+        self.assertStops("cancelled", Budget(token=token), "SELECT 1")
+
+    def test_cancel_from_thread(self):
+        token = CancelToken()
+        Timer(0.05, token.cancel).start()
+        self.assertStops("cancelled", Budget(token=token))
+
+    def test_cancel_from_asyncio(self):
+        async def main():
+            token = CancelToken()
+            loop = asyncio.get_event_loop()
+            parsing = loop.run_in_executor(None, lambda: parse(SLOW, budget=Budget(token=token)))
+            await asyncio.sleep(0.05)
+            token.cancel()
+            return await parsing
+
+        with self.assertRaises(ParseBudgetExceeded):
+            asyncio.run(main())
+
+    def test_next_parse_is_not_limited(self):
+        with self.assertRaises(ParseBudgetExceeded):
+            parse(SLOW, budget=Budget(attempts=1))
+        self.assertEqual(parse("SELECT 1"), {"select": {"value": 1}})
+
+    def test_try_parse(self):
+        with self.assertRaises(ParseBudgetExceeded):
+            try_parse(SLOW, budget=Budget(attempts=5))
+        self.assertFalse(try_parse("SELECT a FROM", budget=Budget(seconds=10)))
+
+    def test_memo(self):
+        enable_memo()
+        try:
+            self.assertStops("attempts", Budget(attempts=5))
+            self.assertEqual(parse("SELECT a FROM t", budget=Budget(seconds=10)), {"select": {"value": "a"}, "from": "t"})
+        finally:
+            disable_memo()
@@ -0,0 +1,64 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from unittest import TestCase
+
+from mo_parsing import ParseException
+
+from mo_sql_parsing import parse, parse_many, format_many, ParsePool, normal_op
+
+
+class TestBulk(TestCase):
+    def test_parse_many_in_order(self):
+        sqls = [f"select a{i} from b where c = {i}" for i in range(25)]
+        result = list(parse_many(sqls, workers=2, batch_size=4))
+        self.assertEqual(result, [(i, parse(sql)) for i, sql in enumerate(sqls)])
+
+    def test_failures_go_to_error_channel(self):
+        sqls = ["select a from b", "select from where", "select null"]
+        errors = []
+        result = list(parse_many(sqls, workers=1, errors=errors, null=None, calls=normal_op))
+        self.assertEqual(result, [(0, {"select": {"value": "a"}, "from": "b"}), (2, {"select": {"value": None}})])
+        self.assertEqual([(i, sql) for i, sql, _ in errors], [(1, "select from where")])
+        self.assertIsInstance(errors[0][2], str)
+
+    def test_failure_raised_without_error_channel(self):
+        sqls = ["select a from b", "select from where", "select null"]
+        result = []
+        with self.assertRaises(ParseException) as raised:
+            for r in parse_many(sqls, workers=1):
+                result.append(r)
+        self.assertEqual(raised.exception.index, 1)
+        with self.assertRaises(ParseException) as expected:
+            parse("select from where")
+        self.assertEqual(str(raised.exception), str(expected.exception))
+        self.assertEqual(result, [(0, {"select": {"value": "a"}, "from": "b"})])
+
+    def test_parse_action_failure_raised(self):
+        # mo_logs CAN NOT BE SENT FROM THE WORKER, SO ITS MESSAGE COMES BACK IN A PLAIN Exception
+        with self.assertRaises(Exception) as raised:
+            list(parse_many(["select 1", "select 1e999999"], workers=1))
+        self.assertNotIsInstance(raised.exception, ParseException)
+        self.assertEqual(raised.exception.index, 1)
+        self.assertIn("input 1 failed", str(raised.exception.__cause__))
+
+    def test_unordered_pool_reuse(self):
+        sqls = [f"select {i}" for i in range(10)]
+        with ParsePool("mysql", workers=2, batch_size=3) as pool:
+            first = sorted(pool.parse_many(sqls, ordered=False))
+            second = sorted(pool.parse_many(sqls, ordered=False))
+        self.assertEqual(first, [(i, {"select": {"value": i}}) for i in range(10)])
+        self.assertEqual(first, second)
+
+    def test_format_many(self):
+        jsons = [{"select": {"value": "a"}, "from": "b"}] + [{"select": {"value": i}} for i in range(2)]
+        result = list(format_many(jsons, workers=1))
+        self.assertEqual(result, [(0, "SELECT a FROM b"), (1, "SELECT 0"), (2, "SELECT 1")])
@@ -0,0 +1,132 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from unittest import TestCase
+
+from mo_sql_parsing import parse, parse_mysql, enable_cache, disable_cache, normal_op
+
+
+class TestCache(TestCase):
+    def setUp(self):
+        self.cache = enable_cache(size=3)
+
+    def tearDown(self):
+        disable_cache()
+
+    def test_hit_returns_equal_copy(self):
+        sql = "select a, b from c where d = 1"
+        first = parse(sql)
+        second = parse(sql + ";")
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_mutation_does_not_leak(self):
+        sql = "select a from b"
+        parse(sql)["from"] = "changed"
+        self.assertEqual(parse(sql), {"select": {"value": "a"}, "from": "b"})
+
+    def test_null_substitution_per_call(self):
+        sql = "select null, a from b where c is null"
+        default = parse(sql)
+        none = parse(sql, null=None)
+        disable_cache()
+        self.assertEqual(default, parse(sql))
+        self.assertEqual(none, parse(sql, null=None))
+        self.assertEqual(none["select"][0], {"value": None})
+
+    def test_key_includes_dialect_and_calls(self):
+        sql = 'select "a"'
+        self.assertEqual(parse(sql), {"select": {"value": "a"}})
+        self.assertEqual(parse_mysql(sql), {"select": {"value": {"literal": "a"}}})
+        self.assertEqual(parse("select a+b", calls=normal_op), {"select": {"value": {"op": "add", "args": ["a", "b"]}}})
+        self.assertEqual(parse("select a+b"), {"select": {"value": {"add": ["a", "b"]}}})
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
+    def test_eviction(self):
+        for i in range(5):
+            parse(f"select {i}")
+        stats = self.cache.stats()
+        self.assertEqual(stats["entries"], 3)
+        self.assertEqual(stats["evictions"], 2)
+        parse("select 4")
+        parse("select 0")
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_byte_budget(self):
+        cache = enable_cache(size=1000, max_bytes=2000)
+        for i in range(50):
+            parse(f"select a{i} from b{i}")
+        self.assertLessEqual(cache.stats()["bytes"], 2000)
+        self.assertGreater(cache.stats()["evictions"], 0)
+
+
+class TestTemplateCache(TestCase):
+    def setUp(self):
+        self.cache = enable_cache(size=100, templates=True)
+
+    def tearDown(self):
+        disable_cache()
+
+    def test_same_shape_shares_entry(self):
+        first = parse("select a from b where id = 123 and name = 'x'")
+        second = parse("select a from b where id = 456 and name = 'it''s'")
+        self.assertEqual(
+            first,
+            {
+                "select": {"value": "a"},
+                "from": "b",
+                "where": {"and": [{"eq": ["id", 123]}, {"eq": ["name", {"literal": "x"}]}]},
+            },
+        )
+        self.assertEqual(
+            second,
+            {
+                "select": {"value": "a"},
+                "from": "b",
+                "where": {"and": [{"eq": ["id", 456]}, {"eq": ["name", {"literal": "it's"}]}]},
+            },
+        )
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_matches_full_parse(self):
+        sqls = [
+            "select -5, 2.5, 0x1F, a - 3 from t where b in (1, 2, 3) limit 10",
+            "insert into t (a, b) values (1, 'x'), (2, 'y')",
+            "insert into t values (0, ''), (2, 'y')",
+            "select sum(x) over (order by y rows 3 preceding) from t",
+            "select interval '1' day, date '2020-01-01', r'a.c', t1.c2 from t",
+            "select * from t where a is null and b = 'null'",
+        ]
+        for sql in sqls:
+            cached = parse(sql)
+            disable_cache()
+            expected = parse(sql)
+            self.assertEqual(cached, expected, sql)
+            enable_cache(size=100, templates=True)
+
+    def test_unusable_template_falls_back(self):
+        sql = "CACHE LAZY TABLE x OPTIONS('storageLevel' = value)"
+        self.assertEqual(parse(sql), {"cache": {"lazy": True, "name": "x", "options": {"storageLevel": "value"}}})
+        self.assertEqual(parse(sql), {"cache": {"lazy": True, "name": "x", "options": {"storageLevel": "value"}}})
+
+    def test_same_error_as_uncached(self):
+        # A LITERAL ENDING IN A BACKSLASH CAN NOT BE LIFTED OUT; IT STAYS, AND FAILS AS IT WOULD UNCACHED
+        for sql in ["select a from t where b like 'x' escape '\\'", "select 'C:\\' from t"]:
+            disable_cache()
+            with self.assertRaises(Exception) as expected:
+                parse(sql)
+            enable_cache(size=100, templates=True)
+            with self.assertRaises(Exception) as cached:
+                parse(sql)
+            self.assertIs(type(cached.exception), type(expected.exception), sql)
+            self.assertEqual(str(cached.exception).split("\n")[0], str(expected.exception).split("\n")[0], sql)
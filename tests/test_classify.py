@@ -0,0 +1,101 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from unittest import TestCase
+
+from mo_sql_parsing import classify, StatementKind, parse, parse_mysql, parse_sqlserver
+from tests.test_infix import suite_sql
+
+READ, WRITE, DDL, EXPLAIN, SET, UNKNOWN = (
+    StatementKind.READ,
+    StatementKind.WRITE,
+    StatementKind.DDL,
+    StatementKind.EXPLAIN,
+    StatementKind.SET,
+    StatementKind.UNKNOWN,
+)
+
+
+def kind_of_tree(tree):
+    """
+    :return: THE StatementKind OF A parse() TREE
+    """
+    if "explain" in tree:
+        return EXPLAIN
+    if any(k in tree for k in ("insert", "update", "delete", "merge", "copy")):
+        return WRITE
+    if any(k in tree for k in ("create table", "create view", "create index", "cache", "drop", "alter")):
+        return DDL
+    if any(k in tree for k in ("set", "unset", "declare")):
+        return SET
+    return READ
+
+
+class TestClassify(TestCase):
+    def test_kinds(self):
+        for sql, expected in [
+            ("SELECT 1", READ),
+            ("(SELECT a FROM t) UNION (SELECT b FROM u)", READ),
+            ("VALUES (1, 2)", READ),
+            ("/* hint */ select a from t", READ),
+            ("INSERT INTO t VALUES (1)", WRITE),
+            ("-- load\nUPDATE t SET a = 1", WRITE),
+            ("DELETE FROM t", WRITE),
+            ("MERGE INTO t USING s ON t.id = s.id WHEN MATCHED THEN DELETE", WRITE),
+            ("COPY INTO t FROM @stage", WRITE),
+            ("CREATE TABLE t (a INTEGER)", DDL),
+            ("DROP VIEW v", DDL),
+            ("ALTER TABLE t RENAME TO u", DDL),
+            ("CACHE TABLE t", DDL),
+            ("EXPLAIN ANALYZE SELECT 1", EXPLAIN),
+            ("DESCRIBE SELECT 1", EXPLAIN),
+            ("SET x = 1", SET),
+            ("UNSET x", SET),
+            ("ALTER SESSION SET LOCK_TIMEOUT = 10", SET),
+            ("GRANT SELECT ON t TO u", UNKNOWN),
+            ("", UNKNOWN),
+        ]:
+            self.assertIs(classify(sql), expected, sql)
+
+    def test_with(self):
+        for sql, expected in [
+            ("WITH a AS (SELECT ')' FROM t) SELECT * FROM a", READ),
+            ("WITH a AS (SELECT 1), b AS (SELECT (2)) (SELECT * FROM a) UNION (SELECT * FROM b)", READ),
+            ("WITH RECURSIVE t(n) AS (VALUES (1) UNION ALL SELECT n + 1 FROM t) SELECT n FROM t", READ),
+            ("WITH a (x, y) AS (SELECT 1, 2) INSERT INTO t SELECT * FROM a", WRITE),
+            ("with a as (select 1) -- not a ( paren\n delete from t", WRITE),
+            ("WITH a AS (SELECT 1) CREATE TABLE t (a INTEGER)", UNKNOWN),
+            ("WITH a AS (SELECT 1", UNKNOWN),
+            ("WITH a AS (SELECT 'unterminated) SELECT 1", UNKNOWN),
+            ("WITH a SELECT 1", UNKNOWN),
+        ]:
+            self.assertIs(classify(sql), expected, sql)
+
+    def test_dialects(self):
+        self.assertIs(classify('WITH a AS (SELECT "(" FROM t) INSERT INTO u SELECT 1', dialect="mysql"), WRITE)
+        self.assertIs(classify("WITH `a(` AS (SELECT 1) SELECT 1", dialect="bigquery"), READ)
+        self.assertIs(classify("WITH [a)] AS (SELECT [b)] FROM t) SELECT 1", dialect="sqlserver"), READ)
+        with self.assertRaises(Exception):
+            classify("SELECT 1", dialect="oracle")
+
+    def test_suite(self):
+        # THE SAME KIND parse() GIVES, FOR EVERY STATEMENT IN THE TEST SUITE IT ACCEPTS
+        parsers = {"common": parse, "mysql": parse_mysql, "sqlserver": parse_sqlserver}
+        checked = 0
+        for dialect, sql in suite_sql():
+            try:
+                tree = parsers[dialect](sql)
+            except Exception:
+                # INCLUDING LITERALS THE GRAMMAR MATCHES, BUT CAN NOT CONVERT
+                continue
+            self.assertIs(classify(sql, dialect), kind_of_tree(tree), sql)
+            checked += 1
+        self.assertGreater(checked, 800)
@@ -0,0 +1,130 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from array import array
+from unittest import TestCase
+
+from mo_parsing import ParseException
+
+from mo_sql_parsing import parse, parse_mysql, format, ColumnTable, enable_cache, disable_cache
+from mo_sql_parsing.rows import BLOCK_SIZE
+
+
+class TestColumnTable(TestCase):
+    def test_column_kinds(self):
+        result = parse(
+            "insert into t values (1, 1.5, 'a', true, null), (-2, 2.5, 'é', false, null), (3, null, null, null, null)",
+            columnar=True,
+        )
+        table = result["values"]
+        self.assertIsInstance(table, ColumnTable)
+        self.assertEqual(len(table), 3)
+        ints, floats, strings, bools, nulls = table.columns
+        self.assertEqual(ints.kind, "int64")
+        self.assertEqual(ints.data, array("q", [1, -2, 3]))
+        self.assertEqual(floats.kind, "float64")
+        self.assertEqual(floats.data, array("d", [1.5, 2.5, 0]))
+        self.assertEqual(floats.nulls, bytearray([4]))
+        self.assertEqual(strings.kind, "utf8")
+        self.assertEqual(bytes(strings.data), "aé".encode("utf8"))
+        self.assertEqual(strings.offsets, array("q", [0, 1, 3, 3]))
+        self.assertEqual(bools.kind, "bool")
+        self.assertEqual(nulls.kind, None)
+        self.assertEqual(
+            table.to_list(),
+            [[1, 1.5, "a", True, None], [-2, 2.5, "é", False, None], [3, None, None, None, None]],
+        )
+
+    def test_mixed_kinds(self):
+        table = parse("insert into t values (1, 2), ('a', 99999999999999999999), (null, 3)", columnar=True)["values"]
+        self.assertEqual([c.kind for c in table.columns], ["object", "object"])
+        self.assertEqual(table.to_list(), [[1, 2], ["a", 99999999999999999999], [None, 3]])
+
+    def test_ints_and_floats(self):
+        table = parse("insert into t values (1, 2.5), (2, 3), (null, 4)", columnar=True)["values"]
+        self.assertEqual([c.kind for c in table.columns], ["int64", "float64"])
+        self.assertEqual(table.columns[1].data, array("d", [2.5, 3, 4]))
+        self.assertEqual(table.to_list(), [[1, 2.5], [2, 3.0], [None, 4.0]])
+
+        table = parse("insert into t values (1), (2.5), (3)", columnar=True)["values"]
+        self.assertEqual(table.columns[0].kind, "float64")
+        self.assertEqual(table.to_list(), [[1.0], [2.5], [3.0]])
+
+        # NOT EXACT AS A float
+        table = parse("insert into t values (9007199254740993), (2.5)", columnar=True)["values"]
+        self.assertEqual(table.columns[0].kind, "object")
+        self.assertEqual(table.to_list(), [[9007199254740993], [2.5]])
+
+    def test_tree_shape(self):
+        sql = "insert into t (a, b) values (1, 'x'), (2, 'y')"
+        expected = parse(sql)
+        result = parse(sql, columnar=True)
+        self.assertEqual(set(result.keys()), set(expected.keys()))
+        self.assertEqual(result["values"].to_list(), expected["values"])
+
+        # THE PLAIN PARSE TURNS NULL INTO A union_all OF SELECTS, THE COLUMNAR PARSE DOES NOT
+        sql = "insert into t (a, b) values (1, 'x'), (2, null)"
+        self.assertEqual(set(parse(sql).keys()), {"insert", "columns", "query"})
+        self.assertIn("union_all", parse(sql)["query"])
+        result = parse(sql, columnar=True)
+        self.assertEqual(set(result.keys()), {"insert", "values"})
+        self.assertEqual(result["values"].names, ["a", "b"])
+        self.assertEqual(result["values"].to_list(), [{"a": 1, "b": "x"}, {"a": 2, "b": None}])
+
+    def test_same_rows(self):
+        for sql in [
+            "insert into t values (1, 'a'), (2, 'b')",
+            "insert into t (a, b) values (1, 'it''s'), (2.5, 'b')",
+            "insert into t values (1, 'a', true), (2, 'b', true), (3, 'c', true)",
+        ]:
+            self.assertEqual(parse(sql, columnar=True)["values"].to_list(), parse(sql)["values"], sql)
+        sql = 'insert into t values (1, "a"), (2, "b")'
+        self.assertEqual(parse_mysql(sql, columnar=True)["values"].to_list(), parse_mysql(sql)["values"])
+
+    def test_other_values_unchanged(self):
+        for sql in [
+            "insert into t values (1, 2)",
+            "insert into t values (1, now()), (2, 3)",
+            "insert into t values (1, 2), (3)",
+            "select * from t where a in (1, 2)",
+        ]:
+            self.assertEqual(parse(sql, columnar=True), parse(sql), sql)
+
+    def test_format(self):
+        for sql in [
+            "insert into t values (1, 'a'), (2, null), (-3, 'c')",
+            "insert into t (a, b) values (1, 'it''s'), (2.5, 'b')",
+        ]:
+            self.assertEqual(parse(format(parse(sql, columnar=True))), parse(sql), sql)
+
+    def test_format_bool(self):
+        result = format(parse("insert into t values (true, 1), (false, null)", columnar=True))
+        self.assertEqual(result, "INSERT INTO t VALUES (TRUE, 1),\n(FALSE, NULL)")
+
+    def test_many_blocks(self):
+        num_rows = 2 * BLOCK_SIZE + 3
+        rows = [[i, None if i % 7 == 0 else f"name {i}"] for i in range(num_rows)]
+        sql = "insert into t values " + ", ".join(f"({a}, {'null' if b is None else repr(b)})" for a, b in rows)
+        self.assertEqual(parse(sql, columnar=True)["values"].to_list(), rows)
+
+    def test_only_when_asked(self):
+        sql = "insert into t values (1, 'a'), (2, 'b')"
+        with self.assertRaises(ParseException):
+            parse("insert into t values (1, 'a'), (2, 'b'", columnar=True)
+        self.assertEqual(parse(sql)["values"], [[1, "a"], [2, "b"]])
+
+        enable_cache()
+        try:
+            self.assertIsInstance(parse(sql, columnar=True)["values"], ColumnTable)
+            self.assertEqual(parse(sql)["values"], [[1, "a"], [2, "b"]])
+            self.assertIsInstance(parse(sql, columnar=True)["values"], ColumnTable)
+        finally:
+            disable_cache()
@@ -0,0 +1,68 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from unittest import TestCase
+
+import mo_sql_parsing
+from mo_sql_parsing import parse
+from mo_sql_parsing.dispatch import head
+
+
+def statement():
+    parse("select 1")  # ENSURE THE PARSER IS BUILT
+    top = mo_sql_parsing.common_parser.element.expr
+    return top, top.exprs[1].expr
+
+
+def names(exprs):
+    return [e.parser_name for e in exprs]
+
+
+class TestDispatch(TestCase):
+    def test_head(self):
+        self.assertEqual(head("  SELECT a", 2), "select")
+        self.assertEqual(head("(select 1)"), "(")
+        self.assertEqual(head(""), "")
+
+    def test_shortlist(self):
+        top, dispatch = statement()
+        self.assertEqual(names(top.candidates("describe")), ["explain"])
+        self.assertEqual(names(dispatch.candidates("drop")), ["drop_table", "drop_view", "drop_index"])
+        self.assertEqual(names(dispatch.candidates("update")), ["update"])
+
+    def test_ambiguous_keeps_order(self):
+        _, dispatch = statement()
+        self.assertEqual(names(dispatch.candidates("with"))[1], "insert")
+        self.assertEqual(names(dispatch.candidates("alter"))[0], "alter")
+        self.assertEqual(len(dispatch.candidates("alter")), 2)
+
+    def test_unknown_tries_everything(self):
+        _, dispatch = statement()
+        self.assertIs(dispatch.candidates("frobnicate"), dispatch.alternate)
+
+    def test_same_as_ordered_trial(self):
+        sqls = [
+            "select a from b",
+            "with x as (select 1) insert into t select * from x",
+            "create view v as select a from t",
+            "alter session set x = 1",
+            "explain select a from b",
+            "drop index if exists i",
+        ]
+        expected = [parse(sql) for sql in sqls]
+        tables = [(d, d.heads) for d in statement()]
+        for d, _ in tables:
+            d.heads = None
+        try:
+            self.assertEqual([parse(sql + " ") for sql in sqls], expected)
+        finally:
+            for d, heads in tables:
+                d.heads = heads
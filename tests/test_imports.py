@@ -0,0 +1,68 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import re
+import subprocess
+import sys
+from unittest import TestCase
+
+from mo_sql_parsing import keywords
+from mo_sql_parsing.formatting import is_keyword
+
+GRAMMAR_MODULES = ["mo_parsing", "mo_sql_parsing.keywords", "mo_sql_parsing.types", "mo_sql_parsing.utils"]
+
+
+class TestImports(TestCase):
+    def loaded_modules(self, code):
+        code = f"import sys\n{code}\nprint(' '.join(sorted(sys.modules)))"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        return set(output.stdout.split())
+
+    def test_import_does_not_build_grammar(self):
+        loaded = self.loaded_modules("import mo_sql_parsing")
+        self.assertEqual(loaded & set(GRAMMAR_MODULES), set())
+
+    def test_format_does_not_build_grammar(self):
+        loaded = self.loaded_modules("from mo_sql_parsing import format\nformat({'select': 'a', 'from': 'group'})")
+        self.assertEqual(loaded & set(GRAMMAR_MODULES), set())
+
+    def test_parse_builds_grammar(self):
+        loaded = self.loaded_modules("from mo_sql_parsing import parse\nparse('select a from b')")
+        self.assertEqual(loaded & set(GRAMMAR_MODULES), set(GRAMMAR_MODULES))
+
+    def test_submodules_on_first_use(self):
+        code = (
+            "import mo_sql_parsing\n"
+            "mo_sql_parsing.utils.emit_warning_for_double_quotes = False\n"
+            "assert mo_sql_parsing.sql_parser.common_parser\n"
+            "assert mo_sql_parsing.debug.Debugger\n"
+            "assert mo_sql_parsing.ansi_string is mo_sql_parsing.utils.ansi_string\n"
+            "from mo_sql_parsing import debug, ansi_string"
+        )
+        loaded = self.loaded_modules(code)
+        self.assertEqual(loaded & set(GRAMMAR_MODULES), set(GRAMMAR_MODULES))
+        with self.assertRaises(AttributeError):
+            import mo_sql_parsing
+
+            mo_sql_parsing.no_such_attribute
+
+    def test_reserved_keywords_match_grammar(self):
+        with open(keywords.__file__) as f:
+            words = set(re.findall(r'keyword\("([a-z]+)"\)', f.read()))
+        self.assertGreater(len(words), 50)
+        for word in sorted(words):
+            try:
+                keywords.RESERVED.parse_string(word)
+                expected = True
+            except Exception:
+                expected = False
+            self.assertEqual(is_keyword(word), expected, word)
+            self.assertEqual(is_keyword(word.upper()), expected, word)
@@ -0,0 +1,123 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import ast
+import os
+import re
+from unittest import TestCase, skipIf
+
+from mo_sql_parsing import sql_parser, scrub
+from mo_sql_parsing.infix import LEGACY, PRECEDENCE
+
+IS_TRAVIS = bool(os.environ.get("TRAVIS"))
+TESTS = os.path.dirname(__file__)
+
+looks_like_sql = re.compile(
+    r"\s*(select|with|insert|update|delete|create|drop|alter|explain|describe|desc|set|copy|merge|values|\()\b",
+    re.IGNORECASE,
+)
+dialects = {
+    "test_mysql.py": "mysql",
+    "test_bigquery.py": "mysql",
+    "test_sql_server.py": "sqlserver",
+}
+
+# THE LEGACY ENGINE LOSES AN OPERAND IN THESE; THE PRECEDENCE ENGINE KEEPS THEM ALL
+CHANGED = {
+    "select a = not b": {"select": {"value": {"eq": ["a", {"not": "b"}]}}},
+    "select a = not b and c": {"select": {"value": {"and": [{"eq": ["a", {"not": "b"}]}, "c"]}}},
+    # FILTER IS APPLIED TO THE CALL FIRST, THEN OVER TO THE FILTERED CALL
+    "select sum(a) filter (where b > 1) over (partition by c) from t": {
+        "select": {"value": {"value": {"sum": "a"}, "filter": {"gt": ["b", 1]}}, "over": {"partitionby": "c"}},
+        "from": "t",
+    },
+}
+
+
+def suite_sql():
+    """
+    :return: (dialect, sql) FOR EVERY SQL STRING IN THE TEST SUITE
+    """
+    found = set()
+    for name in sorted(os.listdir(TESTS)):
+        if not name.startswith("test_") or not name.endswith(".py"):
+            continue
+        with open(os.path.join(TESTS, name), encoding="utf8") as file:
+            tree = ast.parse(file.read())
+        dialect = dialects.get(name, "common")
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str) and looks_like_sql.match(node.value):
+                found.add((dialect, node.value))
+    return sorted(found)
+
+
+def outcome(parser, sql):
+    try:
+        return scrub(parser.parse_string(sql, parse_all=True))
+    except Exception as cause:
+        # A FAILED PARSE ACTION (mo_logs Except) CARRIES A TRACEBACK, WHICH DIFFERS BY ENGINE
+        return "ERROR " + str(cause).split("\n")[0]
+
+
+class TestInfix(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.parsers = {
+            engine: {d: getattr(sql_parser, f"{d}_parser")(engine=engine) for d in ("common", "mysql", "sqlserver")}
+            for engine in (PRECEDENCE, LEGACY)
+        }
+
+    def same(self, sql, dialect="common"):
+        expected = outcome(self.parsers[LEGACY][dialect], sql)
+        self.assertEqual(outcome(self.parsers[PRECEDENCE][dialect], sql), expected, sql)
+        return expected
+
+    def test_precedence_and_associativity(self):
+        self.assertEqual(
+            self.same("select a + b * c - d"), {"select": {"value": {"sub": [{"add": ["a", {"mul": ["b", "c"]}]}, "d"]}}},
+        )
+        self.same("select not a = b and c or d")
+        self.same("select - a :: int * b")
+
+    def test_suffix_and_ternary(self):
+        self.same("select a[1].b, x::int, a between 1 and 2 and b, c not between d + 1 and e")
+        self.same("select sum(a) filter (where b > 1), sum(c) over (partition by d) from t")
+
+    def test_long_expression(self):
+        self.same("select " + " + ".join(f"a{i} * {i}" for i in range(200)))
+        self.same("select * from t where " + " or ".join(f"(a = {i} and b <> 'x{i}')" for i in range(100)))
+
+    def test_changed_trees(self):
+        parser = self.parsers[PRECEDENCE]["common"]
+        for sql, expected in CHANGED.items():
+            self.assertEqual(outcome(parser, sql), expected, sql)
+        self.assertEqual(
+            outcome(parser, "select sum(a) filter (where b > 1) from t"),
+            {"select": {"value": {"sum": "a"}, "filter": {"gt": ["b", 1]}}, "from": "t"},
+        )
+
+    def test_suite_sample(self):
+        # EVERY 20th STATEMENT OF THE SUITE, SO A LOCAL RUN COMPARES THE ENGINES ON REAL SQL TOO
+        different = [
+            (dialect, sql)
+            for dialect, sql in suite_sql()[::20]
+            if sql not in CHANGED and outcome(self.parsers[PRECEDENCE][dialect], sql) != outcome(self.parsers[LEGACY][dialect], sql)
+        ]
+        self.assertEqual(different, [])
+
+    @skipIf(not IS_TRAVIS, "slow")
+    def test_whole_suite(self):
+        different = [
+            (dialect, sql)
+            for dialect, sql in suite_sql()
+            if sql not in CHANGED and outcome(self.parsers[PRECEDENCE][dialect], sql) != outcome(self.parsers[LEGACY][dialect], sql)
+        ]
+        self.assertEqual(different, [])
@@ -0,0 +1,70 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import json
+from unittest import TestCase
+
+from mo_sql_parsing import parse, format, to_json, normal_op, LazyTree
+
+SQL = [
+    "SELECT a, sum(b) FROM t JOIN u ON t.id = u.id WHERE c = 1 GROUP BY a ORDER BY 2 DESC LIMIT 10",
+    "WITH x AS (SELECT a FROM s) SELECT * FROM x UNION ALL SELECT b FROM u",
+    "INSERT INTO t (a, b) VALUES (1, NULL), (2, 'b')",
+    "INSERT INTO t SELECT * FROM s WHERE a IS NULL",
+    "UPDATE t SET a = NULL WHERE b = 2",
+    "DELETE FROM t WHERE a IN (1, 2)",
+    "CREATE TABLE t (a INTEGER NOT NULL, b VARCHAR(20))",
+    "SELECT NULL AS a",
+]
+
+
+class TestLazy(TestCase):
+    def test_only_what_is_asked(self):
+        tree = parse("SELECT a, b FROM t WHERE c = 1", output="lazy")
+        self.assertIsInstance(tree, LazyTree)
+        self.assertEqual(tree["from"], "t")
+        self.assertEqual(list(tree._done), ["from"])
+        self.assertNotIn("limit", tree)
+        self.assertEqual(tree.get("where"), {"eq": ["c", 1]})
+        self.assertEqual(sorted(tree._done), ["from", "limit", "where"])
+        with self.assertRaises(KeyError):
+            tree["limit"]
+
+    def test_same_json(self):
+        for sql in SQL:
+            for null, calls in [({"null": {}}, None), (None, None), (None, normal_op)]:
+                kwargs = {"null": null} if calls is None else {"null": null, "calls": calls}
+                expected = parse(sql, **kwargs)
+                self.assertEqual(parse(sql, output="lazy", **kwargs).to_json(), expected, sql)
+                self.assertEqual(list(parse(sql, output="lazy", **kwargs)), list(expected), sql)
+                for key in list(expected) + ["from", "where", "values"]:
+                    tree = parse(sql, output="lazy", **kwargs)
+                    self.assertEqual(tree.get(key, "missing"), expected.get(key, "missing"), sql)
+
+    def test_mapping(self):
+        sql = "SELECT a FROM t WHERE b = 1"
+        tree = parse(sql, output="lazy")
+        self.assertEqual(tree, parse(sql))
+        self.assertEqual(len(tree), 3)
+        self.assertEqual(dict(tree.items()), parse(sql))
+
+    def test_format(self):
+        # THE FORMATTER DOES NOT HANDLE THE INSERT AND CREATE TREES, LAZY OR NOT
+        for sql in [sql for sql in SQL if not sql.startswith(("INSERT", "CREATE"))]:
+            expected = parse(sql)
+            self.assertEqual(format(parse(sql, output="lazy")), format(expected), sql)
+            self.assertEqual(to_json(parse(sql, output="lazy")), expected, sql)
+        tree = parse("select a from b where c=1", output="lazy")
+        self.assertEqual(json.loads(json.dumps(tree.to_json())), parse("select a from b where c=1"))
+
+    def test_repr(self):
+        tree = parse("select a from b where c=1", output="lazy")
+        self.assertEqual(repr(tree), "LazyTree(select, from, where)")
@@ -0,0 +1,53 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from unittest import TestCase
+
+from mo_sql_parsing.lexer import Lexer, KIND_NAMES
+
+
+def kinds(sql, dialect="common"):
+    lexer = Lexer(dialect)
+    return [
+        (KIND_NAMES[lexer.kinds[found.lastgroup]], found.group())
+        for found in lexer.regex.finditer(sql)
+        if found.lastgroup != "gap"
+    ]
+
+
+class TestLexer(TestCase):
+    def test_comments_and_whitespace_are_gaps(self):
+        self.assertEqual(
+            kinds("select a -- one\n, /* two */ b # three"),
+            [("word", "select"), ("word", "a"), ("operator", ","), ("word", "b")],
+        )
+
+    def test_quoting_depends_on_dialect(self):
+        sql = """select "a", `b`, [c], 'd'"""
+        self.assertEqual(
+            [k for k in kinds(sql) if k[0] != "operator"],
+            [("word", "select"), ("quoted", '"a"'), ("quoted", "`b`"), ("word", "c"), ("string", "'d'")],
+        )
+        self.assertEqual(
+            [k for k in kinds(sql, "mysql") if k[0] != "operator"],
+            [("word", "select"), ("string", '"a"'), ("quoted", "`b`"), ("quoted", "[c]"), ("string", "'d'")],
+        )
+
+    def test_numbers_and_operators(self):
+        self.assertEqual(
+            kinds("a<>1.5e3||0x1F"),
+            [("word", "a"), ("operator", "<>"), ("number", "1.5e3"), ("operator", "||"), ("number", "0x1F")],
+        )
+
+    def test_unterminated(self):
+        self.assertEqual(kinds("select 'abc")[1], ("error", "'"))
+        self.assertEqual(kinds("select a /* abc")[2], ("error", "/*"))
+        self.assertNotIn("error", [k for k, _ in kinds("select 'it''s'")])
@@ -0,0 +1,121 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from unittest import TestCase
+
+from mo_parsing import ParseException
+
+from mo_sql_parsing import parse, parse_mysql, enable_memo, disable_memo
+from mo_sql_parsing.memo import MatchMemo
+from mo_sql_parsing.sql_parser import common_parser
+from mo_sql_parsing.tree import matching
+
+
+def nested_case(depth):
+    expr = "x"
+    for i in range(depth):
+        expr = f"sum(CASE WHEN a{i} > {i} THEN {expr} ELSE 0 END) OVER (PARTITION BY p{i} ORDER BY q)"
+    return f"SELECT {expr} FROM t"
+
+
+def nested_query(depth):
+    sql = "SELECT a FROM t"
+    for i in range(depth):
+        sql = f"SELECT a{i} FROM ({sql}) AS s{i} WHERE b IN (SELECT b FROM u{i})"
+    return sql
+
+
+class TestMemo(TestCase):
+    def tearDown(self):
+        disable_memo()
+
+    def test_same_results(self):
+        sqls = [
+            (parse, nested_case(3)),
+            (parse, nested_query(3)),
+            (parse, "WITH a AS (SELECT 1) INSERT INTO b SELECT * FROM a"),
+            (parse_mysql, 'select "a", (select max(b) from c) from d'),
+        ]
+        expected = [p(sql) for p, sql in sqls]
+        enable_memo()
+        self.assertEqual([p(sql) for p, sql in sqls], expected)
+
+    def test_same_errors(self):
+        sql = "select a from (select b from c where d = ) as e"
+        with self.assertRaises(ParseException) as expected:
+            parse(sql)
+        enable_memo()
+        with self.assertRaises(ParseException) as actual:
+            parse(sql)
+        self.assertEqual(str(actual.exception), str(expected.exception))
+
+    def test_counters(self):
+        match_memo = enable_memo()
+        parse("select * from t where (a, b) in ((1, 2), (3, 4))")  # TUPLES ARE TRIED AS SUB-QUERIES FIRST
+        parse(nested_query(2))
+        stats = match_memo.stats()
+        self.assertEqual(stats["parses"], 2)
+        self.assertGreater(stats["hits"], 0)
+        self.assertGreater(stats["misses"], 0)
+        self.assertGreater(stats["peak_entries"], 0)
+        self.assertEqual(stats["evictions"], 0)
+
+    def test_released_after_parse(self):
+        match_memo = enable_memo()
+        parse(nested_query(2))
+        self.assertIsNone(match_memo.entries)
+        self.assertIsNone(match_memo.string)
+        self.assertIsNone(matching.context.memo)
+        with self.assertRaises(ParseException):
+            parse("select a from")
+        self.assertIsNone(match_memo.entries)
+        self.assertIsNone(matching.context.memo)
+
+    def test_bounded(self):
+        match_memo = enable_memo(size=5)
+        expected = parse(nested_query(3))
+        self.assertEqual(parse(nested_query(3) + " "), expected)
+        stats = match_memo.stats()
+        self.assertEqual(stats["peak_entries"], 5)
+        self.assertGreater(stats["evictions"], 0)
+
+    def test_eviction_is_oldest_first(self):
+        match_memo = MatchMemo(size=2)
+        match_memo.begin("sql")
+        for key in "abc":
+            match_memo.add(key, key)
+        self.assertEqual(list(match_memo.entries), ["b", "c"])
+        self.assertIsNone(match_memo.get("a"))
+        self.assertEqual(match_memo.get("c"), "c")
+        match_memo.end()
+
+    def test_per_call(self):
+        sql = "select * from t where (a, b) in ((1, 2), (3, 4))"
+        expected = parse(sql)
+        self.assertEqual(parse(sql, memo=True), expected)
+
+        match_memo = MatchMemo()
+        self.assertEqual(parse(sql, memo=match_memo), expected)
+        self.assertEqual(parse_mysql(sql, memo=match_memo), expected)
+        self.assertEqual(match_memo.stats()["parses"], 2)
+        self.assertGreater(match_memo.stats()["hits"], 0)
+
+        # THE PROCESS-WIDE MEMO IS NOT USED BY A CALL THAT GIVES ITS OWN
+        enabled = enable_memo()
+        self.assertEqual(parse(sql, memo=False), expected)
+        self.assertEqual(parse(sql, memo=match_memo), expected)
+        self.assertEqual(enabled.stats()["parses"], 0)
+        self.assertEqual(match_memo.stats()["parses"], 3)
+
+    def test_deep_nesting_keeps_failures_short(self):
+        # EACH FAILURE IS KEPT ONCE, INSTEAD OF DOUBLING AT EVERY LEVEL
+        result = common_parser().parse_string(nested_case(5), parse_all=True)
+        self.assertEqual(len(result.failures), len({id(f) for f in result.failures}))
@@ -0,0 +1,82 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import pickle
+from unittest import TestCase
+
+from mo_sql_parsing import parse, parse_mysql, format, normal_op, Node, to_json
+from mo_sql_parsing.tree import SQL_NULL
+
+SQL = [
+    "SELECT a + 1 AS b, coalesce(c, NULL), count(DISTINCT d) FROM t WHERE x IS NULL AND y = 2",
+    "SELECT CASE WHEN a = 1 THEN 'x' ELSE lower(b) END FROM t JOIN u ON t.id = u.id ORDER BY 1 DESC",
+    "SELECT sum(a) OVER (PARTITION BY b) FROM (SELECT a, b FROM t) AS s GROUP BY b HAVING max(a) > 3",
+    "INSERT INTO t (a, b) VALUES (1, NULL), (2, 'b')",
+    "UPDATE t SET a = a + 1 WHERE b IN (1, 2, 3)",
+    "SELECT NULL = NULL",
+]
+
+
+class TestNodes(TestCase):
+    def test_nodes(self):
+        result = parse("SELECT a + 1, count(DISTINCT b) FROM t WHERE c IS NULL", output="nodes")
+        self.assertEqual(
+            result,
+            {
+                "select": [{"value": Node("add", ["a", 1])}, {"value": Node("count", "b", {"distinct": True})}],
+                "from": "t",
+                "where": Node("missing", "c"),
+            },
+        )
+        node = result["select"][1]["value"]
+        self.assertEqual((node.op, node.args, node.kwargs), ("count", "b", {"distinct": True}))
+        self.assertIsNone(result["select"][0]["value"].kwargs)
+
+    def test_same_json(self):
+        for sql in SQL:
+            nodes = parse(sql, output="nodes")
+            self.assertEqual(to_json(nodes), parse(sql), sql)
+            self.assertEqual(to_json(nodes, normal_op, None), parse(sql, calls=normal_op, null=None), sql)
+            # to_json() DOES NOT CHANGE THE NODES
+            self.assertEqual(to_json(nodes), parse(sql), sql)
+
+        sql = 'SELECT "a" FROM t WHERE b = 1'
+        self.assertEqual(to_json(parse_mysql(sql, output="nodes")), parse_mysql(sql))
+
+    def test_node_to_json(self):
+        where = parse("SELECT a FROM t WHERE a = 1 OR b = NULL", output="nodes")["where"]
+        self.assertEqual(where.to_json(), {"or": [{"eq": ["a", 1]}, {"missing": "b"}]})
+        self.assertEqual(
+            where.to_json(normal_op),
+            {"op": "or", "args": [{"op": "eq", "args": ["a", 1]}, {"op": "missing", "args": ["b"]}]},
+        )
+
+    def test_null_placeholder(self):
+        result = parse("SELECT coalesce(a, NULL)", output="nodes")
+        self.assertIs(result["select"]["value"].args[1], SQL_NULL)
+        self.assertEqual(to_json(result, null=None), {"select": {"value": {"coalesce": ["a", None]}}})
+
+    def test_format(self):
+        for sql in SQL:
+            if sql.startswith("INSERT"):
+                continue  # A NULL MAKES THE ROWS A union_all, WHICH format() CAN NOT WRITE AS AN INSERT
+            self.assertEqual(format(parse(sql, output="nodes")), format(parse(sql)), sql)
+
+    def test_pickle(self):
+        for sql in SQL:
+            nodes = parse(sql, output="nodes")
+            copy = pickle.loads(pickle.dumps(nodes))
+            self.assertEqual(copy, nodes)
+            self.assertEqual(to_json(copy), parse(sql))
+
+    def test_unknown_output(self):
+        with self.assertRaises(Exception):
+            parse("SELECT 1", output="xml")
@@ -0,0 +1,124 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import os
+import tempfile
+from unittest import TestCase
+
+from mo_parsing import ParseException
+from mo_parsing.core import ParserElement
+
+from mo_sql_parsing import (
+    parse,
+    parse_mysql,
+    Budget,
+    ParseBudgetExceeded,
+    enable_profile,
+    disable_profile,
+    enable_memo,
+    disable_memo,
+)
+
+SQL = "SELECT a, b + 1 FROM t WHERE c IN (SELECT c FROM u) ORDER BY a"
+
+
+class TestProfile(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # BUILD THE PARSERS, SO ONLY THE PARSES ARE PROFILED
+        parse("SELECT 1")
+        parse_mysql("SELECT 1")
+
+    def tearDown(self):
+        disable_profile()
+
+    def rule(self, profile, name):
+        return next(r for r in profile.stats() if r["rule"] == name)
+
+    def test_nothing_when_disabled(self):
+        original = ParserElement._parse
+        profile = enable_profile()
+        self.assertIsNot(ParserElement._parse, original)
+        self.assertIs(disable_profile(), profile)
+        self.assertIs(ParserElement._parse, original)
+        parse(SQL)
+        self.assertEqual(profile.stats(), [])
+        self.assertIsNone(disable_profile())
+
+    def test_same_results(self):
+        expected = parse(SQL)
+        enable_profile()
+        self.assertEqual(parse(SQL), expected)
+
+    def test_counts(self):
+        profile = enable_profile()
+        parse(SQL)
+        parse_mysql("SELECT `a` FROM t")
+        with self.assertRaises(ParseException):
+            parse("DROP")
+        disable_profile()
+
+        statement = self.rule(profile, "statement")
+        self.assertEqual(statement["attempts"], 3)
+        self.assertEqual(statement["matches"], 2)
+        self.assertEqual(statement["failures"], 1)
+        for r in profile.stats():
+            self.assertEqual(r["attempts"], r["matches"] + r["failures"])
+            self.assertLessEqual(r["self_ms"], r["total_ms"] + 1e-6)
+        # RECURSIVE RULES ARE NOT COUNTED TWICE
+        self.assertLessEqual(self.rule(profile, "query")["total_ms"], statement["total_ms"])
+
+    def test_report(self):
+        profile = enable_profile()
+        parse(SQL)
+        disable_profile()
+
+        lines = profile.report(limit=5).split("\n")
+        self.assertEqual(lines[0].split(), ["rule", "attempts", "matches", "failures", "total_ms", "self_ms"])
+        self.assertEqual(len(lines), 6)
+        totals = [float(line.split()[-2]) for line in lines[1:]]
+        self.assertEqual(totals, sorted(totals, reverse=True))
+        attempts = [r["attempts"] for r in profile.stats()]
+        self.assertEqual(profile.report(sort="attempts").split("\n")[1].split()[-5], str(max(attempts)))
+        with self.assertRaises(Exception):
+            profile.report(sort="speed")
+
+    def test_folded(self):
+        profile = enable_profile()
+        parse(SQL)
+        disable_profile()
+
+        stacks = [line.rsplit(" ", 1) for line in profile.folded().split("\n")]
+        self.assertIn("statement;query", [path for path, _ in stacks])
+        self.assertTrue(all(int(micros) > 0 for _, micros in stacks))
+        # THE SELF TIMES ADD UP TO THE TIME OF THE OUTERMOST RULES
+        total = sum(int(micros) for _, micros in stacks) / 1000
+        outermost = sum(self.rule(profile, name)["total_ms"] for name in {path.split(";")[0] for path, _ in stacks})
+        self.assertAlmostEqual(total, outermost, delta=0.1 * outermost + 0.1)
+
+        filename = os.path.join(tempfile.mkdtemp(), "parse.folded")
+        profile.write_folded(filename)
+        with open(filename, encoding="utf8") as file:
+            self.assertEqual(file.read(), profile.folded() + "\n")
+
+    def test_memo_and_budget(self):
+        profile = enable_profile()
+        enable_memo()
+        try:
+            self.assertEqual(parse("SELECT a FROM t"), {"select": {"value": "a"}, "from": "t"})
+            with self.assertRaises(ParseBudgetExceeded):
+                parse("SELECT " + "(" * 20 + "a" + ")" * 20 + " FROM t", budget=Budget(attempts=5))
+        finally:
+            disable_memo()
+        disable_profile()
+        # THE STOPPED PARSE LEFT NO ATTEMPT OPEN
+        self.assertEqual(profile.frames[1:], [])
+        self.assertEqual(self.rule(profile, "statement")["failures"], 1)
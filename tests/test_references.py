@@ -0,0 +1,63 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from unittest import TestCase
+
+from mo_sql_parsing import extract_tables, extract_columns
+
+
+class TestReferences(TestCase):
+    def test_tables(self):
+        for sql, expected in [
+            ("SELECT a FROM t", {"t"}),
+            ("SELECT a FROM s.t AS x JOIN u ON x.id = u.id LEFT JOIN v USING (id)", {"s.t", "u", "v"}),
+            ("SELECT a FROM t WHERE b IN (SELECT c FROM u) AND EXISTS (SELECT 1 FROM v)", {"t", "u", "v"}),
+            ("SELECT * FROM (SELECT a FROM t) AS x, LATERAL (SELECT b FROM u) AS y", {"t", "u"}),
+            ("WITH x AS (SELECT a FROM t), y AS (SELECT a FROM x) SELECT * FROM y JOIN u ON y.a = u.a", {"t", "u"}),
+            ("SELECT a FROM t UNION ALL SELECT a FROM u ORDER BY 1", {"t", "u"}),
+            ("WITH c AS (SELECT a FROM s) INSERT INTO t (a) SELECT a FROM c", {"s", "t"}),
+            # A CTE IS ONLY VISIBLE AFTER ITS DEFINITION: TO THE LATER CTEs AND TO THE STATEMENT
+            ("with t as (select * from t) select * from t", {"t"}),
+            ("WITH x AS (SELECT a FROM y), y AS (SELECT a FROM x) SELECT * FROM y", {"y"}),
+            ("WITH RECURSIVE t AS (SELECT 1 AS n UNION ALL SELECT n + 1 FROM t) SELECT n FROM t", set()),
+            ("SELECT * FROM t WHERE a IN (WITH t AS (SELECT a FROM u) SELECT a FROM t)", {"t", "u"}),
+            ("INSERT INTO t VALUES (1, 'a')", {"t"}),
+            ("UPDATE t SET a = 1 FROM s WHERE t.id = s.id", {"s", "t"}),
+            ("DELETE FROM t WHERE a IN (SELECT a FROM u)", {"t", "u"}),
+            ("MERGE INTO t USING s AS x ON t.id = x.id WHEN MATCHED THEN UPDATE SET a = x.a", {"s", "t"}),
+            ("COPY INTO t FROM @stage/path FILE_FORMAT = (TYPE = CSV)", {"t"}),
+            ("COPY INTO @stage FROM (SELECT a FROM t)", {"t"}),
+            ("CREATE TABLE x AS SELECT a FROM t", {"t"}),
+            ("EXPLAIN SELECT a FROM t", {"t"}),
+            ("SELECT a FROM UNNEST(b) AS c", set()),
+            ("SELECT 1", set()),
+        ]:
+            self.assertEqual(extract_tables(sql), expected, sql)
+
+    def test_columns(self):
+        for sql, expected in [
+            ("SELECT a, t.b AS c FROM t WHERE d = 'x' ORDER BY e DESC", {"a", "t.b", "d", "e"}),
+            ("SELECT count(*), sum(a) OVER (PARTITION BY b ORDER BY c) FROM t GROUP BY d", {"a", "b", "c", "d"}),
+            ("SELECT t.* FROM t JOIN u ON t.id = u.id", {"t.id", "u.id"}),
+            ("SELECT CAST(a AS DECIMAL(10, 2)), b + INTERVAL 3 DAY FROM t", {"a", "b"}),
+            ("SELECT CASE WHEN a > 1 THEN b ELSE 'c' END FROM t", {"a", "b"}),
+            ("INSERT INTO t (a, b) VALUES (1, x), (2, 'y')", {"x"}),
+            ("UPDATE t SET a = b + 1 WHERE c = 2", {"b", "c"}),
+        ]:
+            self.assertEqual(extract_columns(sql), expected, sql)
+
+    def test_dialects(self):
+        self.assertEqual(extract_tables("SELECT `a b` FROM `my table`", dialect="mysql"), {"my table"})
+        # A DOT IN A QUOTED NAME IS DOUBLED, AS IN parse()
+        self.assertEqual(extract_tables("SELECT a FROM `p.d.t`", dialect="bigquery"), {"p..d..t"})
+        self.assertEqual(extract_columns("SELECT [a b] FROM [t]", dialect="sqlserver"), {"a b"})
+        with self.assertRaises(Exception):
+            extract_tables("SELECT 1", dialect="oracle")
@@ -0,0 +1,119 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from random import Random
+from time import perf_counter
+from unittest import TestCase
+
+from mo_parsing import ParseException
+
+from mo_sql_parsing import sql_parser, scrub, parse
+from mo_sql_parsing.rows import BLOCK_SIZE, ANSI_SCANNER, scan_rows
+
+CELLS = [
+    "1", "007", "0", "-0", "-1", "- 1", "+2", "1.", ".5", "-.5", "1.50", "0.0", "-0.0", "1e3", "1E+2", "2.5e-1",
+    "'a'", "''", "'it''s'", "'a\\nb'", "'x;y'", "\"dq\"", "NULL", "null", "True", "FALSE", "0x1F", "10M", "1 + 1",
+    "now()", "a", "-'a'", "--1\n2", "1 /* c */", "date '2020-01-01'", "(1)", "- -1", "'a' || 'b'",
+]
+GAPS = ["", " ", "\n", " -- comment\n", "/* c */", "/* (, */"]
+SHAPES = [
+    "insert into t values {rows}",
+    "insert into t (a, b, c) values {rows}",
+    "insert into t values {rows} returning a",
+    "select * from (values {rows}) as v",
+    "values {rows}",
+]
+
+
+def outcome(parser, sql):
+    try:
+        return scrub(parser.parse_string(sql, parse_all=True))
+    except ParseException as cause:
+        return "ERROR " + str(cause)
+
+
+class TestLiteralRows(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.parsers = {
+            d: (getattr(sql_parser, f"{d}_parser")(), getattr(sql_parser, f"{d}_parser")(fast_values=False))
+            for d in ("common", "mysql", "sqlserver")
+        }
+
+    def same(self, sql, dialect="common"):
+        fast, full = self.parsers[dialect]
+        self.assertEqual(outcome(fast, sql), outcome(full, sql), sql)
+
+    def test_literal_table(self):
+        self.assertEqual(
+            parse("insert into t (a, b) values (1, 'x'), (2.5, 'y')"),
+            {"insert": "t", "values": [{"a": 1, "b": "x"}, {"a": 2.5, "b": "y"}]},
+        )
+        self.assertEqual(parse("insert into t values (1, 'x'), (2, null)", null=None)["query"]["union_all"][1], {
+            "select": [{"value": 2}, {"value": None}]
+        })
+
+    def test_same_as_grammar(self):
+        rand = Random(42)
+        for _ in range(300):
+            gap = lambda: rand.choice(GAPS)
+            width = rand.randint(1, 3)
+            rows = [
+                f"{gap()}({gap()}" + f"{gap()},{gap()}".join(rand.choice(CELLS) for _ in range(width)) + f"{gap()})"
+                for _ in range(rand.randint(1, 4))
+            ]
+            sql = rand.choice(SHAPES).format(rows=",".join(rows))
+            self.same(sql, rand.choice(list(self.parsers.keys())))
+
+    def test_trailing_comma_and_ragged_rows(self):
+        self.same("insert into t values (1, 2), (3)")
+        self.same("insert into t values (1, 2),")
+        self.same("insert into t values (1, 2), 3")
+        self.same("insert into t values ()")
+        self.same("insert into t values (1, 2")
+
+    def test_comments_between_rows(self):
+        self.same("insert into t values (1, 2), /* (3, */ (4, 5)")
+        self.same("insert into t values (1, 2) -- (3,\n, (4, 5)")
+        self.same("insert into t values (1,2),(3,4) # c\n", "mysql")
+        self.same("insert into t values (1, 2), /* (3, 4) */ (a, 5)")
+
+    def test_many_blocks(self):
+        num_rows = 2 * BLOCK_SIZE + 3
+        rows = [[i + 1, f"name {i}"] for i in range(num_rows)]
+        sql = "insert into t values " + ", ".join(f"({a}, '{b}')" for a, b in rows)
+        self.assertEqual(parse(sql), {"insert": "t", "values": rows})
+
+        # WITHOUT THE GRAMMAR FOR A ROW, A ROW THAT IS NOT ALL LITERALS GIVES UP ON ALL OF THEM
+        values = sql[sql.index("(") :] + ", (1, now())"
+        self.assertIsNone(scan_rows(ANSI_SCANNER, values, 0))
+        self.assertEqual(scan_rows(ANSI_SCANNER, "(1, 2), (3, 4)", 0), (14, [{"from": {"literal": [[1, 2], [3, 4]]}}]))
+
+    def test_mixed_rows(self):
+        for dialect in self.parsers:
+            self.same("insert into t values (1, 2), (now(), 3), (4, 'x')", dialect)
+            self.same("insert into t values (1 + 1, 2), (3, 4)", dialect)
+            self.same("insert into t values (1, 2), (3, a)", dialect)
+            self.same("insert into t values (1, 2), (now(), 3), (4, 5),", dialect)
+            self.same("insert into t values (1, 2), (now(), 3), (4, 5) returning a", dialect)
+            self.same("insert into t values (1, 2), (now(, 3), (4, 5)", dialect)
+            self.same("select * from (values (1, 2), (3, 4 + 1), (5, 6)) as v", dialect)
+
+        # ONLY THE ROW WITH now() USES THE GRAMMAR, IN ANY BLOCK
+        num_rows = 2 * BLOCK_SIZE + 3
+        rows = [f"({i}, 'name {i}')" for i in range(num_rows)]
+        rows[BLOCK_SIZE + 7] = "(-1, now())"
+        expected = [{"select": [{"value": i}, {"value": {"literal": f"name {i}"}}]} for i in range(num_rows)]
+        expected[BLOCK_SIZE + 7] = {"select": [{"value": -1}, {"value": {"now": {}}}]}
+        start = perf_counter()
+        result = parse("insert into t values " + ", ".join(rows))
+        self.assertLess(perf_counter() - start, 1)
+        self.assertEqual(result, {"insert": "t", "query": {"union_all": expected}})
@@ -0,0 +1,110 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import io
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from mo_parsing import ParseException
+
+from mo_sql_parsing import parse, parse_script, split_statements, ScriptError
+
+SCRIPT = """-- header; not a split
+select 'a;b', "c;d" from t; /* x; y */ insert into t values ('it''s;');
+select 1 # tail ;
+;;  select `x;` from u;
+select 2 -- end"""
+
+
+class TestScript(TestCase):
+    def test_split(self):
+        result = list(split_statements(SCRIPT))
+        self.assertEqual(
+            result,
+            [
+                (23, """select 'a;b', "c;d" from t"""),
+                (62, "insert into t values ('it''s;')"),
+                (95, "select 1 # tail ;\n"),
+                (117, "select `x;` from u"),
+                (137, "select 2 -- end"),
+            ],
+        )
+        for offset, sql in result:
+            self.assertEqual(SCRIPT[offset : offset + len(sql)], sql)
+
+    def test_any_chunking(self):
+        expected = list(split_statements(SCRIPT))
+        for size in (1, 2, 3, 5, 8):
+            chunks = [SCRIPT[i : i + size] for i in range(0, len(SCRIPT), size)]
+            self.assertEqual(list(split_statements(chunks)), expected, size)
+        self.assertEqual(list(split_statements(io.StringIO(SCRIPT))), expected)
+
+    def test_square_brackets_by_dialect(self):
+        sql = "select [a;b] from c; select d"
+        self.assertEqual(len(list(split_statements(sql, "sqlserver"))), 2)
+        self.assertEqual(len(list(split_statements(sql))), 3)
+
+    def test_parse_script(self):
+        result = list(parse_script(io.StringIO("select 1; select from; select a from b")))
+        self.assertEqual(result[0], (0, parse("select 1")))
+        self.assertEqual(result[1][0], 10)
+        self.assertIsInstance(result[1][1], ScriptError)
+        self.assertIsInstance(result[1][1].cause, ParseException)
+        self.assertEqual(result[1][1].offset, 17)
+        self.assertEqual(result[1][1].sql, "select from")
+        self.assertEqual(result[2], (23, parse("select a from b")))
+
+    def test_parse_is_lazy(self):
+        def lines():
+            yield "select 1;\n"
+            yield "select 2;\n"
+            raise AssertionError("read too far")
+
+        self.assertEqual(next(parse_script(lines())), (0, {"select": {"value": 1}}))
+
+    def test_unterminated_is_one_statement(self):
+        result = list(split_statements("select 1; select 'a; b"))
+        self.assertEqual(result, [(0, "select 1"), (10, "select 'a; b")])
+
+
+class TestMappedScript(TestCase):
+    def setUp(self):
+        file = tempfile.NamedTemporaryFile("wb", suffix=".sql", delete=False)
+        self.text = SCRIPT.replace("a;b", "é;b") + "\n; select 'ü' from"
+        self.data = self.text.encode("utf8")
+        file.write(self.data)
+        file.close()
+        self.path = Path(file.name)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_byte_offsets(self):
+        result = list(split_statements(self.path))
+        self.assertEqual([sql for _, sql in result], [sql for _, sql in split_statements(self.text)])
+        for offset, sql in result:
+            self.assertEqual(self.data[offset : offset + len(sql.encode("utf8"))].decode("utf8"), sql)
+
+    def test_resume(self):
+        result = list(split_statements(self.path))
+        self.assertEqual(list(split_statements(self.path, start=result[2][0])), result[2:])
+
+    def test_error_byte_offset(self):
+        offset, error = list(parse_script(self.path))[-1]
+        self.assertIsInstance(error, ScriptError)
+        self.assertEqual(error.offset, len(self.data))
+
+    def test_empty_file(self):
+        with open(self.path, "wb"):
+            pass
+        self.assertEqual(list(parse_script(self.path)), [])
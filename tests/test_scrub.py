@@ -0,0 +1,79 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import sys
+from unittest import TestCase
+
+from mo_sql_parsing import parse, normal_op
+from mo_sql_parsing.tree import scrub, Call, ParseContext, SQL_NULL
+
+DEPTH = 100_000  # FAR DEEPER THAN THE RECURSION LIMIT
+
+
+def deep_calls(depth, leaf):
+    tree = leaf
+    for i in range(depth):
+        tree = Call("add", [tree, i], {})
+    return tree
+
+
+class TestScrub(TestCase):
+    def test_deep_calls(self):
+        self.assertLess(sys.getrecursionlimit(), DEPTH)
+        result = scrub(deep_calls(DEPTH, {"literal": "a"}))
+        for i in reversed(range(DEPTH)):
+            self.assertEqual(list(result.keys()), ["add"])
+            result, num = result["add"]
+            self.assertEqual(num, i)
+        self.assertEqual(result, {"literal": "a"})
+
+    def test_deep_lists(self):
+        tree = "x"
+        for i in range(DEPTH):
+            tree = [i, tree]
+        result = scrub(tree)
+        for i in reversed(range(DEPTH)):
+            self.assertEqual(result[0], i)
+            result = result[1]
+        self.assertEqual(result, "x")
+
+    def test_deep_nulls(self):
+        null = {"null": "here"}
+        result = scrub(deep_calls(DEPTH, SQL_NULL), ParseContext(null=null))
+        for _ in range(DEPTH):
+            result = result["add"][0]
+        self.assertIs(result, null)
+
+    def test_null_values(self):
+        for null in [None, {"null": {}}, "NULL"]:
+            tree = Call("and", [Call("eq", ["a", SQL_NULL], {}), {"b": SQL_NULL, "c": [SQL_NULL, 1]}], {})
+            self.assertEqual(
+                scrub(tree, ParseContext(null=null)), {"and": [{"eq": ["a", null]}, {"b": null, "c": [null, 1]}]},
+            )
+        # THE CACHE KEEPS THE PLACEHOLDER
+        self.assertIs(scrub(Call("not", [SQL_NULL], {}))["not"], SQL_NULL)
+
+    def test_deep_normal_op(self):
+        result = scrub(deep_calls(DEPTH, 1), ParseContext(normal_op))
+        for i in reversed(range(DEPTH)):
+            self.assertEqual(result["op"], "add")
+            result, num = result["args"]
+            self.assertEqual(num, i)
+        self.assertEqual(result, 1)
+
+    def test_nested_sql(self):
+        depth = 10
+        sql = "select " + "f(" * depth + "a" + ", 1)" * depth + " from t"
+        result = parse(sql)["select"]["value"]
+        for _ in range(depth):
+            result, num = result["f"]
+            self.assertEqual(num, 1)
+        self.assertEqual(result, "a")
@@ -0,0 +1,101 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from threading import Thread
+from unittest import TestCase
+
+from mo_sql_parsing import parse, normal_op, simple_op, parse_mysql, Budget, ColumnTable, ParseBudgetExceeded
+from mo_sql_parsing.tree import matching
+
+
+class TestThreads(TestCase):
+    def test_concurrent_parse_keeps_per_call_settings(self):
+        sql = "select a, null from b where c is null"
+        expected = {
+            (simple_op, "x"): parse(sql, null="x", calls=simple_op),
+            (normal_op, None): parse(sql, null=None, calls=normal_op),
+        }
+        failures = []
+
+        def worker(calls, null):
+            try:
+                for _ in range(30):
+                    result = parse(sql, null=null, calls=calls)
+                    if result != expected[(calls, null)]:
+                        failures.append(result)
+            except Exception as cause:
+                failures.append(cause)
+
+        threads = [Thread(target=worker, args=key) for key in expected.keys() for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(failures, [])
+
+    def test_concurrent_first_use_of_dialect(self):
+        results = []
+
+        def worker():
+            results.append(parse_mysql('select "a" from `b-c`'))
+
+        threads = [Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [{"select": {"value": {"literal": "a"}}, "from": "b-c"}] * 4)
+
+    def test_concurrent_parse_keeps_per_call_grammar_state(self):
+        # columnar AND THE budget ARE READ BY THE GRAMMAR, FROM THE ParseContext OF ITS OWN PARSE
+        sql = "insert into t values (1, 'a'), (2, 'b')"
+        deep = "select " + "(" * 5 + "a" + ")" * 5 + " from t"
+        failures = []
+
+        def columnar():
+            for _ in range(10):
+                result = parse(sql, columnar=True)
+                if not isinstance(result["values"], ColumnTable):
+                    failures.append(result)
+
+        def plain():
+            for _ in range(10):
+                result = parse(sql)
+                if not isinstance(result["values"], list):
+                    failures.append(result)
+
+        def limited():
+            for _ in range(10):
+                try:
+                    failures.append(parse(deep, budget=Budget(attempts=5)))
+                except ParseBudgetExceeded:
+                    pass
+
+        def unlimited():
+            for _ in range(10):
+                parse(deep)
+
+        def guarded(work):
+            def run():
+                try:
+                    work()
+                except Exception as cause:
+                    failures.append(cause)
+
+            return run
+
+        threads = [Thread(target=guarded(w)) for w in (columnar, plain, limited, unlimited) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(failures, [])
+        self.assertIsNone(matching.context.meter)
@@ -0,0 +1,91 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from unittest import TestCase
+
+from mo_parsing import ParseException
+
+from mo_sql_parsing import parse, try_parse, enable_memo, disable_memo
+
+
+class TestTryParse(TestCase):
+    def test_success(self):
+        sql = "SELECT a FROM t WHERE b = 1"
+        result = try_parse(sql)
+        self.assertTrue(result)
+        self.assertIsNone(result.error)
+        self.assertEqual(result.tree, parse(sql))
+        self.assertEqual(try_parse("SELECT `a b` FROM t", dialect="bigquery").tree, {"select": {"value": "a b"}, "from": "t"})
+
+    def test_failure(self):
+        sql = "SELECT * FROM t WHERE a = 1 GROUP b"
+        result = try_parse(sql)
+        self.assertFalse(result)
+        self.assertIsNone(result.tree)
+        error = result.error
+        self.assertIsNone(error._cause)  # NOTHING IS WORKED OUT UNTIL READ
+
+        with self.assertRaises(ParseException) as raised:
+            parse(sql)
+        self.assertEqual(error.message, str(raised.exception))
+        self.assertIsInstance(error.cause, ParseException)
+        self.assertEqual(error.location, 34)
+        self.assertEqual((error.line, error.column), (1, 35))
+        self.assertEqual(error.expecting, {"by"})
+        self.assertEqual(error.context, "CT * FROM t WHERE a = 1 GROUP >!<b")
+
+    def test_expecting(self):
+        self.assertEqual(try_parse("SELECT a FROM t WHERE").error.expecting, {"expression"})
+        self.assertIn("select", try_parse("SELEC 1").error.expecting)
+        error = try_parse("SELECT a\nFROM t\nWHERE a = 1 LIMIT 1 UNION SELECT 2").error
+        self.assertIn("UNION can not follow", error.message)
+        self.assertEqual(error.line, 3)
+
+    def test_same_as_parse(self):
+        for sql in [
+            "select a from b order by a union select 2",
+            "select * from coverage-summary.source.file.covered limit 20",
+            "INSERT INTO t VALUES (1, 2",
+        ]:
+            with self.assertRaises(ParseException) as raised:
+                parse(sql)
+            self.assertEqual(str(try_parse(sql).error), str(raised.exception))
+
+    def test_memo(self):
+        enable_memo()
+        try:
+            self.assertFalse(try_parse("SELECT 'a FROM t"))
+            self.assertEqual(try_parse("SELECT a FROM t WHERE").error.expecting, {"expression"})
+            self.assertTrue(try_parse("SELECT a FROM t"))
+        finally:
+            disable_memo()
+
+    def test_literal_that_can_not_be_converted(self):
+        # THE GRAMMAR MATCHES THESE, BUT THEIR PARSE ACTIONS FAIL
+        for sql, location, line, column in [
+            ("select 'C:\\' from t", 7, 1, 8),
+            ("select 1e999999", 7, 1, 8),
+            ("select a,\n  1e999999 from t", 12, 2, 3),
+        ]:
+            result = try_parse(sql)
+            self.assertFalse(result, sql)
+            self.assertEqual(
+                (result.error.location, result.error.line, result.error.column), (location, line, column), sql
+            )
+            self.assertIsInstance(result.error.cause, ParseException)
+            self.assertIn("found", result.error.message)
+        self.assertIn("OverflowError", try_parse("select 1e999999").error.message)
+
+    def test_bad_arguments_raise(self):
+        with self.assertRaises(Exception):
+            try_parse("SELECT 1", dialect="oracle")
+        with self.assertRaises(Exception):
+            try_parse("SELECT 1", output="xml")
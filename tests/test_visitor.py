@@ -0,0 +1,180 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from unittest import TestCase
+
+from mo_sql_parsing import parse, format, normal_op, to_json, Node, Visitor, Transformer, SKIP, STOP
+
+SQL = (
+    "SELECT a, 'x' AS b FROM t AS tt LEFT JOIN u ON tt.id = u.id"
+    " WHERE c IN (SELECT d FROM s WHERE e = 'y') AND f > 3"
+)
+
+
+class Tables(Visitor):
+    def __init__(self):
+        self.tables = []
+
+    def visit_from(self, value, node):
+        for v in value if isinstance(value, list) else [value]:
+            if isinstance(v, str):
+                self.tables.append(v)
+            elif isinstance(v.get("value"), str):
+                self.tables.append(v["value"])
+
+    def visit_left_join(self, value, node):
+        self.tables.append(value)
+
+
+class Leaves(Visitor):
+    def __init__(self):
+        self.leaves = []
+
+    def visit_leaf(self, value, parent):
+        self.leaves.append(value)
+
+
+class Mask(Transformer):
+    def visit_literal(self, value, node):
+        return {"literal": "?"}
+
+    def visit_leaf(self, value, parent):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return 0
+        return value
+
+
+class TestVisitor(TestCase):
+    def test_visit(self):
+        tables = Tables()
+        self.assertFalse(tables.visit(parse(SQL)))
+        self.assertEqual(tables.tables, ["t", "u", "s"])
+
+    def test_leaves_in_order(self):
+        leaves = Leaves()
+        leaves.visit(parse("SELECT a + 1 FROM t WHERE b = 2"))
+        self.assertEqual(leaves.leaves, ["a", 1, "t", "b", 2])
+
+    def test_skip(self):
+        class Outer(Tables):
+            def visit_in(self, value, node):
+                return SKIP
+
+        tables = Outer()
+        tables.visit(parse(SQL))
+        self.assertEqual(tables.tables, ["t", "u"])
+
+    def test_stop(self):
+        class First(Visitor):
+            def visit_eq(self, value, node):
+                self.found = value
+                return STOP
+
+            def visit_gt(self, value, node):
+                raise Exception("expecting the walk to end at the first eq")
+
+        first = First()
+        self.assertTrue(first.visit(parse(SQL)))
+        self.assertEqual(first.found, ["tt.id", "u.id"])
+
+    def test_normal_op(self):
+        class NormalTables(Tables):
+            calls = normal_op
+
+        class Ops(Visitor):
+            calls = normal_op
+
+            def __init__(self):
+                self.ops = []
+
+            def visit_eq(self, value, node):
+                self.ops.append(("eq", value))
+
+            def visit_gt(self, value, node):
+                self.ops.append(("gt", value))
+
+        tables = NormalTables()
+        tables.visit(parse(SQL, calls=normal_op))
+        self.assertEqual(tables.tables, ["t", "u", "s"])
+
+        ops = Ops()
+        ops.visit(parse(SQL, calls=normal_op))
+        self.assertEqual(
+            ops.ops, [("eq", ["tt.id", "u.id"]), ("eq", ["e", {"literal": "y"}]), ("gt", ["f", 3])],
+        )
+
+    def test_transform(self):
+        tree = parse(SQL)
+        masked = Mask().transform(tree)
+        self.assertEqual(tree, parse(SQL))
+        self.assertEqual(
+            format(masked),
+            "SELECT a, '?' AS b FROM t AS tt LEFT JOIN u ON tt.id = u.id"
+            " WHERE c IN (SELECT d FROM s WHERE e = '?') AND f > 0",
+        )
+
+        class NormalMask(Mask):
+            calls = normal_op
+
+        self.assertEqual(NormalMask().transform(parse(SQL, calls=normal_op)), parse(format(masked), calls=normal_op))
+
+    def test_replace_and_stop(self):
+        class Missing(Transformer):
+            def visit_eq(self, value, node):
+                if value[1] == {"literal": "y"}:
+                    return {"missing": value[0]}
+
+        self.assertEqual(
+            Missing().transform(parse("SELECT a FROM t WHERE b = 'y' OR c = 1")),
+            {"select": {"value": "a"}, "from": "t", "where": {"or": [{"missing": "b"}, {"eq": ["c", 1]}]}},
+        )
+
+        class First(Mask):
+            def visit_literal(self, value, node):
+                return STOP
+
+        self.assertEqual(
+            First().transform(parse("SELECT 1, 'x', 2 FROM t")),
+            {"select": [{"value": 0}, {"value": {"literal": "x"}}, {"value": 2}], "from": "t"},
+        )
+
+    def test_nodes_and_lazy(self):
+        class Ops(Leaves):
+            def visit_eq(self, value, node):
+                self.leaves.append(("eq", value))
+
+        expected = Ops()
+        expected.visit(parse(SQL))
+        for output in ("nodes", "lazy"):
+            ops = Ops()
+            self.assertFalse(ops.visit(parse(SQL, output=output)))
+            self.assertEqual(ops.leaves, expected.leaves, output)
+            tables = Tables()
+            tables.visit(parse(SQL, output=output))
+            self.assertEqual(tables.tables, ["t", "u", "s"], output)
+
+        masked = Mask().transform(parse(SQL))
+        self.assertEqual(Mask().transform(parse(SQL, output="lazy")), masked)
+        nodes = Mask().transform(parse(SQL, output="nodes"))
+        self.assertIsInstance(nodes["where"], Node)
+        self.assertEqual(to_json(nodes), masked)
+
+    def test_deep(self):
+        tree = "a"
+        for i in range(100_000):
+            tree = {"add": [tree, i]}
+        leaves = Leaves()
+        leaves.visit(tree)
+        self.assertEqual(len(leaves.leaves), 100_001)
+        masked = Mask().transform(tree)
+        for _ in range(100_000):
+            self.assertEqual(masked["add"][1], 0)
+            masked = masked["add"][0]